@@ -0,0 +1,99 @@
+"""Content-addressed cache for assets derived at build time.
+
+Asset directives such as `.incbin_lz` turn an input file into bytes
+through a slow pure-Python stage. `derive` runs that stage only for
+inputs it has not seen: outputs are kept in memory for the process and,
+when enabled, on disk under a key made of the stage name, its parameters
+and the sha256 of the input. A rebuild with unchanged assets reads every
+output back instead of recomputing it. Enabled with `parse-cache` in
+`a816.toml` (its `assets/` subdirectory).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Callable
+from pathlib import Path
+
+from a816.util import write_atomically
+
+logger = logging.getLogger("a816.asset_cache")
+
+# Bump when a stage's output changes, so cached outputs are dropped.
+FORMAT_VERSION = 1
+
+
+def cache_key(stage: str, parameters: str, data: bytes) -> str:
+    digest = hashlib.sha256(f"{FORMAT_VERSION}\0{stage}\0{parameters}\0".encode())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class AssetCache:
+    """Derived outputs stored under `directory`, one file per cache key."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+    def load(self, key: str) -> bytes | None:
+        entry_path = self._entry_path(key)
+        try:
+            return entry_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.debug("Ignoring unreadable asset cache entry %s", entry_path, exc_info=True)
+            return None
+
+    def store(self, key: str, output: bytes) -> None:
+        """Record `output` under `key`; failures only log."""
+        entry_path = self._entry_path(key)
+        try:
+            write_atomically(entry_path, output)
+        except OSError:
+            logger.debug("Could not write asset cache entry %s", entry_path, exc_info=True)
+
+
+# Outputs derived by this process, most recent last.
+_MEMO_ENTRIES = 64
+_memo: dict[str, bytes] = {}
+
+_active: AssetCache | None = None
+
+
+def derive(stage: str, parameters: str, data: bytes, build: Callable[[bytes], bytes]) -> bytes:
+    """`build(data)`, or its output for the same stage, parameters and input."""
+    key = cache_key(stage, parameters, data)
+    output = _memo.pop(key, None)
+    if output is None and _active is not None:
+        output = _active.load(key)
+    if output is None:
+        output = build(data)
+        if _active is not None:
+            _active.store(key, output)
+    _memo[key] = output
+    if len(_memo) > _MEMO_ENTRIES:
+        del _memo[next(iter(_memo))]
+    return output
+
+
+def enable_asset_cache(directory: Path) -> AssetCache:
+    """Make `derive` read and write outputs under `directory`."""
+    global _active
+    if _active is None or _active.directory != directory:
+        _active = AssetCache(directory)
+    return _active
+
+
+def disable_asset_cache() -> None:
+    global _active
+    _active = None
+    _memo.clear()
+
+
+def active_asset_cache() -> AssetCache | None:
+    return _active
@@ -0,0 +1,241 @@
+"""WAV PCM to BRR, the S-DSP's sample format, for `.incbrr`.
+
+A BRR sample is a run of 9-byte blocks, each holding 16 samples as
+4-bit residuals: a header byte `ssssffle` (shift, prediction filter,
+loop and end flags) followed by the nibbles, high nibble first. The
+decoder here follows the S-DSP arithmetic exactly, and the encoder runs
+the same arithmetic so its prediction history matches what the APU will
+see.
+
+Encoding picks the filter and shift with the least squared error per
+block. Rather than trying all 4 x 13 pairs, it estimates the shift each
+filter needs from the largest ideal residual, drops filters that need a
+coarser shift than the best estimate, and tries only the shifts next to
+each estimate, abandoning a candidate as soon as its error passes the
+best one found.
+
+A looping sample restarts at its loop block with the history of its
+last samples, so that block is encoded with filter 0 (no prediction).
+The loop start is moved onto a block boundary by padding the start of
+the sample with silence; the loop itself must span whole blocks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import wave
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from a816.asset_cache import derive
+
+BLOCK_SAMPLES = 16
+BLOCK_BYTES = 9
+
+_MAX_SHIFT = 12
+_END = 0x01
+_LOOP = 0x02
+
+
+def _predict(filter_: int, p1: int, p2: int) -> int:
+    """S-DSP prediction from the last two decoded samples."""
+    p2 >>= 1
+    if filter_ == 0:
+        return 0
+    if filter_ == 1:
+        return (p1 >> 1) + ((-p1) >> 5)
+    if filter_ == 2:
+        return p1 - p2 + (p2 >> 4) + ((p1 * -3) >> 6)
+    return p1 - p2 + ((p1 * -13) >> 7) + ((p2 * 3) >> 4)
+
+
+def _decode_sample(nibble: int, shift: int, prediction: int) -> int:
+    value = ((nibble << shift) >> 1) + prediction
+    value = max(-0x8000, min(0x7FFF, value))
+    # The DSP keeps samples doubled in 16 bits, dropping the top bit.
+    return ((value * 2 + 0x8000) & 0xFFFF) - 0x8000
+
+
+def decode_brr(data: bytes) -> list[int]:
+    """16-bit samples of every block in `data` up to the end flag."""
+    samples: list[int] = []
+    p1 = p2 = 0
+    for start in range(0, len(data) - BLOCK_BYTES + 1, BLOCK_BYTES):
+        header = data[start]
+        shift, filter_ = header >> 4, (header >> 2) & 3
+        for byte in data[start + 1 : start + BLOCK_BYTES]:
+            for nibble in (byte >> 4, byte & 0x0F):
+                nibble -= (nibble & 8) << 1
+                if shift > _MAX_SHIFT:
+                    # Shifts 13-15 decode as -2048 / 0 whatever the nibble.
+                    value = -0x800 if nibble < 0 else 0
+                    sample = _decode_sample(0, 0, value + _predict(filter_, p1, p2))
+                else:
+                    sample = _decode_sample(nibble, shift, _predict(filter_, p1, p2))
+                samples.append(sample)
+                p1, p2 = sample, p1
+        if header & _END:
+            break
+    return samples
+
+
+def _shift_for(residual: int) -> int:
+    """Smallest shift at which a nibble reaches `residual`."""
+    shift = 0
+    while shift < _MAX_SHIFT and not -(8 << shift) <= residual <= (7 << shift):
+        shift += 1
+    return shift
+
+
+def _encode_block(
+    block: Sequence[int], p1: int, p2: int, filters: Sequence[int], shift_window: int
+) -> tuple[int, list[int], int, int]:
+    """Best `(header, nibbles, p1, p2)` for 16 samples after history `p1`, `p2`."""
+    # Shift estimate per filter from the ideal residuals, predicting from
+    # the source samples once the decoded history runs out.
+    estimates = {}
+    for filter_ in filters:
+        h1, h2 = p1, p2
+        peak = 0
+        for target in block:
+            peak = max(peak, abs(target - 2 * _predict(filter_, h1, h2)))
+            h1, h2 = target, h1
+        estimates[filter_] = _shift_for(peak)
+    # A filter needing a much coarser shift than another one never wins.
+    finest = min(estimates.values())
+
+    best_error = -1
+    best: tuple[int, list[int], int, int] = (0, [], p1, p2)
+    for filter_, estimate in estimates.items():
+        if estimate > finest + shift_window:
+            continue
+        for shift in range(max(0, estimate - shift_window), min(_MAX_SHIFT, estimate + shift_window) + 1):
+            rounding = (1 << shift) >> 1
+            error = 0
+            nibbles = []
+            h1, h2 = p1, p2
+            for target in block:
+                prediction = _predict(filter_, h1, h2)
+                nibble = max(-8, min(7, (target - 2 * prediction + rounding) >> shift))
+                sample = _decode_sample(nibble, shift, prediction)
+                error += (sample - target) ** 2
+                if 0 <= best_error <= error:
+                    break
+                nibbles.append(nibble)
+                h1, h2 = sample, h1
+            else:
+                best_error = error
+                best = (shift << 4 | filter_ << 2, nibbles, h1, h2)
+    return best
+
+
+@dataclass(frozen=True)
+class BrrSample:
+    data: bytes
+    # Byte offset of the loop block, None for one-shot samples.
+    loop_offset: int | None
+
+
+def _padding(length: int, loop_start: int | None) -> int:
+    if loop_start is None:
+        return 0
+    if not 0 <= loop_start < length:
+        raise ValueError(f"loop start {loop_start} is outside the sample ({length} samples)")
+    if (length - loop_start) % BLOCK_SAMPLES:
+        raise ValueError(
+            f"loop of {length - loop_start} samples is not a whole number of {BLOCK_SAMPLES}-sample blocks"
+        )
+    return -loop_start % BLOCK_SAMPLES
+
+
+def loop_offset(length: int, loop_start: int | None) -> int | None:
+    """Byte offset of the loop block in the encoding of `length` samples."""
+    if loop_start is None:
+        return None
+    return (loop_start + _padding(length, loop_start)) // BLOCK_SAMPLES * BLOCK_BYTES
+
+
+def encode_brr(samples: Sequence[int], loop_start: int | None = None, shift_window: int = 1) -> BrrSample:
+    """BRR blocks for 16-bit `samples`, looping back to `loop_start` if given.
+
+    `shift_window` bounds the shifts tried around each filter's estimate;
+    `_MAX_SHIFT` makes the search exhaustive.
+    """
+    if not samples:
+        # Without a block there is no end flag for the DSP to stop at.
+        raise ValueError("no samples to encode")
+    padding = _padding(len(samples), loop_start)
+    padded = [0] * padding + list(samples)
+    padded += [0] * (-len(padded) % BLOCK_SAMPLES)
+    loop_block = None if loop_start is None else (loop_start + padding) // BLOCK_SAMPLES
+    blocks = len(padded) // BLOCK_SAMPLES
+
+    out = bytearray()
+    p1 = p2 = 0
+    for index in range(blocks):
+        block = padded[index * BLOCK_SAMPLES : (index + 1) * BLOCK_SAMPLES]
+        filters = (0,) if index in (0, loop_block) else (0, 1, 2, 3)
+        header, nibbles, p1, p2 = _encode_block(block, p1, p2, filters, shift_window)
+        if index == blocks - 1:
+            header |= _END | (_LOOP if loop_block is not None else 0)
+        out.append(header)
+        out += bytes((high & 0x0F) << 4 | (low & 0x0F) for high, low in zip(nibbles[0::2], nibbles[1::2], strict=True))
+    return BrrSample(bytes(out), loop_offset(len(samples), loop_start))
+
+
+def read_wav(data: bytes) -> tuple[list[int], int]:
+    """Mono 16-bit samples and sample rate of a PCM WAV; channels are averaged."""
+    try:
+        with wave.open(io.BytesIO(data)) as reader:
+            channels, width, rate = reader.getnchannels(), reader.getsampwidth(), reader.getframerate()
+            frames = reader.readframes(reader.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"not a PCM WAV file ({e})" if str(e) else "not a PCM WAV file") from None
+    if width == 1:
+        pcm = array("h", ((value - 0x80) << 8 for value in frames))
+    elif width == 2:
+        pcm = array("h", frames)
+        if sys.byteorder == "big":
+            pcm.byteswap()
+    else:
+        # Keep the top 16 bits of each little-endian sample.
+        pcm = array(
+            "h", b"".join(frames[offset + width - 2 : offset + width] for offset in range(0, len(frames), width))
+        )
+        if sys.byteorder == "big":
+            pcm.byteswap()
+    if channels == 1:
+        return pcm.tolist(), rate
+    return [sum(pcm[frame : frame + channels]) // channels for frame in range(0, len(pcm), channels)], rate
+
+
+def convert_wav(data: bytes, loop_start: int | None = None) -> BrrSample:
+    """`encode_brr` of the WAV `data`, from the asset cache when possible."""
+    samples, _ = read_wav(data)
+    if not samples:
+        raise ValueError("WAV has no samples")
+    offset = loop_offset(len(samples), loop_start)
+    encoded = derive("brr", f"loop={loop_start}", data, lambda _: encode_brr(samples, loop_start).data)
+    return BrrSample(encoded, offset)
+
+
+def brr_main(argv: list[str]) -> int:
+    """`a816 brr sample.wav [--loop N]`: write `sample.brr`."""
+    parser = argparse.ArgumentParser(prog="a816 brr", description="Encode PCM WAV files as SNES BRR samples")
+    parser.add_argument("samples", nargs="+", type=Path, help="PCM WAV files")
+    parser.add_argument("--loop", type=int, help="loop start, in samples (default: no loop)")
+    parser.add_argument("-o", "--output-dir", type=Path, help="directory for the outputs (default: next to each WAV)")
+    args = parser.parse_args(argv)
+
+    for sample in args.samples:
+        brr = convert_wav(sample.read_bytes(), args.loop)
+        output = (args.output_dir or sample.parent) / f"{sample.stem}.brr"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(brr.data)
+        loop = "" if brr.loop_offset is None else f", loop at byte {brr.loop_offset:#x}"
+        print(f"{sample}: {len(brr.data) // BLOCK_BYTES} blocks{loop}")
+    return 0
@@ -28,11 +28,13 @@ import logging
 import sys
 from pathlib import Path
 
+from a816.asset_cache import enable_asset_cache
 from a816.config import discover_a816_config
 from a816.exceptions import A816Error, LinkerError
 from a816.linker import Linker
 from a816.object_file import ObjectFile
 from a816.parse.nodes import NodeError
+from a816.parse.parse_cache import enable_parse_cache
 from a816.program import Program
 
 logger = logging.getLogger("x816")
@@ -46,6 +48,9 @@ def _apply_a816_toml(args: argparse.Namespace) -> None:
     config = discover_a816_config(start if start.is_file() else start.parent)
     if config is None:
         return
+    if config.parse_cache is not None:
+        enable_parse_cache(config.parse_cache)
+        enable_asset_cache(config.parse_cache / "assets")
     if config.include_paths and not args.include_paths:
         args.include_paths = [str(p) for p in config.include_paths]
     if config.module_paths and not args.module_paths:
@@ -239,7 +244,7 @@ def _run_link(args: argparse.Namespace) -> int:
     sys.exit(-1)
 
 
-_SUBCOMMANDS: tuple[str, ...] = ("build", "check", "fix", "format", "explain")
+_SUBCOMMANDS: tuple[str, ...] = ("build", "check", "fix", "format", "explain", "gfx", "brr")
 
 
 def _dispatch_subcommand(argv: list[str]) -> int | None:
@@ -259,6 +264,14 @@ def _dispatch_subcommand(argv: list[str]) -> int | None:
         from a816.fluff import fluff_main
 
         return fluff_main([cmd, *rest])
+    if cmd == "gfx":
+        from a816.gfx import gfx_main
+
+        return gfx_main(rest)
+    if cmd == "brr":
+        from a816.brr import brr_main
+
+        return brr_main(rest)
     return None
 
 
@@ -0,0 +1,321 @@
+"""Built-in compression codecs for `.incbin_lz`.
+
+Three codecs are available, each with an encoder and a decoder:
+
+- `lz77`: the LZ10 format of the Nintendo BIOS (`0x10` and a 24-bit
+  size, then flag bytes read MSB first; a set bit is a 2-byte copy of
+  3-18 bytes from up to 4 KiB back).
+- `lz4snes`: a 16-bit little-endian decompressed size followed by a
+  standard LZ4 block, sized for a decompressor that works on one bank.
+- `rle`: a control byte below `0x80` copies that many plus one literal
+  bytes, `0x80`-`0xFE` repeats the next byte `control - 0x80 + 3` times,
+  and `0xFF` ends the stream.
+
+The LZ encoders find matches through hash chains over the
+minimum-match prefix and parse greedily with one step of lazy
+evaluation. Compressing large assets in pure Python is slow, so
+`compress` goes through the asset cache: a rebuild with unchanged
+assets never runs an encoder.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from a816.asset_cache import derive
+
+# Candidates tried per position. Longer chains find longer matches in
+# repetitive data at a roughly proportional cost in speed.
+CHAIN_LIMIT = 32
+
+
+def _match_length(data: bytes, candidate: int, position: int, limit: int) -> int:
+    """Length (up to `limit`) of the common run at `candidate` and `position`."""
+    length = 0
+    while length + 32 <= limit and (
+        data[candidate + length : candidate + length + 32] == data[position + length : position + length + 32]
+    ):
+        length += 32
+    while length < limit and data[candidate + length] == data[position + length]:
+        length += 1
+    return length
+
+
+def _find_matches(
+    data: bytes,
+    min_match: int,
+    max_match: int,
+    window: int,
+    search_end: int,
+    match_end: int,
+) -> list[tuple[int, int, int]]:
+    """Non-overlapping `(position, length, distance)` back-references in `data`.
+
+    Matches start before `search_end`, end at or before `match_end` and
+    reach at most `window` bytes back. Positions not covered by a match
+    are literals.
+    """
+    head: dict[bytes, int] = {}
+    previous = [-1] * len(data)
+    inserted = 0
+
+    def longest(position: int) -> tuple[int, int]:
+        nonlocal inserted
+        for chained in range(inserted, position):
+            key = data[chained : chained + min_match]
+            previous[chained] = head.get(key, -1)
+            head[key] = chained
+        inserted = max(inserted, position)
+
+        limit = min(max_match, match_end - position)
+        if limit < min_match:
+            return 0, 0
+        candidate = head.get(data[position : position + min_match], -1)
+        lowest = position - window
+        best_length = best_distance = 0
+        for _ in range(CHAIN_LIMIT):
+            if candidate < lowest or candidate < 0:
+                break
+            if data[candidate + best_length] == data[position + best_length]:
+                length = _match_length(data, candidate, position, limit)
+                if length > best_length:
+                    best_length, best_distance = length, position - candidate
+                    if length == limit:
+                        break
+            candidate = previous[candidate]
+        return best_length, best_distance
+
+    matches: list[tuple[int, int, int]] = []
+    position = 0
+    pending: tuple[int, int] | None = None
+    while position < search_end:
+        length, distance = pending if pending is not None else longest(position)
+        pending = None
+        if length < min_match:
+            position += 1
+            continue
+        if length < max_match and position + 1 < search_end:
+            # Lazy evaluation: a longer match one byte on wins over this one.
+            following = longest(position + 1)
+            if following[0] > length:
+                pending = following
+                position += 1
+                continue
+        matches.append((position, length, distance))
+        position += length
+    return matches
+
+
+def _copy_match(out: bytearray, distance: int, length: int) -> None:
+    start = len(out) - distance
+    if distance >= length:
+        out += out[start : start + length]
+    else:
+        # Overlapping copy: the run repeats its own output.
+        for index in range(start, start + length):
+            out.append(out[index])
+
+
+def lz77_compress(data: bytes) -> bytes:
+    if len(data) > 0xFFFFFF:
+        raise ValueError(f"lz77 input is {len(data):#x} bytes, the format holds at most 0xffffff")
+    out = bytearray(b"\x10" + len(data).to_bytes(3, "little"))
+    matches = _find_matches(data, 3, 18, 0x1000, len(data) - 2, len(data))
+    position = flag_position = mask = 0
+    for start, length, distance in (*matches, (len(data), 0, 0)):
+        while position < start or length:
+            if not mask:
+                flag_position = len(out)
+                out.append(0)
+                mask = 0x80
+            if position < start:
+                out.append(data[position])
+                position += 1
+            else:
+                out[flag_position] |= mask
+                out.extend((((length - 3) << 4) | ((distance - 1) >> 8), (distance - 1) & 0xFF))
+                position += length
+                length = 0
+            mask >>= 1
+    return bytes(out)
+
+
+def lz77_decompress(data: bytes) -> bytes:
+    if data[:1] != b"\x10":
+        raise ValueError("lz77 stream does not start with 0x10")
+    size = int.from_bytes(data[1:4], "little")
+    out = bytearray()
+    position = 4
+    try:
+        while len(out) < size:
+            flags = data[position]
+            position += 1
+            for bit in range(7, -1, -1):
+                if len(out) >= size:
+                    break
+                if not flags >> bit & 1:
+                    out.append(data[position])
+                    position += 1
+                    continue
+                high, low = data[position], data[position + 1]
+                position += 2
+                distance = ((high & 0x0F) << 8 | low) + 1
+                if distance > len(out):
+                    raise ValueError(f"lz77 copy reaches {distance} bytes back, before the start of the output")
+                _copy_match(out, distance, (high >> 4) + 3)
+    except IndexError:
+        raise ValueError("lz77 stream is truncated") from None
+    return bytes(out[:size])
+
+
+def _lz4_extend(out: bytearray, value: int) -> None:
+    while value >= 0xFF:
+        out.append(0xFF)
+        value -= 0xFF
+    out.append(value)
+
+
+def lz4snes_compress(data: bytes) -> bytes:
+    if len(data) > 0xFFFF:
+        raise ValueError(f"lz4snes input is {len(data):#x} bytes, the format holds at most 0xffff")
+    out = bytearray(len(data).to_bytes(2, "little"))
+    # LZ4 blocks end with at least 5 literals, and the last match starts
+    # at least 12 bytes before the end.
+    matches = _find_matches(data, 4, 0xFFFF, 0xFFFF, len(data) - 12, len(data) - 5)
+    position = 0
+    for start, length, distance in matches:
+        literals = start - position
+        extra = length - 4
+        out.append(min(literals, 15) << 4 | min(extra, 15))
+        if literals >= 15:
+            _lz4_extend(out, literals - 15)
+        out += data[position:start]
+        out += distance.to_bytes(2, "little")
+        if extra >= 15:
+            _lz4_extend(out, extra - 15)
+        position = start + length
+    literals = len(data) - position
+    out.append(min(literals, 15) << 4)
+    if literals >= 15:
+        _lz4_extend(out, literals - 15)
+    out += data[position:]
+    return bytes(out)
+
+
+def lz4snes_decompress(data: bytes) -> bytes:
+    if len(data) < 3:
+        raise ValueError("lz4snes stream is truncated")
+    size = int.from_bytes(data[:2], "little")
+    out = bytearray()
+    position = 2
+
+    def extended(value: int) -> int:
+        nonlocal position
+        if value == 15:
+            while True:
+                byte = data[position]
+                position += 1
+                value += byte
+                if byte != 0xFF:
+                    break
+        return value
+
+    try:
+        while True:
+            token = data[position]
+            position += 1
+            literals = extended(token >> 4)
+            if position + literals > len(data):
+                raise IndexError
+            out += data[position : position + literals]
+            position += literals
+            if position == len(data):
+                break
+            distance = int.from_bytes(data[position : position + 2], "little")
+            position += 2
+            if not 0 < distance <= len(out):
+                raise ValueError(f"lz4snes copy reaches {distance} bytes back, outside the output")
+            _copy_match(out, distance, extended(token & 0x0F) + 4)
+    except IndexError:
+        raise ValueError("lz4snes stream is truncated") from None
+    if len(out) != size:
+        raise ValueError(f"lz4snes stream holds {len(out):#x} bytes, its header says {size:#x}")
+    return bytes(out)
+
+
+def _rle_literals(out: bytearray, literals: bytes) -> None:
+    for start in range(0, len(literals), 0x80):
+        chunk = literals[start : start + 0x80]
+        out.append(len(chunk) - 1)
+        out += chunk
+
+
+def rle_compress(data: bytes) -> bytes:
+    out = bytearray()
+    position = literal_start = 0
+    while position < len(data):
+        byte = data[position]
+        limit = min(len(data) - position, 0x7E + 3)
+        run = 1
+        while run < limit and data[position + run] == byte:
+            run += 1
+        if run >= 3:
+            _rle_literals(out, data[literal_start:position])
+            out.extend((0x80 + run - 3, byte))
+            literal_start = position + run
+        position += run
+    _rle_literals(out, data[literal_start:])
+    out.append(0xFF)
+    return bytes(out)
+
+
+def rle_decompress(data: bytes) -> bytes:
+    out = bytearray()
+    position = 0
+    try:
+        while (control := data[position]) != 0xFF:
+            if control < 0x80:
+                if position + control + 2 > len(data):
+                    raise IndexError
+                out += data[position + 1 : position + control + 2]
+                position += control + 2
+            else:
+                out += bytes([data[position + 1]]) * (control - 0x80 + 3)
+                position += 2
+    except IndexError:
+        raise ValueError("rle stream is truncated") from None
+    return bytes(out)
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+    # Encoder settings that shape the output; part of the cache key.
+    parameters: str = ""
+
+
+CODECS: dict[str, Codec] = {
+    codec.name: codec
+    for codec in (
+        Codec("lz77", lz77_compress, lz77_decompress, f"window=4096 chain={CHAIN_LIMIT} lazy=1"),
+        Codec("lz4snes", lz4snes_compress, lz4snes_decompress, f"window=65535 chain={CHAIN_LIMIT} lazy=1"),
+        Codec("rle", rle_compress, rle_decompress),
+    )
+}
+
+
+def get_codec(name: str) -> Codec:
+    """The codec called `name`; ValueError lists the known ones otherwise."""
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"unknown codec {name!r} (expected one of {', '.join(CODECS)})") from None
+
+
+def compress(data: bytes, codec_name: str) -> bytes:
+    """`data` compressed with the codec `codec_name`, from the asset cache when possible."""
+    codec = get_codec(codec_name)
+    return derive(f"compress:{codec.name}", codec.parameters, data, codec.compress)
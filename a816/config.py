@@ -12,6 +12,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 CONFIG_FILENAME = "a816.toml"
+DEFAULT_PARSE_CACHE_DIRNAME = ".a816-cache"
 
 
 @dataclass(frozen=True)
@@ -27,6 +28,11 @@ class A816Config:
     # `--experimental NAME` (and `--no-experimental NAME` for explicit
     # off). Mirrors the [experimental] table in `a816.toml`.
     experimental: dict[str, bool] = field(default_factory=dict)
+    # Directory of the shared on-disk parse cache (`parse-cache = true`
+    # picks `.a816-cache/` next to the config); None leaves it off.
+    # Derived assets (`.incbin_lz` outputs and the like) are cached in its
+    # `assets/` subdirectory.
+    parse_cache: Path | None = None
 
     @property
     def root(self) -> Path:
@@ -51,6 +57,15 @@ def _resolve_paths(root: Path, raw: list[str]) -> list[Path]:
     return [(root / item).resolve() for item in raw]
 
 
+def parse_cache_dir(root: Path, raw: object) -> Path | None:
+    """Resolve the `parse-cache` setting: `true`, a directory, or off."""
+    if raw is True:
+        return root / DEFAULT_PARSE_CACHE_DIRNAME
+    if isinstance(raw, str) and raw:
+        return (root / raw).resolve()
+    return None
+
+
 def load_a816_toml(config_path: Path) -> A816Config | None:
     """Parse the project config. Return None on read / decode errors."""
     try:
@@ -63,12 +78,14 @@ def load_a816_toml(config_path: Path) -> A816Config | None:
     entry_path = (root / entry).resolve() if isinstance(entry, str) else None
     raw_experimental = data.get("experimental", {}) or {}
     experimental = {str(k): bool(v) for k, v in raw_experimental.items() if isinstance(v, bool)}
+    parse_cache = parse_cache_dir(root, data.get("parse-cache"))
     return A816Config(
         config_path=config_path,
         entrypoint=entry_path,
         include_paths=_resolve_paths(root, data.get("include-paths", []) or []),
         module_paths=_resolve_paths(root, data.get("module-paths", []) or []),
         experimental=experimental,
+        parse_cache=parse_cache,
     )
 
 
@@ -5,8 +5,10 @@ Provides instruction decoding with support for all addressing modes.
 """
 
 from collections.abc import Callable, Iterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import cache
+from typing import NamedTuple
 
 from a816.cpu.cpu_65c816 import (
     BlockMoveOpcode,
@@ -17,6 +19,7 @@ from a816.cpu.cpu_65c816 import (
     snes_opcode_table,
 )
 from a816.cpu.types import AddressingMode as _AsmMode
+from a816.util import MappedBytes
 
 
 class AddrMode(Enum):
@@ -50,6 +53,38 @@ class AddrMode(Enum):
     BLOCK_MOVE = "blk"  # Block move (2 bytes)
 
 
+# Operand templates for the fixed-width modes: mode -> (hex digits, format string).
+_OPERAND_TEMPLATES: dict[AddrMode, tuple[int, str]] = {
+    AddrMode.IMMEDIATE_8: (2, "#{}"),
+    AddrMode.IMMEDIATE_16: (4, "#{}"),
+    AddrMode.DIRECT: (2, "{}"),
+    AddrMode.DIRECT_X: (2, "{},x"),
+    AddrMode.DIRECT_Y: (2, "{},y"),
+    AddrMode.DIRECT_IND: (2, "({})"),
+    AddrMode.DIRECT_IND_X: (2, "({},x)"),
+    AddrMode.DIRECT_IND_Y: (2, "({}),y"),
+    AddrMode.DIRECT_IND_LONG: (2, "[{}]"),
+    AddrMode.DIRECT_IND_LONG_Y: (2, "[{}],y"),
+    AddrMode.ABSOLUTE: (4, "{}"),
+    AddrMode.ABSOLUTE_X: (4, "{},x"),
+    AddrMode.ABSOLUTE_Y: (4, "{},y"),
+    AddrMode.ABSOLUTE_LONG: (6, "{}"),
+    AddrMode.ABSOLUTE_LONG_X: (6, "{},x"),
+    AddrMode.ABSOLUTE_IND: (4, "({})"),
+    AddrMode.ABSOLUTE_IND_X: (4, "({},x)"),
+    AddrMode.ABSOLUTE_IND_LONG: (4, "[{}]"),
+    AddrMode.STACK_REL: (2, "{},s"),
+    AddrMode.STACK_REL_IND_Y: (2, "({},s),y"),
+}
+
+
+# (instruction, hex formatter, m_flag, x_flag, label_map) -> operand text.
+OperandFormatter = Callable[
+    ["Instruction", Callable[[int, int], str], bool, bool, dict[int, str] | None],
+    str,
+]
+
+
 @dataclass
 class Instruction:
     """Decoded instruction."""
@@ -61,6 +96,8 @@ class Instruction:
     operand_bytes: bytes  # Raw operand bytes
     operand_value: int  # Decoded operand value
     length: int  # Total instruction length
+    # Bound by the decoder; looked up from mnemonic and mode when None.
+    formatter: "OperandFormatter | None" = field(default=None, repr=False, compare=False)
 
     def relative_target(self) -> int:
         """Compute the 24-bit absolute target for a relative branch.
@@ -90,36 +127,12 @@ class Instruction:
         use_a816_syntax: 0x prefix instead of $.
         label_map: address -> label substitution for branch / jump targets.
         """
-        val = self.operand_value
 
         def hex_val(v: int, width: int) -> str:
             return (f"0x{v:0{width}X}") if use_a816_syntax else (f"${v:0{width}X}")
 
-        # Static templates: (width, format_string).
-        templates: dict[AddrMode, tuple[int, str]] = {
-            AddrMode.IMMEDIATE_8: (2, "#{}"),
-            AddrMode.IMMEDIATE_16: (4, "#{}"),
-            AddrMode.DIRECT: (2, "{}"),
-            AddrMode.DIRECT_X: (2, "{},x"),
-            AddrMode.DIRECT_Y: (2, "{},y"),
-            AddrMode.DIRECT_IND: (2, "({})"),
-            AddrMode.DIRECT_IND_X: (2, "({},x)"),
-            AddrMode.DIRECT_IND_Y: (2, "({}),y"),
-            AddrMode.DIRECT_IND_LONG: (2, "[{}]"),
-            AddrMode.DIRECT_IND_LONG_Y: (2, "[{}],y"),
-            AddrMode.ABSOLUTE: (4, "{}"),
-            AddrMode.ABSOLUTE_X: (4, "{},x"),
-            AddrMode.ABSOLUTE_Y: (4, "{},y"),
-            AddrMode.ABSOLUTE_LONG: (6, "{}"),
-            AddrMode.ABSOLUTE_LONG_X: (6, "{},x"),
-            AddrMode.ABSOLUTE_IND: (4, "({})"),
-            AddrMode.ABSOLUTE_IND_X: (4, "({},x)"),
-            AddrMode.ABSOLUTE_IND_LONG: (4, "[{}]"),
-            AddrMode.STACK_REL: (2, "{},s"),
-            AddrMode.STACK_REL_IND_Y: (2, "({},s),y"),
-        }
-
-        return self._dispatch_operand_format(val, templates, hex_val, m_flag, x_flag, use_a816_syntax, label_map)
+        formatter = self.formatter or operand_formatter(self.mnemonic, self.mode)
+        return formatter(self, hex_val, m_flag, x_flag, label_map)
 
     def _format_relative_target(self, hex_val: Callable[[int, int], str], label_map: dict[int, str] | None) -> str:
         target = self.relative_target()
@@ -141,38 +154,6 @@ class Instruction:
             return label_map[target]
         return hex_val(val, width)
 
-    def _dispatch_operand_format(
-        self,
-        val: int,
-        templates: dict[AddrMode, tuple[int, str]],
-        hex_val: Callable[[int, int], str],
-        m_flag: bool,
-        x_flag: bool,
-        use_a816_syntax: bool,
-        label_map: dict[int, str] | None = None,
-    ) -> str:
-        if self.mode == AddrMode.IMPLIED:
-            return ""
-        # Absolute jumps / calls — use label substitution when known.
-        if self.mnemonic in ("jmp", "jsr", "jsl") and self.mode in (
-            AddrMode.ABSOLUTE,
-            AddrMode.ABSOLUTE_LONG,
-        ):
-            width = 6 if self.mode == AddrMode.ABSOLUTE_LONG else 4
-            return self._format_jump_target(val, width, hex_val, label_map)
-        if self.mode in templates:
-            width, fmt = templates[self.mode]
-            return fmt.format(hex_val(val, width))
-        if self.mode == AddrMode.IMMEDIATE_M:
-            return f"#{hex_val(val, 2 if m_flag else 4)}"
-        if self.mode == AddrMode.IMMEDIATE_X:
-            return f"#{hex_val(val, 2 if x_flag else 4)}"
-        if self.mode in (AddrMode.RELATIVE, AddrMode.RELATIVE_LONG):
-            return self._format_relative_target(hex_val, label_map)
-        if self.mode == AddrMode.BLOCK_MOVE:
-            return f"{hex_val(val & 0xFF, 2)},{hex_val((val >> 8) & 0xFF, 2)}"
-        return (f"0x{val:X}") if use_a816_syntax else (f"${val:X}")
-
     def get_size_hint(self) -> str:
         """Get the size hint suffix for a816 syntax (.b, .w, .l).
 
@@ -216,6 +197,34 @@ class Instruction:
         return self.mnemonic
 
 
+@cache
+def operand_formatter(mnemonic: str, mode: AddrMode) -> OperandFormatter:
+    """The operand formatter for `mnemonic` in `mode`, chosen once per pair."""
+    if mode == AddrMode.IMPLIED:
+        return lambda inst, hex_val, m_flag, x_flag, label_map: ""
+    # Absolute jumps / calls — use label substitution when known.
+    if mnemonic in ("jmp", "jsr", "jsl") and mode in (AddrMode.ABSOLUTE, AddrMode.ABSOLUTE_LONG):
+        jump_width = 6 if mode == AddrMode.ABSOLUTE_LONG else 4
+        return lambda inst, hex_val, m_flag, x_flag, label_map: inst._format_jump_target(
+            inst.operand_value, jump_width, hex_val, label_map
+        )
+    template = _OPERAND_TEMPLATES.get(mode)
+    if template is not None:
+        width, fmt = template
+        return lambda inst, hex_val, m_flag, x_flag, label_map: fmt.format(hex_val(inst.operand_value, width))
+    if mode == AddrMode.IMMEDIATE_M:
+        return lambda inst, hex_val, m_flag, x_flag, label_map: f"#{hex_val(inst.operand_value, 2 if m_flag else 4)}"
+    if mode == AddrMode.IMMEDIATE_X:
+        return lambda inst, hex_val, m_flag, x_flag, label_map: f"#{hex_val(inst.operand_value, 2 if x_flag else 4)}"
+    if mode in (AddrMode.RELATIVE, AddrMode.RELATIVE_LONG):
+        return lambda inst, hex_val, m_flag, x_flag, label_map: inst._format_relative_target(hex_val, label_map)
+    if mode == AddrMode.BLOCK_MOVE:
+        return lambda inst, hex_val, m_flag, x_flag, label_map: (
+            f"{hex_val(inst.operand_value & 0xFF, 2)},{hex_val((inst.operand_value >> 8) & 0xFF, 2)}"
+        )
+    return lambda inst, hex_val, m_flag, x_flag, label_map: hex_val(inst.operand_value, 0)
+
+
 # Opcode table: opcode -> (mnemonic, addressing_mode, operand_size)
 # operand_size: 0=none, 1=byte, 2=word, 3=long, -1=M-dependent, -2=X-dependent
 #
@@ -322,6 +331,42 @@ def _derive_opcode_table() -> dict[int, tuple[str, AddrMode, int]]:
 OPCODE_TABLE: dict[int, tuple[str, AddrMode, int]] = _derive_opcode_table()
 
 
+class DecodeEntry(NamedTuple):
+    """One decode-table slot with the M/X-dependent width already resolved."""
+
+    mnemonic: str
+    mode: AddrMode
+    length: int  # opcode byte + operand bytes
+    sets_flags: bool  # rep / sep: the operand rewrites M / X
+    format: OperandFormatter  # operand formatter for this mnemonic and mode
+
+
+def _operand_size(base_size: int, m_flag: bool, x_flag: bool) -> int:
+    if base_size == -1:  # M-dependent
+        return 1 if m_flag else 2
+    if base_size == -2:  # X-dependent
+        return 1 if x_flag else 2
+    return base_size
+
+
+def _build_decode_table(m_flag: bool, x_flag: bool) -> tuple[DecodeEntry | None, ...]:
+    """Flatten `OPCODE_TABLE` into a 256-slot table for one (M, X) state. Unused bytes are None."""
+    table: list[DecodeEntry | None] = [None] * 256
+    for opcode, (mnemonic, mode, base_size) in OPCODE_TABLE.items():
+        length = 1 + _operand_size(base_size, m_flag, x_flag)
+        table[opcode] = DecodeEntry(
+            mnemonic, mode, length, mnemonic in ("rep", "sep"), operand_formatter(mnemonic, mode)
+        )
+    return tuple(table)
+
+
+# DECODE_TABLES[m_flag][x_flag][opcode]: the four (M, X) combinations,
+# indexed directly by the flag booleans.
+DECODE_TABLES: tuple[tuple[tuple[DecodeEntry | None, ...], ...], ...] = tuple(
+    tuple(_build_decode_table(bool(m), bool(x)) for x in range(2)) for m in range(2)
+)
+
+
 class Disassembler:
     """65c816 disassembler."""
 
@@ -338,15 +383,11 @@ class Disassembler:
 
     def get_operand_size(self, base_size: int) -> int:
         """Get actual operand size based on processor flags."""
-        if base_size == -1:  # M-dependent
-            return 1 if self.m_flag else 2
-        elif base_size == -2:  # X-dependent
-            return 1 if self.x_flag else 2
-        return base_size
+        return _operand_size(base_size, self.m_flag, self.x_flag)
 
     @staticmethod
     def _decode_operand(operand_bytes: bytes) -> int:
-        return sum(b << (8 * i) for i, b in enumerate(operand_bytes))
+        return int.from_bytes(operand_bytes, "little")
 
     @staticmethod
     def _data_byte(address: int, opcode: int, raw: bytes) -> Instruction:
@@ -369,24 +410,29 @@ class Disassembler:
         if operand_value & 0x10:
             self.x_flag = new_state
 
-    def decode_instruction(self, data: bytes, address: int) -> Instruction | None:
-        """Decode a single instruction. Returns None on empty input."""
-        if not data:
+    def decode_instruction(self, data: MappedBytes | memoryview, address: int, offset: int = 0) -> Instruction | None:
+        """Decode the instruction at `data[offset]`. Returns None past the end.
+
+        Decoding from an offset lets callers walk a whole buffer without
+        slicing off the remainder for every instruction.
+        """
+        if offset >= len(data):
             return None
 
-        opcode = data[0]
-        if opcode not in OPCODE_TABLE:
+        opcode = data[offset]
+        entry = DECODE_TABLES[self.m_flag][self.x_flag][opcode]
+        if entry is None:
             return self._data_byte(address, opcode, bytes([opcode]))
 
-        mnemonic, mode, base_size = OPCODE_TABLE[opcode]
-        operand_size = self.get_operand_size(base_size)
-        total_length = 1 + operand_size
-        if len(data) < total_length:
-            return self._data_byte(address, opcode, data)
+        mnemonic, mode, total_length, sets_flags, formatter = entry
+        end = offset + total_length
+        if len(data) < end:
+            return self._data_byte(address, opcode, bytes(data[offset:]))
 
-        operand_bytes = data[1:total_length]
-        operand_value = self._decode_operand(operand_bytes)
-        self._track_register_flags(mnemonic, operand_value)
+        operand_bytes = bytes(data[offset + 1 : end])
+        operand_value = int.from_bytes(operand_bytes, "little")
+        if sets_flags:
+            self._track_register_flags(mnemonic, operand_value)
 
         return Instruction(
             address=address,
@@ -396,9 +442,10 @@ class Disassembler:
             operand_bytes=operand_bytes,
             operand_value=operand_value,
             length=total_length,
+            formatter=formatter,
         )
 
-    def disassemble(self, data: bytes, start_address: int, count: int | None = None) -> list[Instruction]:
+    def disassemble(self, data: bytes | memoryview, start_address: int, count: int | None = None) -> list[Instruction]:
         """
         Disassemble a sequence of bytes.
 
@@ -410,26 +457,30 @@ class Disassembler:
         Returns:
             List of decoded Instructions
         """
-        instructions: list[Instruction] = []
+        return list(self.iter_disassemble(data, start_address, count))
+
+    def iter_disassemble(
+        self, data: bytes | memoryview, start_address: int, count: int | None = None
+    ) -> Iterator[Instruction]:
+        """Lazily decode `data`; same contract as `disassemble`."""
         offset = 0
         address = start_address
+        decoded = 0
 
         while offset < len(data):
-            if count is not None and len(instructions) >= count:
+            if count is not None and decoded >= count:
                 break
 
-            remaining = data[offset:]
-            inst = self.decode_instruction(remaining, address)
+            inst = self.decode_instruction(data, address, offset)
 
             if inst is None:
                 break
 
-            instructions.append(inst)
+            yield inst
+            decoded += 1
             offset += inst.length
             address += inst.length
 
-        return instructions
-
 
 _CONDITIONAL_BRANCHES = frozenset({"bcc", "bcs", "beq", "bmi", "bne", "bpl", "bvc", "bvs"})
 _UNCONDITIONAL_BRANCHES = frozenset({"bra", "brl"})
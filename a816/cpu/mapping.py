@@ -1,5 +1,9 @@
+from collections.abc import Iterable
 from typing import Any
 
+# Banks of the 24-bit 65c816 address space.
+BANK_COUNT = 0x100
+
 
 class Mapping:
     def __init__(
@@ -15,18 +19,21 @@ class Mapping:
         self.address_range = address_range
         self.mask = mask
         self.writable = writeable
+        # Constant parts of the conversions below.
+        self._first_bank = bank_range[0]
+        self._offset_mask = ~mask & 0xFFFF
+        self._window_start = mask & 0xFFFF
 
     def physical_address(self, value: int) -> int | None:
-        bank = value >> 16
         if self.writable is False:
-            return (bank - self.bank_range[0]) * self.mask + (value & ~self.mask & 0xFFFF)
+            return ((value >> 16) - self._first_bank) * self.mask + (value & self._offset_mask)
         else:
             return None
 
     def logical_address(self, value: int) -> int:
         bank = value // self.mask
 
-        return (bank + self.bank_range[0]) << 16 | (self.mask & 0xFFFF) + value % self.mask
+        return (bank + self._first_bank) << 16 | self._window_start + value % self.mask
 
 
 class Bus:
@@ -35,19 +42,27 @@ class Bus:
         self.lookup: dict[int, str] = {}
         self.inverse_lookup: dict[str, int] = {}
         self.mappings: dict[str, Mapping] = {}
+        # Mapping serving each bank, None where unmapped. Rebuilt by `map`
+        # and `unmap` so resolving a bank is one list index.
+        self.bank_mappings: list[Mapping | None] = [None] * BANK_COUNT
         self.editable = True
         self.internal_id = 0
 
     def has_mappings(self) -> bool:
         return self.mappings != {}
 
+    def _rebuild_bank_mappings(self) -> None:
+        self.bank_mappings = [
+            self.mappings.get(self.lookup[bank]) if bank in self.lookup else None for bank in range(BANK_COUNT)
+        ]
+
     def get_mapping_for_bank(self, bank: int) -> Mapping:
-        try:
-            return self.mappings[self.lookup[bank]]
-        except KeyError as exc:
+        mapping = self.bank_mappings[bank] if 0 <= bank < BANK_COUNT else None
+        if mapping is None:
             from a816.exceptions import UnmappedBankError
 
-            raise UnmappedBankError(bank, mapped_banks=list(self.lookup.keys())) from exc
+            raise UnmappedBankError(bank, mapped_banks=list(self.lookup.keys()))
+        return mapping
 
     def map(
         self,
@@ -72,6 +87,7 @@ class Bus:
 
             for bank in range(mirror_bank_range[0], mirror_bank_range[1] + 1):
                 self.lookup[bank] = mirror_identifier
+        self._rebuild_bank_mappings()
 
     def unmap(self, identifier: str) -> None:
         if self.editable is not True:
@@ -82,12 +98,42 @@ class Bus:
         mirror_identifier = f"{identifier}_mirror"
         if mirror_identifier in self.mappings.keys():
             del self.mappings[mirror_identifier]
+        self._rebuild_bank_mappings()
 
     def get_address(self, addr: int) -> "Address":
         return Address(self, addr)
 
+    def rom_mapping(self) -> Mapping | None:
+        """First read-only mapping, the one physical offsets map through."""
+        for mapping in self.mappings.values():
+            if not mapping.writable:
+                return mapping
+        return None
+
+    def physical_addresses(self, logical_addresses: Iterable[int]) -> list[int | None]:
+        """Physical offset of each logical address; None for writable or unmapped banks."""
+        bank_mappings = self.bank_mappings
+        physicals: list[int | None] = []
+        for logical_address in logical_addresses:
+            bank = logical_address >> 16
+            mapping = bank_mappings[bank] if 0 <= bank < BANK_COUNT else None
+            physicals.append(None if mapping is None else mapping.physical_address(logical_address))
+        return physicals
+
+    def logical_addresses(self, physical_addresses: Iterable[int]) -> list[int]:
+        """Logical address of each physical offset through `rom_mapping`.
+
+        Offsets pass through unchanged when the bus maps no ROM.
+        """
+        mapping = self.rom_mapping()
+        if mapping is None:
+            return list(physical_addresses)
+        return [mapping.logical_address(physical_address) for physical_address in physical_addresses]
+
 
 class Address:
+    __slots__ = ("bus", "logical_value", "mapping")
+
     def __init__(self, bus: Bus, logical_value: int) -> None:
         self.bus: Bus = bus
         self.logical_value: int = logical_value
@@ -117,13 +163,23 @@ class Address:
 
     def __add__(self, other: Any) -> "Address":
         if isinstance(other, int):
-            mapping = self._get_mapping()
+            bank = self.logical_value >> 16
+            mapping = self.bus.bank_mappings[bank] if 0 <= bank < BANK_COUNT else None
+            if mapping is None:
+                mapping = self._get_mapping()
             physical_address = mapping.physical_address(self.logical_value)
             if physical_address is not None:
                 logical_address = mapping.logical_address(physical_address + other)
             else:
                 logical_address = self.logical_value + other
-            return Address(self.bus, logical_address)
+            if logical_address >> 16 != bank:
+                return Address(self.bus, logical_address)
+            # Same bank, same mapping: skip the lookup `__init__` would redo.
+            address = object.__new__(Address)
+            address.bus = self.bus
+            address.logical_value = logical_address
+            address.mapping = mapping
+            return address
         else:
             raise ValueError("Address can only be added with ints.")
 
@@ -142,6 +198,8 @@ class LinearAddress(Address):
     (`pc.physical - start.physical`) stays exact.
     """
 
+    __slots__ = ()
+
     def __init__(self, logical_value: int) -> None:
         # No bus/mapping: object-mode binding is pure offset arithmetic.
         self.bus = None  # type: ignore[assignment]
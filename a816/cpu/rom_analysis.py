@@ -0,0 +1,322 @@
+"""Whole-ROM recursive-descent disassembly.
+
+Where `disassemble_function` walks one function from one entry, this
+module analyses every reachable instruction of a ROM at once:
+
+  - seeds come from the native NMI / IRQ and emulation RESET vectors
+    plus any extra entry points (typically `.adbg` labels);
+  - a worklist of basic blocks keyed by `(address, m_flag, x_flag)` is
+    shared across all seeds, so code reached from several entries is
+    decoded once;
+  - a block ends at every control transfer and after every `rep` /
+    `sep`, so each block decodes under a single M/X state and the new
+    state flows to its successors along the CFG;
+  - a branch into the middle of an existing block splits it.
+
+Results can be cached in a JSON sidecar keyed by the ROM's SHA-1, the
+bus and the seed set; a cache hit only re-decodes the recorded blocks.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from a816.cpu.disassembler import (
+    _CONDITIONAL_BRANCHES,
+    _RETURNS,
+    _UNCONDITIONAL_BRANCHES,
+    _UNCONDITIONAL_JUMPS,
+    Disassembler,
+    Instruction,
+    _absolute_jump_target,
+)
+from a816.cpu.mapping import Bus
+from a816.exceptions import UnmappedBankError
+from a816.util import MappedBytes, map_file, write_atomically
+
+logger = logging.getLogger("a816.rom_analysis")
+
+CACHE_VERSION = 1
+
+# Vector slots in bank $00 (native mode unless noted).
+VECTORS: dict[str, int] = {
+    "nmi": 0xFFEA,
+    "irq": 0xFFEE,
+    "reset": 0xFFFC,  # emulation mode
+}
+
+BlockKey = tuple[int, bool, bool]
+
+
+@dataclass
+class BasicBlock:
+    """Straight-line run of instructions decoded under one M/X state."""
+
+    start: int
+    m_flag: bool
+    x_flag: bool
+    instructions: list[Instruction] = field(default_factory=list)
+    successors: list[BlockKey] = field(default_factory=list)
+
+    @property
+    def key(self) -> BlockKey:
+        return self.start, self.m_flag, self.x_flag
+
+
+@dataclass
+class RomAnalysis:
+    """Result of `analyze_rom`: the basic blocks reached from the seeds."""
+
+    seeds: list[BlockKey]
+    blocks: dict[BlockKey, BasicBlock] = field(default_factory=dict)
+    from_cache: bool = False
+
+    def instructions(self) -> list[Instruction]:
+        """Every decoded instruction in address order (first M/X state wins on overlap)."""
+        by_address: dict[int, Instruction] = {}
+        for key in sorted(self.blocks):
+            for inst in self.blocks[key].instructions:
+                by_address.setdefault(inst.address, inst)
+        return [by_address[addr] for addr in sorted(by_address)]
+
+    def conflicts(self) -> set[int]:
+        """Addresses decoded under more than one M/X state."""
+        seen: dict[int, BlockKey] = {}
+        conflicting: set[int] = set()
+        for key, block in self.blocks.items():
+            for inst in block.instructions:
+                if seen.setdefault(inst.address, key)[1:] != key[1:]:
+                    conflicting.add(inst.address)
+        return conflicting
+
+
+def _physical(bus: Bus, address: int) -> int | None:
+    """ROM offset of logical `address`, or None for RAM / unmapped space."""
+    try:
+        mapping = bus.get_mapping_for_bank(address >> 16)
+    except UnmappedBankError:
+        return None
+    low, high = mapping.address_range
+    if mapping.writable or not low <= address & 0xFFFF <= high:
+        return None
+    return mapping.physical_address(address)
+
+
+def _bank0_address(bus: Bus, address: int) -> int:
+    """Map a bank-$00 vector target onto a bank the bus knows.
+
+    HiROM buses only describe $40-$7F / $C0-$FF; bank $00:8000-$FFFF
+    mirrors $C0:8000-$FFFF there.
+    """
+    if _physical(bus, address) is None and _physical(bus, 0xC00000 | address) is not None:
+        return 0xC00000 | address
+    return address
+
+
+def vector_seeds(rom: MappedBytes, bus: Bus, m_flag: bool = True, x_flag: bool = True) -> dict[str, BlockKey]:
+    """Entry points read from the interrupt vectors.
+
+    RESET starts in emulation mode (M = X = 1); NMI / IRQ use the given
+    default flags. Empty ($0000 / $FFFF) or unreadable vectors are skipped.
+    """
+    seeds: dict[str, BlockKey] = {}
+    for name, slot in VECTORS.items():
+        physical = _physical(bus, _bank0_address(bus, slot))
+        if physical is None or physical + 2 > len(rom):
+            continue
+        target = int.from_bytes(rom[physical : physical + 2], "little")
+        if target in (0x0000, 0xFFFF):
+            continue
+        if name == "reset":
+            seeds[name] = (_bank0_address(bus, target), True, True)
+        else:
+            seeds[name] = (_bank0_address(bus, target), m_flag, x_flag)
+    return seeds
+
+
+def _successors(inst: Instruction, m_flag: bool, x_flag: bool) -> list[BlockKey]:
+    """CFG successors of a block-ending instruction, carrying the post-instruction M/X.
+
+    Calls are assumed to return with the flags they were entered with.
+    """
+    next_key = (inst.address + inst.length, m_flag, x_flag)
+    mnemonic = inst.mnemonic
+    if mnemonic in _UNCONDITIONAL_JUMPS:
+        target = _absolute_jump_target(inst)
+        return [(target, m_flag, x_flag)] if target is not None else []
+    if mnemonic in _UNCONDITIONAL_BRANCHES:
+        return [(inst.relative_target(), m_flag, x_flag)]
+    if mnemonic in _CONDITIONAL_BRANCHES:
+        return [(inst.relative_target(), m_flag, x_flag), next_key]
+    if mnemonic in ("jsr", "jsl"):
+        target = _absolute_jump_target(inst)
+        return ([(target, m_flag, x_flag)] if target is not None else []) + [next_key]
+    if mnemonic in ("rep", "sep"):
+        return [next_key]
+    return []  # rts / rtl / rti / stp
+
+
+def _ends_block(inst: Instruction) -> bool:
+    return (
+        inst.mnemonic in _RETURNS
+        or inst.mnemonic in _UNCONDITIONAL_JUMPS
+        or inst.mnemonic in _UNCONDITIONAL_BRANCHES
+        or inst.mnemonic in _CONDITIONAL_BRANCHES
+        or inst.mnemonic in ("jsr", "jsl", "rep", "sep", "stp")
+    )
+
+
+class _Walker:
+    """Worklist state for one `analyze_rom` run."""
+
+    def __init__(self, rom: MappedBytes, bus: Bus, budget: int) -> None:
+        self.rom = rom
+        self.bus = bus
+        self.budget = budget
+        self.blocks: dict[BlockKey, BasicBlock] = {}
+        # (address, m, x) of every decoded instruction -> owning block key.
+        self.owner: dict[BlockKey, BlockKey] = {}
+
+    def split(self, key: BlockKey) -> None:
+        """Turn the instruction at `key` (inside another block) into a block start."""
+        block = self.blocks[self.owner[key]]
+        index = next(i for i, inst in enumerate(block.instructions) if inst.address == key[0])
+        tail = BasicBlock(key[0], key[1], key[2], block.instructions[index:], block.successors)
+        block.instructions = block.instructions[:index]
+        block.successors = [key]
+        self.blocks[key] = tail
+        for inst in tail.instructions:
+            self.owner[(inst.address, key[1], key[2])] = key
+
+    def visit(self, key: BlockKey) -> list[BlockKey]:
+        """Decode the block at `key` (or split into it). Returns new work."""
+        if key in self.blocks:
+            return []
+        if key in self.owner:
+            self.split(key)
+            return []
+        start, m_flag, x_flag = key
+        block = BasicBlock(start, m_flag, x_flag)
+        decoder = Disassembler(m_flag=m_flag, x_flag=x_flag)
+        cur = start
+        while self.budget > 0:
+            if cur != start and (cur, m_flag, x_flag) in self.owner:
+                # Fell through into already decoded code.
+                block.successors = [(cur, m_flag, x_flag)]
+                break
+            physical = _physical(self.bus, cur)
+            if physical is None:
+                break
+            inst = decoder.decode_instruction(self.rom, cur, physical)
+            if inst is None or inst.mnemonic == ".db" or (cur & 0xFFFF) + inst.length > 0x10000:
+                break  # past the ROM end, truncated, or wrapping the bank
+            block.instructions.append(inst)
+            self.owner[(cur, m_flag, x_flag)] = key
+            self.budget -= 1
+            if _ends_block(inst):
+                block.successors = _successors(inst, decoder.m_flag, decoder.x_flag)
+                break
+            cur += inst.length
+        if not block.instructions:
+            return []
+        self.blocks[key] = block
+        return list(block.successors)
+
+
+def analyze_rom(
+    rom: MappedBytes,
+    bus: Bus,
+    seeds: Iterable[BlockKey],
+    max_instructions: int = 1_000_000,
+) -> RomAnalysis:
+    """Recursive-descent disassembly of `rom` from every seed.
+
+    `seeds` are `(logical_address, m_flag, x_flag)` entry points.
+    `max_instructions` caps the total decode budget.
+    """
+    seed_list = sorted(set(seeds))
+    walker = _Walker(rom, bus, max_instructions)
+    work = list(reversed(seed_list))
+    while work and walker.budget > 0:
+        work.extend(walker.visit(work.pop()))
+    return RomAnalysis(seed_list, walker.blocks)
+
+
+def rom_digest(rom: MappedBytes) -> str:
+    return hashlib.sha1(rom).hexdigest()
+
+
+def _cache_key(rom: MappedBytes, bus: Bus, seeds: list[BlockKey]) -> dict[str, object]:
+    return {
+        "version": CACHE_VERSION,
+        "sha1": rom_digest(rom),
+        "bus": bus.name,
+        "seeds": [list(seed) for seed in seeds],
+    }
+
+
+def _to_json(analysis: RomAnalysis, key: dict[str, object]) -> dict[str, object]:
+    blocks = [
+        [block.start, block.m_flag, block.x_flag, len(block.instructions), [list(s) for s in block.successors]]
+        for block in analysis.blocks.values()
+    ]
+    return {**key, "blocks": blocks}
+
+
+def _from_json(payload: dict[str, object], rom: MappedBytes, bus: Bus, seeds: list[BlockKey]) -> RomAnalysis:
+    analysis = RomAnalysis(seeds, from_cache=True)
+    raw_blocks = payload["blocks"]
+    assert isinstance(raw_blocks, list)
+    for start, m_flag, x_flag, count, successors in raw_blocks:
+        block = BasicBlock(start, m_flag, x_flag, successors=[(s, m, x) for s, m, x in successors])
+        decoder = Disassembler(m_flag=m_flag, x_flag=x_flag)
+        cur = start
+        for _ in range(count):
+            physical = _physical(bus, cur)
+            inst = decoder.decode_instruction(rom, cur, physical) if physical is not None else None
+            if inst is None:
+                raise ValueError(f"cached block ${start:06X} no longer decodes")
+            block.instructions.append(inst)
+            cur += inst.length
+        analysis.blocks[block.key] = block
+    return analysis
+
+
+def default_cache_path(rom_path: Path) -> Path:
+    """Sidecar next to the ROM: `game.sfc` -> `game.sfc.xdds.json`."""
+    return rom_path.with_name(rom_path.name + ".xdds.json")
+
+
+def analyze_rom_file(
+    rom_path: Path,
+    bus: Bus,
+    extra_seeds: Iterable[BlockKey] = (),
+    m_flag: bool = True,
+    x_flag: bool = True,
+    cache_path: Path | None = None,
+) -> RomAnalysis:
+    """Analyse `rom_path` from its vectors plus `extra_seeds`, using `cache_path` when given.
+
+    A cache entry is reused only when ROM hash, bus and seeds all match;
+    otherwise the ROM is re-analysed and the sidecar rewritten.
+    """
+    with map_file(rom_path) as rom:
+        seeds = sorted(set(vector_seeds(rom, bus, m_flag, x_flag).values()) | set(extra_seeds))
+        key = _cache_key(rom, bus, seeds)
+        if cache_path is not None and cache_path.exists():
+            try:
+                payload = json.loads(cache_path.read_text())
+                if isinstance(payload, dict) and all(payload.get(k) == v for k, v in key.items()):
+                    return _from_json(payload, rom, bus, seeds)
+            except (OSError, ValueError, TypeError, KeyError):
+                logger.debug("Ignoring unreadable analysis cache %s", cache_path, exc_info=True)
+        analysis = analyze_rom(rom, bus, seeds)
+        if cache_path is not None:
+            try:
+                write_atomically(cache_path, json.dumps(_to_json(analysis, key)).encode())
+            except OSError:
+                logger.debug("Could not write analysis cache %s", cache_path, exc_info=True)
+        return analysis
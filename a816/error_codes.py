@@ -54,6 +54,7 @@ E_PARSER_INCLUDE_FAILED = ErrorCode("E0109", "parser", "include file unreadable"
 E_SYMBOL_NOT_DEFINED = ErrorCode("E0200", "symbols", "symbol not defined in scope")
 E_SYMBOL_EXTERNAL_NOT_ALLOWED = ErrorCode("E0201", "symbols", "external reference outside object mode")
 E_SYMBOL_UNRESOLVABLE_EXPRESSION = ErrorCode("E0202", "symbols", "expression failed to evaluate")
+E_SYMBOL_UNSTABLE = ErrorCode("E0203", "symbols", "symbol values never settle")
 
 # --- Codegen (E0300..) ---
 E_CODEGEN_NODE_ERROR = ErrorCode("E0300", "codegen", "node failed during emission")
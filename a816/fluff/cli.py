@@ -290,8 +290,11 @@ def _parse_select(raw: list[str] | None) -> set[str] | None:
 
 def _config_paths_for(source: Path) -> tuple[list[Path] | None, list[Path] | None]:
     from a816.config import discover_a816_config
+    from a816.parse.parse_cache import enable_parse_cache
 
     config = discover_a816_config(source)
+    if config is not None and config.parse_cache is not None:
+        enable_parse_cache(config.parse_cache)
     return (
         config.include_paths if config is not None else None,
         config.module_paths if config is not None else None,
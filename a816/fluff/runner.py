@@ -34,6 +34,7 @@ from a816.fluff.rules_style import (
 )
 from a816.fluff.rules_upgrade import StarEqualToAllocAt
 from a816.parse.mzparser import A816Parser
+from a816.parse.parse_cache import enable_parse_cache
 
 RULES: list[Rule] = [
     MissingModuleDocstring(),
@@ -66,6 +67,7 @@ def lint_text(
     *,
     include_paths: list[Path] | None = None,
     module_paths: list[Path] | None = None,
+    store_parse: bool = True,
 ) -> list[Diagnostic]:
     """Run every registered rule against in-memory source text.
 
@@ -74,9 +76,10 @@ def lint_text(
     lets struct-type rules (S001) follow `.import` chains so cross-
     module struct names resolve. The fluff CLI fills both from the
     project's `a816.toml`; callers without a config can pass them
-    explicitly.
+    explicitly. `store_parse=False` keeps the parse out of the on-disk
+    parse cache, for editor buffers.
     """
-    result = A816Parser.parse_as_ast(text, str(path), include_paths=include_paths)
+    result = A816Parser.parse_as_ast(text, str(path), include_paths=include_paths, store=store_parse)
     parse_failed = bool(result.error)
     nodes = None if parse_failed else list(result.nodes)
     ctx = LintContext(
@@ -171,6 +174,8 @@ def lint_file(path: Path) -> list[Diagnostic]:
     lint context respectively.
     """
     config = discover_a816_config(path)
+    if config is not None and config.parse_cache is not None:
+        enable_parse_cache(config.parse_cache)
     include_paths = config.include_paths if config is not None else None
     module_paths = config.module_paths if config is not None else None
     return lint_text(
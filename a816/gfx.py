@@ -0,0 +1,285 @@
+"""Indexed PNG to SNES tiles, tilemap and palette, for `.incgfx`.
+
+The image is cut into 8x8 tiles packed as 2, 4 or 8bpp planar data
+(row-interleaved bitplane pairs, as the PPU reads them). Tiles that
+repeat, possibly flipped horizontally and/or vertically, are stored
+once; the tilemap lists one 16-bit BG entry per image tile in row-major
+order (`vhopppcc cccccccc`: tile number, palette, and flip bits).
+
+Colour indexes above the bpp range select the palette: with 4bpp,
+index 0x23 is colour 3 of palette 2. Every pixel of a tile must then
+share a palette. The palette part is the PNG's `PLTE` converted to
+BGR555 words.
+
+Bitplanes are extracted for the whole image at once: the pixels, read
+as one big integer, give every row of every tile one 64-bit lane, and a
+handful of shifts and masks gather bit `p` of the eight pixels of each
+lane into one byte.
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from a816.asset_cache import derive
+
+BPP_CHOICES = (2, 4, 8)
+PARTS = ("tiles", "map", "palette")
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_COLOR_GRAYSCALE = 0
+_COLOR_INDEXED = 3
+
+# byte -> byte with its bits in reverse order; flips a plane row.
+_REVERSED = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+
+# BG tilemap entry fields.
+_MAP_TILE_LIMIT = 0x400
+_MAP_PALETTE_SHIFT = 10
+_MAP_HFLIP = 0x4000
+_MAP_VFLIP = 0x8000
+
+
+@dataclass(frozen=True)
+class IndexedImage:
+    width: int
+    height: int
+    # One colour index per pixel, row-major.
+    pixels: bytes
+    palette: list[tuple[int, int, int]]
+
+
+def _unfilter(raw: bytes, stride: int, height: int, filter_bpp: int) -> bytes:
+    """Undo the per-scanline PNG filters of `raw`."""
+    out = bytearray()
+    previous = bytes(stride)
+    position = 0
+    for _ in range(height):
+        kind = raw[position]
+        row = bytearray(raw[position + 1 : position + 1 + stride])
+        position += 1 + stride
+        if kind == 1:
+            for index in range(filter_bpp, stride):
+                row[index] = (row[index] + row[index - filter_bpp]) & 0xFF
+        elif kind == 2:
+            row = bytearray((a + b) & 0xFF for a, b in zip(row, previous, strict=True))
+        elif kind == 3:
+            for index in range(stride):
+                left = row[index - filter_bpp] if index >= filter_bpp else 0
+                row[index] = (row[index] + ((left + previous[index]) >> 1)) & 0xFF
+        elif kind == 4:
+            for index in range(stride):
+                left = row[index - filter_bpp] if index >= filter_bpp else 0
+                up = previous[index]
+                up_left = previous[index - filter_bpp] if index >= filter_bpp else 0
+                estimate = left + up - up_left
+                distance_left, distance_up, distance_up_left = (
+                    abs(estimate - left),
+                    abs(estimate - up),
+                    abs(estimate - up_left),
+                )
+                if distance_left <= distance_up and distance_left <= distance_up_left:
+                    predictor = left
+                elif distance_up <= distance_up_left:
+                    predictor = up
+                else:
+                    predictor = up_left
+                row[index] = (row[index] + predictor) & 0xFF
+        elif kind != 0:
+            raise ValueError(f"PNG scanline uses unknown filter {kind}")
+        out += row
+        previous = bytes(row)
+    return bytes(out)
+
+
+def read_indexed_png(data: bytes) -> IndexedImage:
+    """Decode a non-interlaced indexed (or grayscale) PNG of up to 8 bits per pixel."""
+    if not data.startswith(_PNG_SIGNATURE):
+        raise ValueError("not a PNG file")
+    header = b""
+    palette: list[tuple[int, int, int]] = []
+    compressed = bytearray()
+    position = len(_PNG_SIGNATURE)
+    while position + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[position : position + 8])
+        body = data[position + 8 : position + 8 + length]
+        crc = data[position + 8 + length : position + 12 + length]
+        if len(body) != length or zlib.crc32(kind + body).to_bytes(4, "big") != crc:
+            raise ValueError(f"PNG chunk {kind.decode('latin-1')} is damaged")
+        position += 12 + length
+        if kind == b"IHDR":
+            header = body
+        elif kind == b"PLTE":
+            palette = [(body[index], body[index + 1], body[index + 2]) for index in range(0, len(body) - 2, 3)]
+        elif kind == b"IDAT":
+            compressed += body
+        elif kind == b"IEND":
+            break
+    if len(header) != 13:
+        raise ValueError("PNG has no image header")
+    width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+    if color_type not in (_COLOR_INDEXED, _COLOR_GRAYSCALE) or depth > 8:
+        raise ValueError("PNG must be indexed (or grayscale) with at most 8 bits per pixel")
+    if interlace:
+        raise ValueError("interlaced PNGs are not supported")
+
+    stride = (width * depth + 7) // 8
+    try:
+        raw = zlib.decompress(compressed)
+    except zlib.error:
+        raise ValueError("PNG image data is corrupt") from None
+    if len(raw) < (stride + 1) * height:
+        raise ValueError("PNG image data is truncated")
+    rows = _unfilter(raw, stride, height, 1)
+    if depth == 8:
+        return IndexedImage(width, height, rows, palette)
+    # Expand packed pixels: each byte holds 8 / depth indexes, MSB first.
+    per_byte = 8 // depth
+    mask = (1 << depth) - 1
+    expand = [bytes((value >> (8 - depth * (slot + 1))) & mask for slot in range(per_byte)) for value in range(256)]
+    pixels = b"".join(
+        b"".join(expand[value] for value in rows[row * stride : (row + 1) * stride])[:width] for row in range(height)
+    )
+    return IndexedImage(width, height, pixels, palette)
+
+
+def _bitplanes(pixels: bytes, depth: int) -> list[bytes]:
+    """Bit `p` of every 8-pixel lane of `pixels`, for each `p < depth`.
+
+    Lane `n` (pixels `8n`-`8n+7`) becomes byte `n` of each plane, its
+    first pixel in bit 7.
+    """
+    lanes = len(pixels) // 8
+    ones = int.from_bytes(b"\x01" * len(pixels), "big")
+    low_bytes = int.from_bytes(b"\x00\x00\x00\x00\x00\x00\x00\xff" * lanes, "big")
+    image = int.from_bytes(pixels, "big")
+    planes = []
+    for plane in range(depth):
+        # Bit `plane` of pixel k sits at bit 56 - 8k of its lane; shifts by
+        # multiples of 7 fold all eight of them into the lane's low byte.
+        bits = (image >> plane) & ones
+        bits |= bits >> 7
+        bits |= bits >> 14
+        bits |= bits >> 28
+        planes.append((bits & low_bytes).to_bytes(len(pixels), "big")[7::8])
+    return planes
+
+
+def _interleave(planes: list[bytes]) -> bytes:
+    """SNES planar layout: rows of planes 0/1 interleaved, then 2/3, ..."""
+    out = bytearray()
+    for pair in range(0, len(planes), 2):
+        rows = bytearray(16)
+        rows[0::2] = planes[pair]
+        rows[1::2] = planes[pair + 1]
+        out += rows
+    return bytes(out)
+
+
+@dataclass(frozen=True)
+class TileSet:
+    tiles: bytes
+    tilemap: bytes
+    palette: bytes
+
+
+def _tile_palette(banks: bytes, width: int, x: int, y: int) -> int:
+    used = set(b"".join(banks[(y + row) * width + x : (y + row) * width + x + 8] for row in range(8)))
+    if len(used) > 1:
+        raise ValueError(f"tile at ({x}, {y}) mixes palettes {', '.join(map(str, sorted(used)))}")
+    palette = used.pop()
+    if palette > 7:
+        raise ValueError(f"tile at ({x}, {y}) uses palette {palette}, above 7")
+    return palette
+
+
+def _known_variant(known: dict[tuple[bytes, ...], int], rows: list[bytes]) -> int | None:
+    """Map entry (tile number and flip bits) of a stored tile equal to `rows`, maybe flipped."""
+    mirrored = [row.translate(_REVERSED) for row in rows]
+    for flips, variant in (
+        (0, rows),
+        (_MAP_HFLIP, mirrored),
+        (_MAP_VFLIP, [row[::-1] for row in rows]),
+        (_MAP_HFLIP | _MAP_VFLIP, [row[::-1] for row in mirrored]),
+    ):
+        index = known.get(tuple(variant))
+        if index is not None:
+            return index | flips
+    return None
+
+
+def convert_image(image: IndexedImage, bpp: int) -> TileSet:
+    """Deduplicated planar tiles, BG tilemap and BGR555 palette of `image`."""
+    if bpp not in BPP_CHOICES:
+        raise ValueError(f"bpp must be one of {', '.join(map(str, BPP_CHOICES))}, not {bpp}")
+    if image.width % 8 or image.height % 8:
+        raise ValueError(f"image is {image.width}x{image.height}, not a whole number of 8x8 tiles")
+    columns = image.width // 8
+    planes = _bitplanes(image.pixels, bpp)
+    # Palette number of each pixel, from the index bits above `bpp`.
+    banks = image.pixels.translate(bytes(value >> bpp for value in range(256))) if bpp < 8 else None
+
+    tiles = bytearray()
+    entries: list[int] = []
+    known: dict[tuple[bytes, ...], int] = {}
+    for tile_row in range(image.height // 8):
+        for column in range(columns):
+            lane = tile_row * 8 * columns + column
+            rows = [plane[lane : lane + 8 * columns : columns] for plane in planes]
+            palette = 0 if banks is None else _tile_palette(banks, image.width, column * 8, tile_row * 8)
+            entry = _known_variant(known, rows)
+            if entry is None:
+                if len(known) == _MAP_TILE_LIMIT:
+                    raise ValueError(f"image needs more than {_MAP_TILE_LIMIT} distinct tiles")
+                entry = known[tuple(rows)] = len(known)
+                tiles += _interleave(rows)
+            entries.append(entry | palette << _MAP_PALETTE_SHIFT)
+
+    colors = [(red >> 3) | (green >> 3) << 5 | (blue >> 3) << 10 for red, green, blue in image.palette]
+    return TileSet(
+        bytes(tiles),
+        struct.pack(f"<{len(entries)}H", *entries),
+        struct.pack(f"<{len(colors)}H", *colors),
+    )
+
+
+def _pack(tile_set: TileSet) -> bytes:
+    return (
+        struct.pack("<II", len(tile_set.tiles), len(tile_set.tilemap))
+        + tile_set.tiles
+        + tile_set.tilemap
+        + tile_set.palette
+    )
+
+
+def _unpack(packed: bytes) -> TileSet:
+    tiles_size, map_size = struct.unpack_from("<II", packed)
+    tiles_end = 8 + tiles_size
+    return TileSet(packed[8:tiles_end], packed[tiles_end : tiles_end + map_size], packed[tiles_end + map_size :])
+
+
+def convert_png(data: bytes, bpp: int) -> TileSet:
+    """`convert_image` of the PNG `data`, from the asset cache when possible."""
+    return _unpack(derive("gfx", f"bpp={bpp}", data, lambda png: _pack(convert_image(read_indexed_png(png), bpp))))
+
+
+def gfx_main(argv: list[str]) -> int:
+    """`a816 gfx image.png --bpp N`: write `.tiles`, `.map` and `.pal` files."""
+    parser = argparse.ArgumentParser(prog="a816 gfx", description="Convert indexed PNGs to SNES tiles")
+    parser.add_argument("images", nargs="+", type=Path, help="indexed PNG files")
+    parser.add_argument("--bpp", type=int, choices=BPP_CHOICES, default=4, help="bits per pixel (default 4)")
+    parser.add_argument("-o", "--output-dir", type=Path, help="directory for the outputs (default: next to each image)")
+    args = parser.parse_args(argv)
+
+    for image in args.images:
+        tile_set = convert_png(image.read_bytes(), args.bpp)
+        output = (args.output_dir or image.parent) / image.stem
+        output.parent.mkdir(parents=True, exist_ok=True)
+        for suffix, content in ((".tiles", tile_set.tiles), (".map", tile_set.tilemap), (".pal", tile_set.palette)):
+            output.with_name(output.name + suffix).write_bytes(content)
+        print(f"{image}: {len(tile_set.tiles) // (8 * args.bpp)} tiles, {len(tile_set.tilemap) // 2} map entries")
+    return 0
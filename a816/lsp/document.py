@@ -65,9 +65,14 @@ def _struct_node_in_file(path: Path, name: str) -> StructAstNode | None:
 class A816Document:
     """Represents an a816 assembly document with analysis capabilities"""
 
-    def __init__(self, uri: str, content: str, include_paths: list[Path] | None = None):
+    def __init__(
+        self, uri: str, content: str, include_paths: list[Path] | None = None, store_parse: bool = False
+    ) -> None:
         self.uri = uri
         self.content = content
+        # Write parses to the on-disk parse cache: only for text read from
+        # disk, never for editor buffers that change on every keystroke.
+        self.store_parse = store_parse
         self.include_paths: list[Path] = include_paths or []
         self.lines = content.splitlines()
         self.symbols: dict[str, tuple[Position, str]] = {}  # symbol -> (position, file_uri)
@@ -132,7 +137,9 @@ class A816Document:
         """Analyze document using the parser and extract symbols, labels, and diagnostics"""
         try:
             # Parse using the actual a816 parser
-            parser_result = A816Parser.parse_as_ast(self.content, self.uri, include_paths=self.include_paths)
+            parser_result = A816Parser.parse_as_ast(
+                self.content, self.uri, include_paths=self.include_paths, store=self.store_parse
+            )
             self.ast_nodes = parser_result.nodes
             self.parse_error = parser_result.parse_error
             self.parse_errors = list(parser_result.parse_errors or [])
@@ -387,12 +394,13 @@ class A816Document:
         token = node.file_info
         if not token.position:
             return
-        symbol_base = node.file_path.replace("/", "_").replace(".", "_")
+        symbol_base = node.symbol_base
         pos = Position(line=token.position.line, character=token.position.column)
         file_uri = self._get_file_uri_for_token(token)
         self.symbols[symbol_base] = (pos, file_uri)
         self.labels[symbol_base] = (pos, file_uri)
-        self.symbols[f"{symbol_base}__size"] = (pos, file_uri)
+        for symbol in node.auto_symbols[1:]:
+            self.symbols[symbol] = (pos, file_uri)
 
     def _set_docstring(self, target: tuple[str, str], text: str) -> None:
         cleaned = inspect.cleandoc(text)
@@ -549,7 +557,7 @@ class A816Document:
         parsed = urlparse(self.uri)
         path = Path(parsed.path) if parsed.scheme == "file" else Path(self.uri)
         try:
-            hits = lint_text(self.content, path, include_paths=self.include_paths)
+            hits = lint_text(self.content, path, include_paths=self.include_paths, store_parse=self.store_parse)
         except (AttributeError, KeyError, IndexError, TypeError, ValueError) as exc:
             logger.warning("fluff lint failed for %s: %s", self.uri, exc)
             return
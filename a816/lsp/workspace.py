@@ -20,7 +20,10 @@ except ModuleNotFoundError:  # pragma: no cover
 
 from lsprotocol.types import Diagnostic, DiagnosticSeverity, Location, Position, Range
 
+from a816.asset_cache import enable_asset_cache
+from a816.config import parse_cache_dir
 from a816.lsp.document import A816Document
+from a816.parse.parse_cache import enable_parse_cache
 from a816.stdlib import resolve_stdlib_module
 from a816.util import uri_to_path
 
@@ -119,7 +122,9 @@ class WorkspaceIndex:
         from `source_path` without re-reading files already in the index,
         so open-buffer edits don't get clobbered by their on-disk copy."""
         for path, sub_content in self._walk(self._extract_includes(source_path, content), {source_path.resolve()}):
-            self._store_document(A816Document(path.as_uri(), sub_content, include_paths=self.include_paths))
+            self._store_document(
+                A816Document(path.as_uri(), sub_content, include_paths=self.include_paths, store_parse=True)
+            )
 
     def remove_document(self, uri: str) -> None:
         """Remove a document from the index."""
@@ -137,7 +142,7 @@ class WorkspaceIndex:
         except OSError:
             self.remove_document(uri)
             return
-        doc = A816Document(path.as_uri(), content, include_paths=self.include_paths)
+        doc = A816Document(path.as_uri(), content, include_paths=self.include_paths, store_parse=True)
         self.replace_document(doc)
 
     def get_label_location(self, name: str) -> Location | None:
@@ -247,6 +252,10 @@ class WorkspaceIndex:
         config_root = config_file.parent
         self._merge_path_list(self.include_paths, config_root, data.get("include-paths", []))
         self._merge_path_list(self.module_paths, config_root, data.get("module-paths", []))
+        parse_cache = parse_cache_dir(config_root, data.get("parse-cache"))
+        if parse_cache is not None:
+            enable_parse_cache(parse_cache)
+            enable_asset_cache(parse_cache / "assets")
 
         entry = data.get("entrypoint")
         if not entry:
@@ -279,7 +288,9 @@ class WorkspaceIndex:
         workspace rebuild after `clear()`, so no existing index entry
         is at risk of being clobbered."""
         for path, content in self._walk([entrypoint.resolve()], set(), skip_indexed=False):
-            self._store_document(A816Document(path.as_uri(), content, include_paths=self.include_paths))
+            self._store_document(
+                A816Document(path.as_uri(), content, include_paths=self.include_paths, store_parse=True)
+            )
 
     def _walk(
         self,
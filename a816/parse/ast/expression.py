@@ -1,6 +1,9 @@
 import ctypes
+import operator
 import re
 from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
 
 from a816.exceptions import ExternalExpressionReference, ExternalSymbolReference
 from a816.parse.ast.nodes import (
@@ -9,10 +12,11 @@ from a816.parse.ast.nodes import (
     CastValueExprNode,
     ExpressionAstNode,
     ExprNode,
+    Parenthesis,
     Term,
     UnaryOp,
 )
-from a816.parse.tokens import TokenType
+from a816.parse.tokens import Token, TokenType
 from a816.symbols import Resolver
 
 OPERATOR_PRECEDENCE = {
@@ -99,24 +103,24 @@ def eval_number(number: str) -> int:
 
 
 _INT_BINOPS: dict[str, Callable[[int, int], int]] = {
-    "+": lambda a, b: a + b,
-    "-": lambda a, b: a - b,
-    "*": lambda a, b: a * b,
-    "&": lambda a, b: a & b,
-    "|": lambda a, b: a | b,
-    ">>": lambda a, b: a >> b,
-    "<<": lambda a, b: a << b,
-    ">=": lambda a, b: a >= b,
-    "<=": lambda a, b: a <= b,
-    "<": lambda a, b: a < b,
-    ">": lambda a, b: a > b,
-    "==": lambda a, b: a == b,
-    "!=": lambda a, b: a != b,
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "&": operator.and_,
+    "|": operator.or_,
+    ">>": operator.rshift,
+    "<<": operator.lshift,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "<": operator.lt,
+    ">": operator.gt,
+    "==": operator.eq,
+    "!=": operator.ne,
 }
 
 _STR_BINOPS: dict[str, Callable[[str, str], int]] = {
-    "==": lambda a, b: a == b,
-    "!=": lambda a, b: a != b,
+    "==": operator.eq,
+    "!=": operator.ne,
 }
 
 
@@ -153,56 +157,114 @@ def _apply_binary(op: str, v1: int | str, v2: int | str) -> int:
     raise RuntimeError("Mismatched types in expression")
 
 
-def _collect_external_symbols(ordered: list[ExprNode], resolver: Resolver) -> set[str]:
+# Instructions of a compiled expression, `(opcode, argument)` pairs.
+_PUSH = 0  # constant int or str
+_LOAD = 1  # identifier name, looked up in the current scope
+_UNARY = 2  # operator
+_BINARY = 3  # (operator, int callable or None when ints are unsupported)
+_CAST_ACCESS = 4  # (inner expression, struct field symbol)
+_CAST_VALUE = 5  # inner expression
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """Postfix program of an `ExpressionAstNode`, built once by `compile_expression`.
+
+    `identifiers` lists the top-level identifier terms in evaluation order,
+    for the object-mode external-symbol check.
+    """
+
+    code: tuple[tuple[int, Any], ...]
+    identifiers: tuple[str, ...]
+
+
+def _compile_term(term: ExprNode) -> tuple[int, Any] | None:
+    if isinstance(term, CastAccessExprNode):
+        field_symbol = ".".join([term.type_name, *term.field_path])
+        return _CAST_ACCESS, (ExpressionAstNode(list(term.inner)), field_symbol)
+    if isinstance(term, CastValueExprNode):
+        return _CAST_VALUE, ExpressionAstNode(list(term.inner))
+    if term.token.type == TokenType.NUMBER:
+        return _PUSH, eval_number(term.token.value)
+    if term.token.type == TokenType.QUOTED_STRING:
+        return _PUSH, term.token.value[1:-1]
+    if term.token.type == TokenType.IDENTIFIER:
+        return _LOAD, term.token.value
+    return None
+
+
+def compile_expression(expression: ExpressionAstNode) -> CompiledExpression:
+    """Return the postfix program of `expression`, compiling it on first use.
+
+    The program is cached on the node: its tokens never change after
+    parsing, and symbol values are looked up when the program runs.
+    """
+    compiled = expression.compiled
+    if compiled is not None:
+        return compiled
+    code: list[tuple[int, Any]] = []
+    for current in shunting_yard(expression.tokens):
+        if isinstance(current, UnaryOp):
+            code.append((_UNARY, current.token.value))
+        elif isinstance(current, BinOp):
+            op = current.token.value
+            code.append((_BINARY, (op, _INT_BINOPS.get(op))))
+        else:
+            instruction = _compile_term(current)
+            if instruction is not None:
+                code.append(instruction)
+    identifiers = tuple(arg for opcode, arg in code if opcode == _LOAD)
+    compiled = CompiledExpression(tuple(code), identifiers)
+    expression.compiled = compiled
+    return compiled
+
+
+def expression_names(expression: ExpressionAstNode) -> frozenset[str]:
+    """Every symbol name evaluating `expression` looks up, casts included."""
+    names: set[str] = set()
+    for opcode, arg in compile_expression(expression).code:
+        if opcode == _LOAD:
+            names.add(arg)
+        elif opcode == _CAST_ACCESS:
+            inner, field_symbol = arg
+            names.add(field_symbol)
+            names |= expression_names(inner)
+        elif opcode == _CAST_VALUE:
+            names |= expression_names(arg)
+    return frozenset(names)
+
+
+def bare_name(expression: ExpressionAstNode) -> str | None:
+    """The symbol `expression` consists of, or None when it computes anything else."""
+    code = compile_expression(expression).code
+    if len(code) != 1 or code[0][0] != _LOAD:
+        return None
+    name: str = code[0][1]
+    return name
+
+
+def _collect_external_symbols(identifiers: tuple[str, ...], resolver: Resolver) -> set[str]:
     external_symbols: set[str] = set()
-    for current in ordered:
-        if current.token.type != TokenType.IDENTIFIER:
-            continue
+    for name in identifiers:
         try:
-            resolver.current_scope.value_for(current.token.value)
+            resolver.current_scope.value_for(name)
         except ExternalSymbolReference as e:
             external_symbols.add(e.symbol_name)
     return external_symbols
 
 
-def _eval_inner(inner: list[ExprNode], resolver: Resolver) -> int | str:
-    return eval_expression(ExpressionAstNode(list(inner)), resolver)
-
-
-def _push_term(current: ExprNode, resolver: Resolver, values_stack: list[int | str]) -> None:
-    if isinstance(current, CastAccessExprNode):
-        base = _eval_inner(current.inner, resolver)
-        if not isinstance(base, int):
-            raise RuntimeError(f"Cast base does not evaluate to an address: {base!r}")
-        field_symbol = ".".join([current.type_name, *current.field_path])
-        offset = resolver.current_scope.value_for(field_symbol)
-        if not isinstance(offset, int):
-            raise RuntimeError(f"Struct field {field_symbol!r} did not resolve to an offset")
-        values_stack.append(base + offset)
-        return
-    if isinstance(current, CastValueExprNode):
-        base = _eval_inner(current.inner, resolver)
-        if not isinstance(base, int):
-            raise RuntimeError(f"Cast base does not evaluate to an address: {base!r}")
-        values_stack.append(base)
-        return
-    if current.token.type == TokenType.NUMBER:
-        values_stack.append(eval_number(current.token.value))
-    elif current.token.type == TokenType.QUOTED_STRING:
-        values_stack.append(current.token.value[1:-1])
-    elif current.token.type == TokenType.IDENTIFIER:
-        resolved_value = resolver.current_scope.value_for(current.token.value)
-        if not isinstance(resolved_value, int | str):
-            raise RuntimeError(f"Unable  to resolve {current.token.value}")
-        values_stack.append(resolved_value)
+def _eval_cast_base(inner: ExpressionAstNode, resolver: Resolver) -> int:
+    base = eval_expression(inner, resolver)
+    if not isinstance(base, int):
+        raise RuntimeError(f"Cast base does not evaluate to an address: {base!r}")
+    return base
 
 
 def eval_expression(expression: ExpressionAstNode, resolver: Resolver) -> int | str:
     """Evaluate an expression, detecting external symbol references"""
-    ordered = shunting_yard(expression.tokens)
-
-    if resolver.context.is_object_mode:
-        external_symbols = _collect_external_symbols(ordered, resolver)
+    program = compile_expression(expression)
+    if resolver.context.is_object_mode and program.identifiers:
+        external_symbols = _collect_external_symbols(program.identifiers, resolver)
         if external_symbols:
             # Reconstruct + inline aliases so the relocation references real
             # externs (macro-arg bindings otherwise leak into the object file).
@@ -214,17 +276,137 @@ def eval_expression(expression: ExpressionAstNode, resolver: Resolver) -> int |
             expression_str = canonicalize_local_label_refs(expression_str, resolver)
             raise ExternalExpressionReference(expression_str, external_symbols)
 
-    values_stack: list[int | str] = []
-    for current in ordered:
+    value_for = resolver.current_scope.value_for
+    stack: list[int | str] = []
+    push = stack.append
+    pop = stack.pop
+    for opcode, arg in program.code:
+        if opcode == _PUSH:
+            push(arg)
+        elif opcode == _LOAD:
+            value = value_for(arg)
+            if not isinstance(value, int | str):
+                raise RuntimeError(f"Unable  to resolve {arg}")
+            push(value)
+        elif opcode == _BINARY:
+            v2 = pop()
+            v1 = pop()
+            op, int_op = arg
+            if int_op is not None and type(v1) is int and type(v2) is int:
+                push(int_op(v1, v2))
+            else:
+                push(_apply_binary(op, v1, v2))
+        elif opcode == _UNARY:
+            push(_apply_unary(arg, pop()))
+        elif opcode == _CAST_ACCESS:
+            inner, field_symbol = arg
+            base = _eval_cast_base(inner, resolver)
+            offset = value_for(field_symbol)
+            if not isinstance(offset, int):
+                raise RuntimeError(f"Struct field {field_symbol!r} did not resolve to an offset")
+            push(base + offset)
+        else:
+            push(_eval_cast_base(arg, resolver))
+    return pop()
+
+
+@dataclass
+class _Folded:
+    """A subtree being folded: its infix tokens, and its value once known."""
+
+    tokens: list[ExprNode]
+    value: int | None
+    # A bare term needs no parentheses when it becomes an operand.
+    atomic: bool
+    # Whether a symbol or an operation inside was replaced by its value.
+    changed: bool = False
+
+
+def _literal(value: int, anchor: Token) -> list[ExprNode]:
+    number = Term(anchor.located(TokenType.NUMBER, str(abs(value))))
+    if value < 0:
+        return [UnaryOp(anchor.located(TokenType.OPERATOR, "-")), number]
+    return [number]
+
+
+def _operand(folded: _Folded, anchor: Token) -> list[ExprNode]:
+    if folded.value is not None:
+        folded_tokens = _literal(folded.value, anchor)
+        atomic = len(folded_tokens) == 1
+    else:
+        folded_tokens, atomic = folded.tokens, folded.atomic
+    if atomic:
+        return folded_tokens
+    return [
+        Parenthesis(anchor.located(TokenType.LPAREN, "(")),
+        *folded_tokens,
+        Parenthesis(anchor.located(TokenType.RPAREN, ")")),
+    ]
+
+
+def _fold_term(term: ExprNode, constant_value: Callable[[str], int | None]) -> _Folded:
+    value: int | None = None
+    changed = False
+    if isinstance(term, Term):
+        if term.token.type == TokenType.NUMBER:
+            value = eval_number(term.token.value)
+        elif term.token.type == TokenType.IDENTIFIER:
+            value = constant_value(term.token.value)
+            changed = value is not None
+    return _Folded([term], value, atomic=True, changed=changed)
+
+
+def _fold(expression: ExpressionAstNode, constant_value: Callable[[str], int | None]) -> _Folded | None:
+    stack: list[_Folded] = []
+    for current in shunting_yard(expression.tokens):
         if isinstance(current, UnaryOp):
-            values_stack.append(_apply_unary(current.token.value, values_stack.pop()))
+            child = stack.pop()
+            value = None
+            if child.value is not None:
+                try:
+                    value = _apply_unary(current.token.value, child.value)
+                except RuntimeError:
+                    value = None
+            tokens = [current, *_operand(child, current.token)]
+            stack.append(_Folded(tokens, value, atomic=False, changed=child.changed or value is not None))
         elif isinstance(current, BinOp):
-            v2 = values_stack.pop()
-            v1 = values_stack.pop()
-            values_stack.append(_apply_binary(current.token.value, v1, v2))
+            right = stack.pop()
+            left = stack.pop()
+            int_op = _INT_BINOPS.get(current.token.value)
+            value = None
+            if int_op is not None and left.value is not None and right.value is not None:
+                value = int(int_op(left.value, right.value))
+            tokens = [*_operand(left, current.token), current, *_operand(right, current.token)]
+            changed = left.changed or right.changed or value is not None
+            stack.append(_Folded(tokens, value, atomic=False, changed=changed))
         else:
-            _push_term(current, resolver, values_stack)
-    return values_stack.pop()
+            stack.append(_fold_term(current, constant_value))
+    return stack[0] if len(stack) == 1 else None
+
+
+def constant_expression_value(expression: ExpressionAstNode, constant_value: Callable[[str], int | None]) -> int | None:
+    """Integer value of `expression` if it only involves literals and constants."""
+    root = _fold(expression, constant_value)
+    return root.value if root is not None else None
+
+
+def fold_expression(
+    expression: ExpressionAstNode, constant_value: Callable[[str], int | None]
+) -> ExpressionAstNode | None:
+    """Collapse the integer subtrees of `expression` whose operands are known.
+
+    `constant_value` returns the value of an identifier that can never
+    change, or None. Returns a new node with each folded subtree written as
+    a decimal literal (operands are fully parenthesised), or None when
+    nothing folds. `expression` itself is left untouched since parsed
+    nodes are shared between macro expansions and `.for` iterations.
+    """
+    root = _fold(expression, constant_value)
+    if root is None or not root.changed:
+        return None
+    anchor = expression.tokens[0].token
+    tokens = _literal(root.value, anchor) if root.value is not None else root.tokens
+    return ExpressionAstNode(tokens)
 
 
 _IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_.]*")
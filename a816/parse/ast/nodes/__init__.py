@@ -37,7 +37,10 @@ from a816.parse.ast.nodes.directives import (
     FileInfoAstNode,
     IncludeAstNode,
     IncludeBinaryAstNode,
+    IncludeCompressedAstNode,
+    IncludeGraphicsAstNode,
     IncludeIpsAstNode,
+    IncludeSampleAstNode,
     MapArgs,
     MapAstNode,
     RegisterSizeAstNode,
@@ -94,7 +97,10 @@ __all__ = [
     "ImportAstNode",
     "IncludeAstNode",
     "IncludeBinaryAstNode",
+    "IncludeCompressedAstNode",
+    "IncludeGraphicsAstNode",
     "IncludeIpsAstNode",
+    "IncludeSampleAstNode",
     "KeywordAstNode",
     "LabelAstNode",
     "LabelDeclAstNode",
@@ -9,14 +9,19 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from a816.parse.tokens import Token
 
+if TYPE_CHECKING:
+    from a816.parse.ast.expression import CompiledExpression
+
 
 class AstNode(ABC):
     kind: str
 
+    __slots__ = ("kind", "file_info", "docstring")
+
     def __init__(self, kind: str, file_info: Token, docstring: str | None = None) -> None:
         self.kind = kind
         self.file_info = file_info
@@ -35,6 +40,8 @@ class AstNode(ABC):
 class ExprNode:
     token: Token
 
+    __slots__ = ("token",)
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, ExprNode):
             return False
@@ -49,18 +56,26 @@ class ExprNode:
 class BinOp(ExprNode):
     """Represents a Binary expression operation"""
 
+    __slots__ = ()
+
 
 class UnaryOp(ExprNode):
     """Represents a Unary expression operation"""
 
+    __slots__ = ()
+
 
 class Term(ExprNode):
     """Represents a expression term"""
 
+    __slots__ = ()
+
 
 class Parenthesis(ExprNode):
     """Represents a Parenthesis expression"""
 
+    __slots__ = ()
+
 
 def _inner_canonical(inner: list[ExprNode]) -> str:
     return " ".join(node.to_canonical() for node in inner)
@@ -78,6 +93,8 @@ class CastAccessExprNode(ExprNode):
     of `(inner as TYPE)` without re-scanning source.
     """
 
+    __slots__ = ("inner", "type_name", "field_path", "close_token")
+
     def __init__(
         self,
         token: Token,
@@ -105,6 +122,8 @@ class CastValueExprNode(ExprNode):
     use it for the byte range of the full cast expression.
     """
 
+    __slots__ = ("inner", "type_name", "close_token")
+
     def __init__(
         self,
         token: Token,
@@ -124,9 +143,13 @@ class CastValueExprNode(ExprNode):
 class ExpressionAstNode(AstNode):
     tokens: list[ExprNode]
 
+    __slots__ = ("tokens", "compiled")
+
     def __init__(self, tokens: list[ExprNode]) -> None:
         super().__init__("expression", tokens[0].token)
         self.tokens = tokens
+        # Postfix program, filled in by `compile_expression` on first evaluation.
+        self.compiled: CompiledExpression | None = None
 
     def to_representation(self) -> tuple[Any, ...]:
         return (" ".join([expr_node.to_canonical() for expr_node in self.tokens]),)
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from a816.parse.ast.nodes.base import AstNode, ExpressionAstNode
 from a816.parse.tokens import Token
 
+if TYPE_CHECKING:
+    from a816.parse.codegen.macros import MacroTemplate
+
 
 class BlockAstNode(AstNode):
     body: list[AstNode]
 
+    __slots__ = ("body",)
+
     def __init__(self, body: list[AstNode], file_info: Token) -> None:
         super().__init__("block", file_info)
         self.body = body
@@ -25,6 +30,8 @@ class BlockAstNode(AstNode):
 class CompoundAstNode(AstNode):
     body: list[AstNode]
 
+    __slots__ = ("body",)
+
     def __init__(self, body: list[AstNode], file_info: Token):
         super().__init__("compound", file_info)
         self.body = body
@@ -128,6 +135,8 @@ class MacroAstNode(AstNode):
         self.name = name
         self.args = args
         self.block = block
+        # Lowered body, filled in by `macro_template` on first application.
+        self.template: MacroTemplate | None = None
 
     def to_representation(self) -> tuple[Any, ...]:
         return self.kind, self.name, ("args", self.args), self.block.to_representation()
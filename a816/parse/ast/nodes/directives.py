@@ -162,6 +162,8 @@ class MapAstNode(AstNode):
 class DataNode(AstNode):
     data: list[ExpressionAstNode]
 
+    __slots__ = ("data",)
+
     def __init__(
         self,
         kind: str,
@@ -283,17 +285,98 @@ class IncludeIpsAstNode(AstNode):
 
 
 class IncludeBinaryAstNode(AstNode):
+    """`.incbin "path"`, optionally limited to `length` bytes from `offset`."""
+
     file_path: str
 
-    def __init__(self, file_path: str, file_info: Token):
+    def __init__(
+        self,
+        file_path: str,
+        file_info: Token,
+        offset: ExpressionAstNode | None = None,
+        length: ExpressionAstNode | None = None,
+    ):
         super().__init__("incbin", file_info)
         self.file_path = file_path
+        self.offset = offset
+        self.length = length
+
+    @property
+    def symbol_base(self) -> str:
+        """Name of the auto-label; `<symbol_base>__size` holds the byte count."""
+        return self.file_path.replace("/", "_").replace(".", "_")
+
+    @property
+    def auto_symbols(self) -> list[str]:
+        """The auto-label followed by the symbols defined next to it."""
+        return [self.symbol_base, f"{self.symbol_base}__size"]
+
+    def _range(self) -> list[ExpressionAstNode]:
+        return [expression for expression in (self.offset, self.length) if expression is not None]
 
     def to_representation(self) -> tuple[Any, ...]:
-        return self.kind, self.file_path
+        return self.kind, self.file_path, *(expression.to_representation()[0] for expression in self._range())
+
+    def to_canonical(self) -> str:
+        return ", ".join([f'.incbin "{self.file_path}"', *(expression.to_canonical() for expression in self._range())])
+
+
+class IncludeCompressedAstNode(IncludeBinaryAstNode):
+    """`.incbin_lz "path", "codec"`: a file compressed at build time."""
+
+    def __init__(self, file_path: str, codec: str, file_info: Token) -> None:
+        super().__init__(file_path, file_info)
+        self.kind = "incbin_lz"
+        self.codec = codec
+
+    def to_representation(self) -> tuple[Any, ...]:
+        return self.kind, self.file_path, self.codec
+
+    def to_canonical(self) -> str:
+        return f'.incbin_lz "{self.file_path}", "{self.codec}"'
+
+
+class IncludeGraphicsAstNode(IncludeBinaryAstNode):
+    """`.incgfx "image.png", bpp[, "part"]`: tiles, tilemap or palette of a PNG."""
+
+    def __init__(self, file_path: str, bpp: ExpressionAstNode, part: str | None, file_info: Token) -> None:
+        super().__init__(file_path, file_info)
+        self.kind = "incgfx"
+        self.bpp = bpp
+        self.part = part
+
+    @property
+    def symbol_base(self) -> str:
+        base = super().symbol_base
+        return base if self.part in (None, "tiles") else f"{base}__{self.part}"
+
+    def to_representation(self) -> tuple[Any, ...]:
+        return self.kind, self.file_path, self.bpp.to_representation()[0], self.part
+
+    def to_canonical(self) -> str:
+        part = f', "{self.part}"' if self.part is not None else ""
+        return f'.incgfx "{self.file_path}", {self.bpp.to_canonical()}{part}'
+
+
+class IncludeSampleAstNode(IncludeBinaryAstNode):
+    """`.incbrr "sample.wav"[, loop_start]`: a WAV encoded as BRR."""
+
+    def __init__(self, file_path: str, loop: ExpressionAstNode | None, file_info: Token) -> None:
+        super().__init__(file_path, file_info)
+        self.kind = "incbrr"
+        self.loop = loop
+
+    @property
+    def auto_symbols(self) -> list[str]:
+        loop = [f"{self.symbol_base}__loop"] if self.loop is not None else []
+        return super().auto_symbols + loop
+
+    def to_representation(self) -> tuple[Any, ...]:
+        return self.kind, self.file_path, *([self.loop.to_representation()[0]] if self.loop is not None else [])
 
     def to_canonical(self) -> str:
-        return f'.incbin "{self.file_path}"'
+        loop = f", {self.loop.to_canonical()}" if self.loop is not None else ""
+        return f'.incbrr "{self.file_path}"{loop}'
 
 
 class DebugAstNode(AstNode):
@@ -11,6 +11,8 @@ from a816.parse.tokens import Token
 
 
 class OpcodeAstNode(AstNode):
+    __slots__ = ("addressing_mode", "opcode", "value_size", "operand", "operand2", "index")
+
     def __init__(
         self,
         *,
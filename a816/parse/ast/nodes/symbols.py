@@ -12,6 +12,8 @@ from a816.parse.tokens import Token
 class LabelAstNode(AstNode):
     label: str
 
+    __slots__ = ("label",)
+
     def __init__(self, label: str, file_info: Token) -> None:
         super().__init__("label", file_info)
         self.label = label
@@ -24,6 +26,8 @@ class LabelAstNode(AstNode):
 
 
 class SymbolAffectationAstNode(AstNode):
+    __slots__ = ("symbol", "value")
+
     def __init__(self, symbol: str, value: ExpressionAstNode, file_info: Token):
         super().__init__("symbol", file_info)
         self.symbol = symbol
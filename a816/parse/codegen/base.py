@@ -2,8 +2,8 @@
 
 Each submodule registers its `generate_*` functions into `generators` at
 import time; `_code_gen` dispatches per-node by `node.kind`. `code_gen`
-is the public entry: it threads a fresh `macro_definitions` dict and
-delegates to `_code_gen`.
+is the public entry: it threads a fresh `macro_definitions` dict,
+delegates to `_code_gen`, then folds constant expressions.
 """
 
 from __future__ import annotations
@@ -12,6 +12,7 @@ import logging
 from typing import Any, Protocol
 
 from a816.parse.ast.nodes import AstNode
+from a816.parse.codegen.folding import fold_constants
 from a816.parse.tokens import Token
 from a816.protocols import NodeProtocol
 from a816.symbols import Resolver
@@ -21,6 +22,9 @@ logger = logging.getLogger("a816.codegen")
 MacroDefinitions = dict[str, Any]
 GenNodes = list[NodeProtocol]
 
+# Node kinds whose generators emit nothing.
+SILENT_KINDS = frozenset({"comment", "docstring"})
+
 
 class CodeGenFuncProtocol(Protocol):
     def __call__(
@@ -54,4 +58,6 @@ def _code_gen(ast_nodes: list[AstNode], resolver: Resolver, macro_definitions: M
 
 def code_gen(ast_nodes: list[AstNode], resolver: Resolver) -> GenNodes:
     macro_definitions: MacroDefinitions = {}
-    return _code_gen(ast_nodes, resolver, macro_definitions)
+    code = _code_gen(ast_nodes, resolver, macro_definitions)
+    fold_constants(resolver)
+    return code
@@ -4,6 +4,8 @@ label / label_decl."""
 
 from __future__ import annotations
 
+from a816.gfx import PARTS
+from a816.parse.ast.expression import eval_expression
 from a816.parse.ast.nodes import (
     AsciiAstNode,
     CodePositionAstNode,
@@ -16,7 +18,10 @@ from a816.parse.ast.nodes import (
     FileInfoAstNode,
     IncludeAstNode,
     IncludeBinaryAstNode,
+    IncludeCompressedAstNode,
+    IncludeGraphicsAstNode,
     IncludeIpsAstNode,
+    IncludeSampleAstNode,
     LabelAstNode,
     LabelDeclAstNode,
     RegisterSizeAstNode,
@@ -28,23 +33,25 @@ from a816.parse.codegen.base import GenNodes, MacroDefinitions, _code_gen, gener
 from a816.parse.nodes import (
     AsciiNode,
     BinaryNode,
-    ByteNode,
     CodePositionNode,
+    CompressedBinaryNode,
+    DataArrayNode,
     DebugNode,
     ExpressionNode,
+    GraphicsNode,
     IncludeIpsNode,
     LabelDeclNode,
     LabelNode,
-    LongNode,
+    NodeError,
     RegisterSizeNode,
     RelocationAddressNode,
     ReserveNode,
+    SampleNode,
     TableNode,
     TextNode,
-    WordNode,
 )
 from a816.parse.tokens import Token
-from a816.protocols import NodeProtocol
+from a816.protocols import NodeProtocol, ValueNodeProtocol
 from a816.symbols import Resolver
 
 
@@ -92,21 +99,73 @@ def generate_incbin(
     macro_definitions: MacroDefinitions,
     file_info: Token,
 ) -> GenNodes:
-    return [BinaryNode(node.file_path, resolver)]
+    offset = 0 if node.offset is None else eval_expression(node.offset, resolver)
+    length = None if node.length is None else eval_expression(node.length, resolver)
+    if not isinstance(offset, int) or not (length is None or isinstance(length, int)):
+        raise NodeError(".incbin offset and length must be integers", file_info)
+    try:
+        return [BinaryNode(node.file_path, resolver, offset, length)]
+    except ValueError as e:
+        raise NodeError(f".incbin {e}", file_info) from e
+
+
+def generate_incbin_lz(
+    node: IncludeCompressedAstNode,
+    resolver: Resolver,
+    macro_definitions: MacroDefinitions,
+    file_info: Token,
+) -> GenNodes:
+    try:
+        return [CompressedBinaryNode(node.file_path, node.codec, resolver)]
+    except ValueError as e:
+        raise NodeError(f".incbin_lz {e}", file_info) from e
+
+
+def generate_incgfx(
+    node: IncludeGraphicsAstNode,
+    resolver: Resolver,
+    macro_definitions: MacroDefinitions,
+    file_info: Token,
+) -> GenNodes:
+    bpp = eval_expression(node.bpp, resolver)
+    if not isinstance(bpp, int):
+        raise NodeError(".incgfx bpp must be an integer", file_info)
+    part = node.part or "tiles"
+    if part not in PARTS:
+        raise NodeError(f'.incgfx part must be one of {", ".join(PARTS)}, not "{part}"', file_info)
+    try:
+        return [GraphicsNode(node.file_path, bpp, part, resolver, node.symbol_base)]
+    except ValueError as e:
+        raise NodeError(f".incgfx {node.file_path}: {e}", file_info) from e
+
+
+def generate_incbrr(
+    node: IncludeSampleAstNode,
+    resolver: Resolver,
+    macro_definitions: MacroDefinitions,
+    file_info: Token,
+) -> GenNodes:
+    loop = None if node.loop is None else eval_expression(node.loop, resolver)
+    if not (loop is None or isinstance(loop, int)):
+        raise NodeError(".incbrr loop start must be an integer", file_info)
+    try:
+        return [SampleNode(node.file_path, loop, resolver)]
+    except ValueError as e:
+        raise NodeError(f".incbrr {node.file_path}: {e}", file_info) from e
 
 
 def _generate_data(
     node: DataNode,
-    node_type: type[ByteNode] | type[WordNode] | type[LongNode],
+    size: int,
     resolver: Resolver,
     file_info: Token,
 ) -> GenNodes:
-    """Generate data nodes for .db, .dw, or .dl directives."""
-    code: GenNodes = []
+    """Generate one data array node for a .db, .dw, or .dl directive."""
+    values: list[ValueNodeProtocol] = []
     for expr in node.data:
         assert isinstance(expr, ExpressionAstNode)
-        code.append(node_type(ExpressionNode(expr, resolver, file_info)))
-    return code
+        values.append(ExpressionNode(expr, resolver, file_info))
+    return [DataArrayNode(size, values)]
 
 
 def generate_dl(
@@ -115,7 +174,7 @@ def generate_dl(
     macro_definitions: MacroDefinitions,
     file_info: Token,
 ) -> GenNodes:
-    return _generate_data(node, LongNode, resolver, file_info)
+    return _generate_data(node, 3, resolver, file_info)
 
 
 def generate_dw(
@@ -124,7 +183,7 @@ def generate_dw(
     macro_definitions: MacroDefinitions,
     file_info: Token,
 ) -> GenNodes:
-    return _generate_data(node, WordNode, resolver, file_info)
+    return _generate_data(node, 2, resolver, file_info)
 
 
 def generate_db(
@@ -133,7 +192,7 @@ def generate_db(
     macro_definitions: MacroDefinitions,
     file_info: Token,
 ) -> GenNodes:
-    return _generate_data(node, ByteNode, resolver, file_info)
+    return _generate_data(node, 1, resolver, file_info)
 
 
 def generate_register_size(
@@ -234,6 +293,9 @@ generators["include_ips"] = generate_include_ips
 generators["include"] = generate_include
 generators["docstring"] = generate_docstring
 generators["incbin"] = generate_incbin
+generators["incbin_lz"] = generate_incbin_lz
+generators["incgfx"] = generate_incgfx
+generators["incbrr"] = generate_incbrr
 generators["db"] = generate_db
 generators["dw"] = generate_dw
 generators["dl"] = generate_dl
@@ -13,6 +13,7 @@ from a816.parse.ast.expression import eval_expression
 from a816.parse.ast.nodes import (
     BlockAstNode,
     CodeLookupAstNode,
+    CompoundAstNode,
     ExpressionAstNode,
     ForAstNode,
     IfAstNode,
@@ -20,11 +21,36 @@ from a816.parse.ast.nodes import (
     MacroAstNode,
     Term,
 )
-from a816.parse.codegen.base import GenNodes, MacroDefinitions, _code_gen, generators
-from a816.parse.nodes import NodeError, PopScopeNode, ScopeNode, SymbolNode
+from a816.parse.codegen.base import SILENT_KINDS, GenNodes, MacroDefinitions, _code_gen, generators
+from a816.parse.codegen.macros import macro_template
+from a816.parse.nodes import DataArrayNode, DataLoopNode, NodeError, PopScopeNode, ScopeNode, SymbolNode
 from a816.parse.tokens import Token, TokenType
 from a816.symbols import Resolver
 
+_TABLE_KINDS = frozenset({"db", "dw", "dl", "pointer"})
+
+
+def _is_data_table(body: CompoundAstNode) -> bool:
+    """True when a `.for` body can stay rolled in a `DataLoopNode`."""
+    kinds = {child.kind for child in body.body}
+    return bool(kinds & _TABLE_KINDS) and kinds <= _TABLE_KINDS | SILENT_KINDS
+
+
+def _generate_data_loop(
+    node: ForAstNode,
+    values: range,
+    resolver: Resolver,
+    macro_definitions: MacroDefinitions,
+) -> GenNodes:
+    """One scope and one iteration's data nodes for the whole loop."""
+    resolver.append_internal_scope()
+    resolver.use_next_scope()
+    scope = ScopeNode(resolver)
+    body = cast(list[DataArrayNode], _code_gen(node.body.body, resolver, macro_definitions))
+    code: GenNodes = [scope, DataLoopNode(node.symbol, values, body, resolver), PopScopeNode(resolver)]
+    resolver.restore_scope()
+    return code
+
 
 def generate_for(
     node: ForAstNode,
@@ -35,6 +61,8 @@ def generate_for(
     code: GenNodes = []
     from_val = cast(int, eval_expression(node.min_value, resolver))
     to_val = cast(int, eval_expression(node.max_value, resolver))
+    if from_val < to_val and _is_data_table(node.body):
+        return _generate_data_loop(node, range(from_val, to_val), resolver, macro_definitions)
     for k in range(from_val, to_val):
         resolver.append_internal_scope()
         resolver.use_next_scope()
@@ -111,7 +139,6 @@ def generate_macro_application(
 ) -> GenNodes:
     code: GenNodes = []
     macro_def: MacroAstNode = macro_definitions[node.name]
-    macro_code = macro_def.block
     macro_args = macro_def.args
     macro_args_values = node.args
 
@@ -155,7 +182,7 @@ def generate_macro_application(
             # generated inside the macro body inline the alias on the way out.
             expr_str = e.symbol_name if isinstance(e, ExternalSymbolReference) else e.expression_str
             resolver.current_scope.add_external_alias(arg, expr_str)
-    code += _code_gen(macro_code.body, resolver, macro_definitions)
+    code += macro_template(macro_def).instantiate(resolver, macro_definitions)
     code.append(PopScopeNode(resolver))
     resolver.restore_scope()
     return code
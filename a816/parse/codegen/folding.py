@@ -0,0 +1,79 @@
+"""Constant folding of generated expressions.
+
+`code_gen` calls `fold_constants` once every node exists. Each expression
+queued by `Resolver.note_folding_site` gets its integer subtrees over
+literals and immutable names replaced by their value, so resolve passes
+evaluate less and object-mode relocations carry shorter expressions.
+
+A name is immutable when every site binding it is accounted for by
+`Resolver.register_constant` definitions agreeing on one value: a
+constant `=` whose operands are themselves immutable, a `:=` assignment,
+a typed bind or a struct layout symbol. Labels, externs, macro arguments,
+`.for` variables and any second definition add binding sites and keep the
+name symbolic. The name must also resolve to that value from the folding
+site's scope.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+
+from a816.exceptions import ExternalSymbolReference, SymbolNotDefined
+from a816.parse.ast.expression import constant_expression_value, fold_expression
+from a816.symbols import Resolver, Scope
+
+
+class _ConstantTable:
+    def __init__(self, resolver: Resolver) -> None:
+        self.resolver = resolver
+        self._values: dict[str, int | None] = {}
+        self._pending: set[str] = set()
+
+    def value(self, name: str) -> int | None:
+        """Value `name` holds on every resolve pass, or None."""
+        if name in self._values:
+            return self._values[name]
+        if name in self._pending:
+            return None  # self-referencing definition
+        self._pending.add(name)
+        value = self._compute(name)
+        self._pending.discard(name)
+        self._values[name] = value
+        return value
+
+    def _compute(self, name: str) -> int | None:
+        constant = self.resolver.folding_constants.get(name)
+        if constant is None or constant.value is None:
+            return None
+        counts = self.resolver.binding_counts
+        if counts.get(name, 0) != constant.sites:
+            return None
+        # `Foo.bar` may also be published by a `.scope Foo` or bound via `Foo`.
+        head, dot, _ = name.partition(".")
+        if dot and counts.get(head, 0) > 1:
+            return None
+        for expression, scope in constant.sources:
+            if constant_expression_value(expression, partial(self.visible, scope=scope)) != constant.value:
+                return None
+        return constant.value
+
+    def visible(self, name: str, scope: Scope) -> int | None:
+        """Value of `name` as seen from `scope`, if it is immutable."""
+        value = self.value(name)
+        if value is None:
+            return None
+        try:
+            seen = scope.value_for(name)
+        except (SymbolNotDefined, ExternalSymbolReference):
+            return None
+        return value if type(seen) is int and seen == value else None
+
+
+def fold_constants(resolver: Resolver) -> None:
+    """Fold every queued expression, then drop the queue."""
+    constants = _ConstantTable(resolver)
+    for node, scope in resolver.folding_sites:
+        folded = fold_expression(node.expression, partial(constants.visible, scope=scope))
+        if folded is not None:
+            node.expression = folded
+    resolver.folding_sites.clear()
@@ -0,0 +1,137 @@
+"""Macro templates: a macro body lowered once, instantiated per application.
+
+The first application of a macro compiles its body into a `MacroTemplate`,
+cached on the `MacroAstNode`. Opcodes and data directives are lowered up
+front: dispatch, operand checks and folding of literal subtrees happen
+once. Applying the macro then only builds nodes in the fresh argument
+scope. Every other body node can read state that changes between
+applications (`.if` conditions, `.for` bounds, nested macros, typed
+binds), so it keeps going through its generator each time.
+
+An operand naming nothing but macro arguments stays off the folding
+queue: each application binds the arguments again, so they never count
+as constants (see `folding`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from a816.parse.ast.expression import expression_names, fold_expression
+from a816.parse.ast.nodes import AstNode, DataNode, ExpressionAstNode, MacroAstNode, OpcodeAstNode
+from a816.parse.codegen.base import SILENT_KINDS, GenNodes, MacroDefinitions, _code_gen
+from a816.parse.codegen.opcodes import OpcodeFields, opcode_fields, typed_operand_instance
+from a816.parse.nodes import DataArrayNode, ExpressionNode, OpcodeNode
+from a816.parse.tokens import Token
+from a816.symbols import Resolver
+
+_DATA_SIZES = {"db": 1, "dw": 2, "dl": 3, "pointer": 3}
+
+
+def _literal_folded(expression: ExpressionAstNode) -> ExpressionAstNode:
+    return fold_expression(expression, lambda name: None) or expression
+
+
+@dataclass(frozen=True)
+class _Operand:
+    """A pre-folded body operand, and whether an application may fold it further."""
+
+    expression: ExpressionAstNode
+    foldable: bool
+
+    @classmethod
+    def lower(cls, expression: ExpressionAstNode, args: frozenset[str]) -> _Operand:
+        folded = _literal_folded(expression)
+        return cls(folded, not expression_names(folded) <= args)
+
+    def instantiate(self, resolver: Resolver, file_info: Token) -> ExpressionNode:
+        return ExpressionNode(self.expression, resolver, file_info, foldable=self.foldable)
+
+
+@dataclass(frozen=True)
+class _OpcodeStep:
+    fields: OpcodeFields
+    operand: _Operand | None
+    operand2: _Operand | None
+    file_info: Token
+
+    def instantiate(self, resolver: Resolver, macro_definitions: MacroDefinitions) -> GenNodes:
+        fields, file_info = self.fields, self.file_info
+        return [
+            OpcodeNode(
+                fields.opcode,
+                addressing_mode=fields.addressing_mode,
+                size=fields.size,
+                index=fields.index,
+                value_node=None if self.operand is None else self.operand.instantiate(resolver, file_info),
+                value_node2=None if self.operand2 is None else self.operand2.instantiate(resolver, file_info),
+                file_info=file_info,
+                resolver=resolver,
+            )
+        ]
+
+
+@dataclass(frozen=True)
+class _DataStep:
+    size: int
+    values: tuple[_Operand, ...]
+    file_info: Token
+
+    def instantiate(self, resolver: Resolver, macro_definitions: MacroDefinitions) -> GenNodes:
+        return [DataArrayNode(self.size, [value.instantiate(resolver, self.file_info) for value in self.values])]
+
+
+@dataclass(frozen=True)
+class _GeneratorStep:
+    node: AstNode
+
+    def instantiate(self, resolver: Resolver, macro_definitions: MacroDefinitions) -> GenNodes:
+        return _code_gen([self.node], resolver, macro_definitions)
+
+
+_Step = _OpcodeStep | _DataStep | _GeneratorStep
+
+
+def _lower_operand(expression: ExpressionAstNode | None, args: frozenset[str]) -> _Operand | None:
+    return None if expression is None else _Operand.lower(expression, args)
+
+
+def _lower(node: AstNode, args: frozenset[str]) -> _Step | None:
+    """The template step for one body node; None when it generates nothing."""
+    if node.kind in SILENT_KINDS:
+        return None
+    # An unsized `p.field` operand takes its width from the typed binds
+    # in effect at each application.
+    if isinstance(node, OpcodeAstNode) and (node.value_size or typed_operand_instance(node.operand) is None):
+        fields = opcode_fields(node, node.value_size, node.file_info)
+        return _OpcodeStep(
+            fields, _lower_operand(fields.operand, args), _lower_operand(fields.operand2, args), node.file_info
+        )
+    if isinstance(node, DataNode) and node.kind in _DATA_SIZES:
+        values = tuple(_Operand.lower(value, args) for value in node.data)
+        return _DataStep(_DATA_SIZES[node.kind], values, node.file_info)
+    return _GeneratorStep(node)
+
+
+class MacroTemplate:
+    """A macro body lowered to steps that build its nodes for one application."""
+
+    def __init__(self, macro: MacroAstNode) -> None:
+        args = frozenset(macro.args)
+        steps = (_lower(node, args) for node in macro.block.body)
+        self.steps: tuple[_Step, ...] = tuple(step for step in steps if step is not None)
+
+    def instantiate(self, resolver: Resolver, macro_definitions: MacroDefinitions) -> GenNodes:
+        """Nodes of one application, generated in the current (argument) scope."""
+        code: GenNodes = []
+        for step in self.steps:
+            code += step.instantiate(resolver, macro_definitions)
+        return code
+
+
+def macro_template(macro: MacroAstNode) -> MacroTemplate:
+    """The template of `macro`, lowering its body on first use."""
+    template = macro.template
+    if template is None:
+        template = macro.template = MacroTemplate(macro)
+    return template
@@ -239,8 +239,7 @@ def _runtime_extern_names(node: object) -> list[str]:
         # underscores in the sanitised path (e.g. `___assets_...` from
         # `../assets/...`) are encoding artefacts, not privacy markers.
         # Always expose.
-        base = node.file_path.replace("/", "_").replace(".", "_")
-        return [base, f"{base}__size"]
+        return node.auto_symbols
     return []
 
 
@@ -394,9 +393,8 @@ def _emit_symbols_for_node(node: AstNode, prefix: str, symbols: list[str]) -> No
         _record_public_symbol(symbols, prefix, node.symbol)
         return
     if isinstance(node, IncludeBinaryAstNode):
-        base = node.file_path.replace("/", "_").replace(".", "_")
-        _record_public_symbol(symbols, prefix, base)
-        _record_public_symbol(symbols, prefix, f"{base}__size")
+        for symbol in node.auto_symbols:
+            _record_public_symbol(symbols, prefix, symbol)
 
 
 def _visit_for_public_symbols(nodes: list[AstNode], prefix: str, symbols: list[str]) -> None:
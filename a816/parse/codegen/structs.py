@@ -165,6 +165,14 @@ def generate_struct(
     # exports=True promotes Name.field and Name.__size to the parent scope.
     code.append(PopScopeNode(resolver, exports=True))
     resolver.restore_scope(exports=True)
+    # The published `Name.field` offsets never change; no add_symbol
+    # call binds them, hence zero sites.
+    for field_path, offset, _width in entries:
+        resolver.register_constant(f"{node.name}.{field_path}", offset, sites=0)
+    for field_name, (mask, shift) in bit_meta.items():
+        resolver.register_constant(f"{node.name}.{field_name}.mask", mask, sites=0)
+        resolver.register_constant(f"{node.name}.{field_name}.shift", shift, sites=0)
+    resolver.register_constant(f"{node.name}.__size", total_size, sites=0)
     return code
 
 
@@ -54,6 +54,8 @@ def _try_eager_constant_bind(node: SymbolAffectationAstNode, resolver: Resolver)
     if not isinstance(value, int):
         return False
     resolver.current_scope.add_symbol(node.symbol, value)
+    # Two binding sites: this eager bind and the SymbolNode re-binding it.
+    resolver.register_constant(node.symbol, value, sites=2, expression=node.value)
     return True
 
 
@@ -119,8 +121,10 @@ def _try_typed_bind(node: AssignAstNode, resolver: Resolver, file_info: Token) -
             file_info,
         )
     resolver.current_scope.add_symbol(node.symbol, base)
+    resolver.register_constant(node.symbol, base, sites=1)
     for field_path, offset, _width in resolver.struct_layouts[type_name]:
         resolver.current_scope.add_symbol(f"{node.symbol}.{field_path}", base + offset)
+        resolver.register_constant(f"{node.symbol}.{field_path}", base + offset, sites=1)
     resolver.typed_instances[node.symbol] = type_name
     resolver.typed_instance_addr_width[node.symbol] = _address_width_for(base)
     return True
@@ -152,6 +156,8 @@ def generate_assign(
     try:
         value = eval_expression(node.value, resolver)
         resolver.current_scope.add_symbol(node.symbol, value)
+        if isinstance(value, int):
+            resolver.register_constant(node.symbol, value, sites=1)
     except (ExternalExpressionReference, ExternalSymbolReference) as e:
         if not resolver.context.is_object_mode:
             raise NodeError(
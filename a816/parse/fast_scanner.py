@@ -0,0 +1,312 @@
+"""Regex-driven fast path for `Scanner(lex_initial)`.
+
+`Scanner` walks the input one character at a time through `next` /
+`peek` / `accept` and the state functions of `scanner_states`. This
+module lexes the same grammar with a handful of compiled master
+regexes: one match per token, dispatched on `Match.lastgroup`. Tokens
+only record their start offset; line / column are derived from the
+file's line index when a `position` is first asked for.
+
+The fast path only covers well-formed input. Anything that would make
+the reference scanner raise (unknown directive, bad index, unterminated
+string, stray character) or depend on its `\\0` end-of-input sentinel
+aborts it, and the whole input is re-scanned by `Scanner` so that error
+recovery and diagnostics stay byte-for-byte identical.
+"""
+
+import re
+from collections.abc import Iterator
+
+from a816.cpu.cpu_65c816 import snes_opcode_table
+from a816.parse.errors import ScannerException
+from a816.parse.scanner import Scanner
+from a816.parse.scanner_states import DIRECTIVE_NAMES, lex_initial, opcodes_without_operand
+from a816.parse.tokens import File, Token, TokenType
+
+_IDENTIFIER = r"[A-Za-z_][A-Za-z0-9_]*"
+# `lex_number`: a leading `0` only continues with a b / o / x prefix.
+_NUMBER = r"0(?:b[01]*|o[0-8]*|x[0-9A-Fa-f]*)?|[1-9][0-9]*"
+_DOCSTRING = r'"""(?:\\[\s\S]|[^\\])*?"""' + "|" + r"'''(?:\\[\s\S]|[^\\])*?'''"
+# Possessive: a backslash-escaped quote never closes the string, even on failure.
+_STRING = r"""(?!'''|\"\"\")(?:'(?:\\'|[^'\n])*+'|"(?:\\"|[^"\n])*+")"""
+# Unterminated strings / docstrings: let the reference scanner report them.
+_BAD_STRING = r"""'''|\"\"\"|['"]"""
+
+# Alternatives follow the handler order of `lex_initial`.
+_INITIAL = re.compile(
+    "|".join(
+        (
+            r"(?P<comment>;[^\n]*)",
+            rf"(?P<number>{_NUMBER})",
+            r"(?P<operator>==|!=|>>|<<|>=|<=|[+\-&<>])",
+            r"(?P<assign>:=)",
+            r"(?P<at_eq>@=)",
+            rf"(?P<word>{_IDENTIFIER})",
+            r"(?P<directive>\.[a-z_0-9]*)",
+            r"(?P<star_eq>\*=)",
+            r"(?P<star>\*)",
+            rf"(?P<docstring>{_DOCSTRING})",
+            rf"(?P<string>{_STRING})",
+            rf"(?P<bad>{_BAD_STRING})",
+            r"(?P<block_comment>/\*[\s\S]*?\*/)",
+            r"(?P<punctuation>\{\{?|\}\}?|[,()\[\]=])",
+        )
+    )
+)
+
+# Alternatives follow the branch order of `lex_expression`.
+_EXPRESSION = re.compile(
+    "|".join(
+        (
+            rf"(?P<number>{_NUMBER})",
+            rf"(?P<word>{_IDENTIFIER})",
+            rf"(?P<docstring>{_DOCSTRING})",
+            rf"(?P<string>{_STRING})",
+            rf"(?P<bad>{_BAD_STRING})",
+            r"(?P<operator>[+\-*/&|~]|<<|>>|!=|==|>=|<=|>|<)",
+            r"(?P<lparen>\()",
+            r"(?P<rparen>\))",
+        )
+    )
+)
+
+_WHITESPACE = re.compile(r"[ \t\n]*")
+_SPACES = re.compile(r" *")
+_IDENTIFIER_RE = re.compile(_IDENTIFIER)
+_DOT_CHAIN = re.compile(rf"(?:\.{_IDENTIFIER})*")
+# What may follow an operand-less opcode for it to be `OPCODE_NAKED`.
+_NAKED_TAIL = re.compile(r"[ \t]*(?:;[^\n]*)?(?=\n|\Z)")
+
+_GROUP_TYPES: dict[str, TokenType] = {
+    "comment": TokenType.COMMENT,
+    "block_comment": TokenType.COMMENT,
+    "number": TokenType.NUMBER,
+    "operator": TokenType.OPERATOR,
+    "star": TokenType.OPERATOR,
+    "assign": TokenType.ASSIGN,
+    "at_eq": TokenType.AT_EQ,
+    "star_eq": TokenType.STAR_EQ,
+    "docstring": TokenType.DOCSTRING,
+    "string": TokenType.QUOTED_STRING,
+    "lparen": TokenType.LPAREN,
+    "rparen": TokenType.RPAREN,
+}
+
+_PUNCTUATION: dict[str, TokenType] = {
+    "{": TokenType.LBRACE,
+    "{{": TokenType.DOUBLE_LBRACE,
+    "}": TokenType.RBRACE,
+    "}}": TokenType.DOUBLE_RBRACE,
+    ",": TokenType.COMMA,
+    "(": TokenType.LPAREN,
+    ")": TokenType.RPAREN,
+    "[": TokenType.LBRAKET,
+    "]": TokenType.RBRAKET,
+    "=": TokenType.EQUAL,
+}
+
+_OPERAND_OPENERS: dict[str, TokenType] = {"#": TokenType.SHARP, "(": TokenType.LPAREN, "[": TokenType.LBRAKET}
+_OPERAND_CLOSERS: dict[str, TokenType] = {")": TokenType.RPAREN, "]": TokenType.RBRAKET}
+_OPCODE_DELIMITERS = frozenset(" \n\t.")
+_OPCODE_SIZES = frozenset("bBwWlL")
+_INDEX_REGISTERS = frozenset("xXyYsS")
+_NAKED_OPCODES = frozenset(opcodes_without_operand)
+
+
+def _skip(pattern: re.Pattern[str], text: str, pos: int) -> int:
+    """End of `pattern` (which always matches, possibly empty) at `pos`."""
+    match = pattern.match(text, pos)
+    assert match is not None
+    return match.end()
+
+
+# Tokens handed out per step by `iter_scan`.
+STREAM_BATCH = 256
+
+
+class _Fallback(Exception):
+    """The fast path cannot lex this input the way `Scanner` would."""
+
+
+class FastScanner:
+    """Drop-in replacement for `Scanner(lex_initial)`: same tokens, positions and errors."""
+
+    file: File
+    input: str
+
+    def __init__(self) -> None:
+        self.tokens: list[Token] = []
+        self.errors: list[ScannerException] = []
+        self._batch: list[Token] = []
+        self._values: dict[str, str] = {}
+
+    def scan(self, filename: str, input_: str) -> list[Token]:
+        self.tokens = list(self.iter_scan(filename, input_))
+        return self.tokens
+
+    def iter_scan(self, filename: str, input_: str) -> Iterator[Token]:
+        """Yield tokens as they are lexed, `STREAM_BATCH` at a time.
+
+        `errors` is only complete once the iterator is exhausted. When the
+        fast path gives up midway, `Scanner` re-lexes the input and only the
+        tokens not yielded yet are passed on (both agree up to that point).
+        """
+        self.errors = []
+        yielded = 0
+        if "\0" not in input_:
+            try:
+                for batch in self._batches(filename, input_):
+                    yield from batch
+                    yielded += len(batch)
+                return
+            except _Fallback:
+                pass
+        scanner = Scanner(lex_initial)
+        tokens = scanner.scan(filename, input_)
+        self.errors = scanner.errors
+        self.file = scanner.file
+        yield from tokens[yielded:]
+
+    def _batches(self, filename: str, input_: str) -> Iterator[list[Token]]:
+        self.file = File(filename, source=input_)
+        self.input = input_
+        self._batch = []
+        self._values = {}
+        pos = 0
+        length = len(input_)
+        while pos < length:
+            end = _skip(_WHITESPACE, input_, pos) if input_[pos] in " \t\n" else pos
+            if end < length:
+                end = self._initial(end)
+            pos = end
+            if len(self._batch) >= STREAM_BATCH:
+                yield self._batch
+                self._batch = []
+        self._emit(TokenType.EOF, length, length)
+        yield self._batch
+
+    def _emit(self, token_type: TokenType, start: int, end: int) -> None:
+        value = self.input[start:end]
+        # Share repeated lexemes (`,`, `0x00`, mnemonics...) across the file's tokens.
+        value = self._values.setdefault(value, value)
+        self._batch.append(Token(token_type, value, None, self.file, start))
+
+    def _spaces(self, pos: int) -> int:
+        if not self.input.startswith(" ", pos):
+            return pos
+        return _skip(_SPACES, self.input, pos)
+
+    def _initial(self, pos: int) -> int:
+        match = _INITIAL.match(self.input, pos)
+        if match is None:
+            raise _Fallback
+        kind = match.lastgroup
+        end = match.end()
+        if kind == "word":
+            return self._word(pos, end, allow_opcode=True)
+        if kind == "directive":
+            if self.input[pos + 1 : end] not in DIRECTIVE_NAMES:
+                raise _Fallback
+            self._emit(TokenType.KEYWORD, pos + 1, end)
+        elif kind == "punctuation":
+            self._emit(_PUNCTUATION[match.group()], pos, end)
+        elif kind == "bad" or kind is None:
+            raise _Fallback
+        else:
+            self._emit(_GROUP_TYPES[kind], pos, end)
+        return end
+
+    def _word(self, pos: int, end: int, allow_opcode: bool) -> int:
+        text = self.input
+        if (
+            allow_opcode
+            and end - pos == 3
+            and (end == len(text) or text[end] in _OPCODE_DELIMITERS)
+            and (mnemonic := text[pos:end].lower()) in snes_opcode_table
+        ):
+            return self._opcode(pos, end, mnemonic)
+        if text.startswith(":", end) and not text.startswith("=", end + 1):
+            self._emit(TokenType.LABEL, pos, end)
+            return end + 1
+        end = _skip(_DOT_CHAIN, text, end)
+        self._emit(TokenType.IDENTIFIER, pos, end)
+        return end
+
+    def _opcode(self, pos: int, end: int, mnemonic: str) -> int:
+        text = self.input
+        sized = text.startswith(".", end)
+        if mnemonic in _NAKED_OPCODES and not sized and _NAKED_TAIL.match(text, end):
+            self._emit(TokenType.OPCODE_NAKED, pos, end)
+            return end
+        self._emit(TokenType.OPCODE, pos, end)
+        if sized:
+            if end + 1 >= len(text) or text[end + 1] not in _OPCODE_SIZES:
+                raise _Fallback
+            self._emit(TokenType.OPCODE_SIZE, end + 1, end + 2)
+            # `lex_opcode_size` lexes an operand, then `lex_opcode` lexes another.
+            end = self._operand(self._spaces(end + 2))
+        end = self._spaces(end)
+        if mnemonic in ("mvn", "mvp"):
+            return self._block_move_operands(end)
+        return self._operand(end)
+
+    def _operand(self, pos: int) -> int:
+        text = self.input
+        opener = _OPERAND_OPENERS.get(text[pos : pos + 1])
+        if opener is not None:
+            self._emit(opener, pos, pos + 1)
+            pos += 1
+        pos = self._spaces(self._expression(self._spaces(pos)))
+        if text.startswith(",", pos):
+            pos = self._index(pos + 1)
+        closer = _OPERAND_CLOSERS.get(text[pos : pos + 1])
+        if closer is not None:
+            self._emit(closer, pos, pos + 1)
+            pos = self._field_chain(pos + 1)
+        pos = self._spaces(pos)
+        if text.startswith(",", pos):
+            pos = self._index(pos + 1)
+        return pos
+
+    def _index(self, pos: int) -> int:
+        pos = self._spaces(pos)
+        if pos >= len(self.input) or self.input[pos] not in _INDEX_REGISTERS:
+            raise _Fallback
+        self._emit(TokenType.ADDRESSING_MODE_INDEX, pos, pos + 1)
+        return pos + 1
+
+    def _block_move_operands(self, pos: int) -> int:
+        pos = self._spaces(self._expression(self._spaces(pos)))
+        if self.input.startswith(",", pos):
+            self._emit(TokenType.COMMA, pos, pos + 1)
+            pos += 1
+        return self._expression(self._spaces(pos))
+
+    def _field_chain(self, pos: int) -> int:
+        """`.field` accesses after `)` / `]`: a DOT then an IDENTIFIER token each."""
+        text = self.input
+        while text.startswith(".", pos) and (match := _IDENTIFIER_RE.match(text, pos + 1)) is not None:
+            self._emit(TokenType.DOT, pos, pos + 1)
+            self._emit(TokenType.IDENTIFIER, pos + 1, match.end())
+            pos = match.end()
+        return pos
+
+    def _expression(self, pos: int) -> int:
+        text = self.input
+        while pos < len(text):
+            pos = self._spaces(pos)
+            match = _EXPRESSION.match(text, pos)
+            if match is None:
+                break
+            kind = match.lastgroup
+            end = match.end()
+            if kind == "word":
+                pos = self._word(pos, end, allow_opcode=False)
+                continue
+            if kind == "bad" or kind is None:
+                raise _Fallback
+            self._emit(_GROUP_TYPES[kind], pos, end)
+            pos = end
+            if kind == "rparen":
+                pos = self._field_chain(pos)
+        return pos
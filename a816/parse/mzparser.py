@@ -1,4 +1,7 @@
+import gc
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from time import gmtime, strftime
@@ -7,16 +10,35 @@ from typing import Any
 from a816.parse.ast.nodes import AstNode
 from a816.parse.codegen import code_gen
 from a816.parse.errors import ParseError, ParserSyntaxError, ScannerException
+from a816.parse.fast_scanner import FastScanner
+from a816.parse.parse_cache import active_parse_cache
 from a816.parse.parser import Parser
 from a816.parse.parser_states import parse_initial
-from a816.parse.scanner import Scanner
-from a816.parse.scanner_states import lex_initial
 from a816.protocols import NodeProtocol
 from a816.symbols import Resolver
 
 logger = logging.getLogger("a816.parser")
 
 
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend the cyclic GC while a source is lexed and parsed, or lowered.
+
+    Tokens and AST nodes are allocated by the hundred thousand and hold no
+    reference cycles, so generational passes over them are pure overhead
+    (and grow once tokens and nodes are allocated interleaved). The same
+    goes for the executable nodes codegen builds, a macro application's
+    worth at a time.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 @dataclass
 class ParserResult:
     nodes: list[AstNode]
@@ -48,7 +70,8 @@ class A816Parser:
         include_paths = self.resolver.context.include_paths
         ast = self.parse_as_ast(program, filename, include_paths=include_paths, verbose_errors=True)
         self.resolver.current_scope.add_symbol("BUILD_DATE", strftime("%Y-%m-%d %H:%M:%S", gmtime()))
-        return ast.error, code_gen(ast.nodes, self.resolver)
+        with _gc_paused():
+            return ast.error, code_gen(ast.nodes, self.resolver)
 
     @staticmethod
     def parse_as_ast(
@@ -56,16 +79,31 @@ class A816Parser:
         filename: str = "memory.s",
         include_paths: list[Path] | None = None,
         verbose_errors: bool = False,
+        store: bool = True,
     ) -> ParserResult:
-        scanner = Scanner(lex_initial)
+        """Parse `program` into AST nodes, through the parse cache when enabled.
+
+        `store=False` still reads the cache but never writes it; editor
+        buffers pass it so unsaved text is not pickled on every keystroke.
+        """
+        cache = active_parse_cache()
+        if cache is not None:
+            cached = cache.load(program, filename, include_paths)
+            if cached is not None:
+                return ParserResult(nodes=cached)
+
+        scanner = FastScanner()
         ast: list[AstNode] = []
         parse_error: ParseError | None = None
         parser: Parser | None = None
 
+        # The parser pulls tokens from the scanner as it goes, so only a
+        # window of the token stream is ever alive.
+        tokens = scanner.iter_scan(filename, program)
         try:
-            tokens = scanner.scan(filename, program)
             parser = Parser(tokens, parse_initial, include_paths=include_paths)
-            ast = parser.parse()
+            with _gc_paused():
+                ast = parser.parse()
         except ScannerException as e:
             # Defensive: scanner now recovers per line, but a state hard
             # crash could still surface as a raised exception.
@@ -75,6 +113,10 @@ class A816Parser:
                 logger.debug("parser raised %s", e)
             parse_error = _parser_error_to_parse_error(e, filename)
 
+        # A parse that gave up early leaves the stream unread; drain it so
+        # `scanner.errors` covers the whole file.
+        for _ in tokens:
+            pass
         scanner_errors = [_scanner_error_to_parse_error(err) for err in scanner.errors]
         parser_errors = _collected_parse_errors(parser, filename) or []
         all_errors = scanner_errors + parser_errors
@@ -83,6 +125,8 @@ class A816Parser:
         if parse_error is None and all_errors:
             parse_error = all_errors[0]
         parse_errors = all_errors or None
+        if store and cache is not None and parse_error is None:
+            cache.store(program, filename, include_paths, ast)
         return ParserResult(nodes=ast, parse_error=parse_error, parse_errors=parse_errors)
 
 
@@ -13,10 +13,15 @@ from a816.parse.nodes.alloc import AllocNode, RelocateNode
 from a816.parse.nodes.data import (
     BinaryNode,
     ByteNode,
+    CompressedBinaryNode,
+    DataArrayNode,
+    DataLoopNode,
     DebugNode,
+    GraphicsNode,
     LongNode,
     RegisterSizeNode,
     ReserveNode,
+    SampleNode,
     WordNode,
     _SizedValueNode,
 )
@@ -48,9 +53,13 @@ __all__ = [
     "BinaryNode",
     "ByteNode",
     "CodePositionNode",
+    "CompressedBinaryNode",
+    "DataArrayNode",
+    "DataLoopNode",
     "DebugNode",
     "ExpressionNode",
     "ExternNode",
+    "GraphicsNode",
     "IncludeIpsNode",
     "LabelDeclNode",
     "LabelNode",
@@ -64,6 +73,7 @@ __all__ = [
     "ReserveNode",
     "RelocateNode",
     "RelocationAddressNode",
+    "SampleNode",
     "ScopeNode",
     "SymbolNode",
     "TableNode",
@@ -34,6 +34,7 @@ class AllocNode(NodeProtocol):
         self.pool_name = pool_name
         self.body = body
         self.resolver = resolver
+        resolver.note_binding(name)
         self.file_info = file_info
         # Fixed address for a `.reserve NAME SIZE at ADDR in POOL` request;
         # None lets the pool allocator pick. Carried into `pool.request` and
@@ -4,14 +4,18 @@ from __future__ import annotations
 
 import os
 import re
+import struct
+from typing import cast
 
 from a816.cpu.mapping import Address
-from a816.parse.ast.expression import eval_expression_str
+from a816.parse.ast.expression import constant_expression_value, eval_expression_str, eval_number
+from a816.parse.ast.nodes import Term
 from a816.parse.nodes.errors import NodeError
 from a816.parse.nodes.expr import ExpressionNode
-from a816.parse.tokens import Token
+from a816.parse.tokens import Token, TokenType
 from a816.protocols import NodeProtocol, ValueNodeProtocol
 from a816.symbols import Resolver
+from a816.util import MappedBytes
 
 
 class RegisterSizeNode(NodeProtocol):
@@ -73,27 +77,115 @@ class ReserveNode(NodeProtocol):
 
 
 class BinaryNode(NodeProtocol):
-    def __init__(self, path: str, resolver: Resolver) -> None:
+    """`.incbin "path"[, offset[, length]]`: emit a file, or a region of it.
+
+    The contents come from the process-wide asset cache, so a file
+    included by several modules is read (or mapped) once, and the node
+    only copies its region out when it emits. `length` defaults to the
+    rest of the file past `offset`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        resolver: Resolver,
+        offset: int = 0,
+        length: int | None = None,
+        symbol_base: str | None = None,
+    ) -> None:
         from a816.util import resolve_asset_path
 
         resolved = resolve_asset_path(path, resolver.context.include_paths)
-        with open(resolved, "rb") as binary_file:
-            self.binary_content = binary_file.read()
+        self.source = self._read(resolved)
+        if length is None:
+            length = len(self.source) - offset
+        if offset < 0 or length < 0 or offset + length > len(self.source):
+            raise ValueError(
+                f"{path}: range offset={offset:#x} length={length:#x} is outside the file ({len(self.source):#x} bytes)"
+            )
+        self.offset = offset
+        self.length = length
         resolver.dependency_files.add(os.path.abspath(resolved))
         self.file_path = path
-        self.symbol_base = path.replace("/", "_").replace(".", "_")
+        self.symbol_base = symbol_base or path.replace("/", "_").replace(".", "_")
         self.resolver = resolver
+        resolver.note_binding(self.symbol_base)
+        resolver.note_binding(self.symbol_base + "__size")
+
+    def _read(self, resolved: str) -> MappedBytes:
+        from a816.util import read_asset
+
+        return read_asset(resolved)
 
     def emit(self, current_addr: Address) -> bytes:
-        return self.binary_content
+        return self.source[self.offset : self.offset + self.length]
 
     def pc_after(self, current_pc: Address) -> Address:
-        retval = current_pc + len(self.binary_content)
+        retval = current_pc + self.length
         self.resolver.current_scope.add_label(self.symbol_base, current_pc)
-        self.resolver.current_scope.add_symbol(self.symbol_base + "__size", len(self.binary_content))
+        self.resolver.current_scope.add_symbol(self.symbol_base + "__size", self.length)
         return retval
 
 
+class CompressedBinaryNode(BinaryNode):
+    """`.incbin_lz "path", "codec"`: emit a file compressed with a built-in codec.
+
+    The auto-symbols are the same as `.incbin`'s; `__size` counts the
+    compressed bytes.
+    """
+
+    def __init__(self, path: str, codec: str, resolver: Resolver) -> None:
+        self.codec = codec
+        super().__init__(path, resolver)
+
+    def _read(self, resolved: str) -> MappedBytes:
+        from a816.compression import compress
+
+        return compress(bytes(super()._read(resolved)), self.codec)
+
+
+class GraphicsNode(BinaryNode):
+    """`.incgfx "image.png", bpp[, "part"]`: emit one part of a converted PNG."""
+
+    def __init__(self, path: str, bpp: int, part: str, resolver: Resolver, symbol_base: str) -> None:
+        self.bpp = bpp
+        self.part = part
+        super().__init__(path, resolver, symbol_base=symbol_base)
+
+    def _read(self, resolved: str) -> MappedBytes:
+        from a816.gfx import convert_png
+
+        tile_set = convert_png(bytes(super()._read(resolved)), self.bpp)
+        return {"tiles": tile_set.tiles, "map": tile_set.tilemap, "palette": tile_set.palette}[self.part]
+
+
+class SampleNode(BinaryNode):
+    """`.incbrr "sample.wav"[, loop_start]`: emit a WAV encoded as BRR.
+
+    A looping sample also defines `<label>__loop`, the byte offset of its
+    loop block, for the DSP sample directory.
+    """
+
+    def __init__(self, path: str, loop_start: int | None, resolver: Resolver) -> None:
+        self.loop_start = loop_start
+        self.loop_offset: int | None = None
+        super().__init__(path, resolver)
+        if loop_start is not None:
+            resolver.note_binding(self.symbol_base + "__loop")
+
+    def _read(self, resolved: str) -> MappedBytes:
+        from a816.brr import convert_wav
+
+        sample = convert_wav(bytes(super()._read(resolved)), self.loop_start)
+        self.loop_offset = sample.loop_offset
+        return sample.data
+
+    def pc_after(self, current_pc: Address) -> Address:
+        if self.loop_offset is not None:
+            self.resolver.current_scope.add_symbol(self.symbol_base + "__loop", self.loop_offset)
+        return super().pc_after(current_pc)
+
+
 class _SizedValueNode(NodeProtocol):
     """Emit `SIZE` little-endian bytes from a value node.
 
@@ -104,6 +196,8 @@ class _SizedValueNode(NodeProtocol):
 
     SIZE: int = 0
 
+    __slots__ = ("value_node",)
+
     def __init__(self, value_node: ValueNodeProtocol) -> None:
         self.value_node = value_node
 
@@ -125,14 +219,17 @@ class _SizedValueNode(NodeProtocol):
 
 
 class LongNode(_SizedValueNode):
+    __slots__ = ()
     SIZE = 3
 
 
 class WordNode(_SizedValueNode):
+    __slots__ = ()
     SIZE = 2
 
 
 class ByteNode(_SizedValueNode):
+    __slots__ = ()
     SIZE = 1
 
 
@@ -163,3 +260,126 @@ class DebugNode(NodeProtocol):
 
     def pc_after(self, current_pc: Address) -> Address:
         return current_pc
+
+
+class DataArrayNode(NodeProtocol):
+    """All values of one `.db`/`.dw`/`.dl` directive, `size` bytes each.
+
+    The first `emit` evaluates the values that are literal once folding
+    has run and keeps them; only the others are evaluated again on each
+    emit, and in object mode only they can register an expression
+    relocation, at their own offset in the array. An array of literals
+    packs once.
+    """
+
+    __slots__ = ("size", "value_nodes", "_literals", "_deferred", "_packed")
+
+    def __init__(self, size: int, value_nodes: list[ValueNodeProtocol]) -> None:
+        self.size = size
+        self.value_nodes = value_nodes
+        self._literals: list[int | None] | None = None
+        self._deferred: list[int] = []
+        self._packed: bytes | None = None
+
+    @property
+    def byte_count(self) -> int:
+        return self.size * len(self.value_nodes)
+
+    def _evaluate(self, index: int, base_offset: int) -> int:
+        value_node = self.value_nodes[index]
+        value = value_node.get_value()
+        if isinstance(value_node, ExpressionNode) and hasattr(value_node, "_deferred_expression"):
+            resolver = value_node.resolver
+            if resolver.context.is_object_mode and resolver.context.object_writer is not None:
+                resolver.context.object_writer.add_expression_relocation(
+                    resolver.context.object_writer.relocation_offset(base_offset + index * self.size),
+                    value_node._deferred_expression,
+                    self.size,
+                )
+        return value
+
+    def emit(self, current_address: Address) -> bytes:
+        return self.pack()
+
+    def pack(self, base_offset: int = 0) -> bytes:
+        """The array's bytes, placed `base_offset` bytes into the node emitting it.
+
+        `base_offset` only moves the relocations the array records; a
+        `DataLoopNode` passes the bytes it has already produced.
+        """
+        if self._literals is None:
+            self._literals = [_literal_value(value_node) for value_node in self.value_nodes]
+            self._deferred = [index for index, value in enumerate(self._literals) if value is None]
+        if self._packed is not None:
+            return self._packed
+        values = list(self._literals)
+        for index in self._deferred:
+            values[index] = self._evaluate(index, base_offset)
+        packed = _pack(self.size, cast(list[int], values))
+        if not self._deferred:
+            self._packed = packed
+        return packed
+
+    def pc_after(self, current_pc: Address) -> Address:
+        return current_pc + self.byte_count
+
+
+def _literal_value(value_node: ValueNodeProtocol) -> int | None:
+    if not isinstance(value_node, ExpressionNode):
+        return None
+    tokens = value_node.expression.tokens
+    # Most table entries are a bare number, or were folded into one.
+    if len(tokens) == 1 and isinstance(tokens[0], Term) and tokens[0].token.type == TokenType.NUMBER:
+        return eval_number(tokens[0].token.value)
+    return constant_expression_value(value_node.expression, lambda name: None)
+
+
+_PACK_FORMATS = {1: "B", 2: "H", 3: "I"}
+
+
+def _pack(size: int, values: list[int]) -> bytes:
+    """`values` as little-endian `size`-byte integers, truncated to width."""
+    mask = (1 << (8 * size)) - 1
+    packed = struct.pack(f"<{len(values)}{_PACK_FORMATS[size]}", *[value & mask for value in values])
+    if size != 3:
+        return packed
+    # 24-bit values: pack as 32-bit and drop every high byte.
+    longs = bytearray(3 * len(values))
+    for byte in range(3):
+        longs[byte::3] = packed[byte::4]
+    return bytes(longs)
+
+
+class DataLoopNode(NodeProtocol):
+    """A `.for` loop whose body is only data directives, kept rolled.
+
+    `body` holds one iteration's data nodes, generated once in the loop's
+    scope. `pc_after` advances by every iteration's bytes without
+    evaluating anything; `emit` binds `symbol` to each loop value in turn
+    and re-evaluates the body. Data arrays don't read their emit
+    address, so the whole table goes out in one chunk; each array is told
+    how far into that chunk it lands so object-mode relocations point at
+    its own bytes.
+    """
+
+    def __init__(self, symbol: str, values: range, body: list[DataArrayNode], resolver: Resolver) -> None:
+        self.symbol = symbol
+        self.values = values
+        self.body = body
+        self.resolver = resolver
+        self.iteration_size = sum(node.byte_count for node in body)
+        resolver.note_binding(symbol)
+
+    def emit(self, current_address: Address) -> bytes:
+        scope = self.resolver.current_scope
+        chunks = []
+        offset = 0
+        for value in self.values:
+            scope.add_symbol(self.symbol, value)
+            for node in self.body:
+                chunks.append(node.pack(offset))
+                offset += node.byte_count
+        return b"".join(chunks)
+
+    def pc_after(self, current_pc: Address) -> Address:
+        return current_pc + len(self.values) * self.iteration_size
@@ -16,6 +16,8 @@ from a816.symbols import Resolver
 
 
 class ValueNode(ValueNodeProtocol):
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         self.value = value
 
@@ -31,10 +33,24 @@ class ValueNode(ValueNodeProtocol):
 
 
 class ExpressionNode(ValueNodeProtocol):
-    def __init__(self, expression: ExpressionAstNode, resolver: Resolver, file_info: Token) -> None:
+    __slots__ = (
+        "expression",
+        "resolver",
+        "file_info",
+        "_deferred_expression",
+        "_local_label_renames",
+        "_external_symbols",
+    )
+
+    def __init__(
+        self, expression: ExpressionAstNode, resolver: Resolver, file_info: Token, foldable: bool = True
+    ) -> None:
         self.expression = expression
         self.resolver = resolver
         self.file_info = file_info
+        # A caller that knows `expression` can never fold keeps it off the queue.
+        if foldable:
+            resolver.note_folding_site(self)
 
     def _compute_local_label_renames(self) -> tuple[dict[str, str], bool]:
         """Return (rename map, touches_any_label). Nested-scope label refs
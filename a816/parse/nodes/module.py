@@ -37,6 +37,8 @@ class LinkedModuleNode(NodeProtocol):
         self.symbols = symbols
         self.resolver = resolver
         self.relocatable = relocatable
+        for name, *_ in symbols:
+            resolver.note_binding(name)
         # Set by Program._mark_import_winners: True for every duplicate
         # `.import` of the same module except the last occurrence in
         # program order. Losers bind symbols (so the loser's source can
@@ -2,21 +2,58 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import cast
 
-from a816.cpu.cpu_65c816 import BlockMoveOpcode, NoOpcodeForOperandSize, guess_value_size, snes_opcode_table
+from a816.cpu.cpu_65c816 import BlockMoveOpcode, NoOpcodeForOperandSize, Opcode, guess_value_size, snes_opcode_table
 from a816.cpu.mapping import Address
 from a816.cpu.types import AddressingMode, ValueSize
 from a816.diagnostics.suggest import did_you_mean_hint as _did_you_mean_hint
 from a816.error_codes import E_SYMBOL_NOT_DEFINED as _E_SYMBOL_NOT_DEFINED
 from a816.exceptions import SymbolNotDefined
+from a816.parse.ast.expression import bare_name, expression_names
 from a816.parse.nodes.errors import NodeError
+from a816.parse.nodes.expr import ExpressionNode
 from a816.parse.tokens import Token
 from a816.protocols import NodeProtocol, OpcodeProtocol, ValueNodeProtocol
 from a816.symbols import Resolver
 
 
+@dataclass(frozen=True)
+class _OperandSizing:
+    """What picks an opcode node's encoded width, worked out once per node.
+
+    The defaults describe a fixed-length encoding.
+    """
+
+    # Register whose 16-bit mode forces a word operand.
+    is_a: bool = False
+    is_x: bool = False
+    # Operand that is a single symbol, sized by the symbol's operand width.
+    name: str | None = None
+    # Symbols named by any other operand expression, sized by their values.
+    names: tuple[str, ...] = ()
+
+
+_FIXED_LENGTH = _OperandSizing()
+_WORD_OPERAND = ("w",)
+
+
 class OpcodeNode(NodeProtocol):
+    __slots__ = (
+        "opcode",
+        "addressing_mode",
+        "index",
+        "value_node",
+        "value_node2",
+        "size",
+        "file_info",
+        "resolver",
+        "_sizing",
+        "_measured_stamp",
+        "_measured_length",
+    )
+
     def __init__(
         self,
         opcode: str,
@@ -38,6 +75,11 @@ class OpcodeNode(NodeProtocol):
         self.size = size
         self.file_info = file_info
         self.resolver = resolver
+        # Last measured encoding length, reused by `pc_after` while
+        # `_length_stamp` still returns the stamp it was measured under.
+        self._sizing: _OperandSizing | None = None
+        self._measured_stamp: tuple[object, ...] | None = None
+        self._measured_length = 0
 
     def _get_emitter(self) -> OpcodeProtocol:
         try:
@@ -94,8 +136,52 @@ class OpcodeNode(NodeProtocol):
 
     def pc_after(self, current_pc: Address) -> Address:
         self._maybe_update_register_sizes()
-        opcode_emitter = self._get_emitter()
-        return current_pc + opcode_emitter.supposed_length(self.value_node, self.size, self.resolver)
+        stamp = self._length_stamp()
+        if stamp != self._measured_stamp:
+            opcode_emitter = self._get_emitter()
+            self._measured_length = opcode_emitter.supposed_length(self.value_node, self.size, self.resolver)
+            self._measured_stamp = stamp
+            self.resolver.size_measurements += 1
+        return current_pc + self._measured_length
+
+    def _length_stamp(self) -> tuple[object, ...]:
+        """Everything the encoded length depends on that can move between passes.
+
+        A symbol operand is sized by the symbol's operand width, so its
+        length holds until the symbol's `width_generations` counter
+        moves; any other expression holds until the `value_generations`
+        counter of a symbol it names does.
+        """
+        sizing = self._sizing
+        if sizing is None:
+            sizing = self._sizing = self._operand_sizing(self._get_emitter())
+        resolver = self.resolver
+        if (sizing.is_a and resolver.a_size == 16) or (sizing.is_x and resolver.i_size == 16):
+            return _WORD_OPERAND
+        if sizing.name is not None:
+            generation = resolver.width_generations.get(sizing.name, 0)
+        elif sizing.names:
+            # Counters only grow, so their sum moves whenever one does.
+            values = resolver.value_generations
+            generation = sum([values.get(name, 0) for name in sizing.names])
+        else:
+            return ()
+        return (resolver.current_scope, resolver.extern_generation, generation)
+
+    def _operand_sizing(self, opcode_emitter: OpcodeProtocol) -> _OperandSizing:
+        # Only an unsized `Opcode` picks its width from the operand; a
+        # literal operand's width comes from its spelling.
+        if type(opcode_emitter) is not Opcode or self.size:
+            return _FIXED_LENGTH
+        value_node = self.value_node
+        if not isinstance(value_node, ExpressionNode):
+            return _OperandSizing(opcode_emitter.is_a, opcode_emitter.is_x)
+        expression = value_node.expression
+        name = bare_name(expression)
+        if name is not None:
+            return _OperandSizing(opcode_emitter.is_a, opcode_emitter.is_x, name)
+        names = tuple(expression_names(expression))
+        return _OperandSizing(opcode_emitter.is_a, opcode_emitter.is_x, names=names)
 
     def _maybe_update_register_sizes(self) -> None:
         """`rep`/`sep` change M/X at runtime; the assembler-time analog
@@ -89,6 +89,8 @@ class ScopeNode(NodeProtocol):
     cursor running off the end of `resolver.scopes`.
     """
 
+    __slots__ = ("resolver", "parent_scope", "target_scope")
+
     def __init__(self, resolver: Resolver) -> None:
         self.resolver = resolver
         self.parent_scope = self.resolver.current_scope.parent
@@ -117,6 +119,8 @@ class PopScopeNode(NodeProtocol):
     surface in the parent's dotted view.
     """
 
+    __slots__ = ("resolver", "exports", "leaving_scope", "parent_scope")
+
     def __init__(self, resolver: Resolver, *, exports: bool = False) -> None:
         self.resolver = resolver
         self.exports = exports
@@ -13,9 +13,12 @@ from a816.symbols import Resolver
 
 
 class LabelNode(NodeProtocol):
+    __slots__ = ("symbol_name", "resolver")
+
     def __init__(self, symbol_name: str, resolver: Resolver) -> None:
         self.symbol_name = symbol_name
         self.resolver = resolver
+        resolver.note_binding(symbol_name)
 
     def emit(self, current_addr: Address) -> bytes:
         return b""
@@ -53,6 +56,8 @@ class LabelDeclNode(NodeProtocol):
         self.expression = expression
         self.resolver = resolver
         self.file_info = file_info
+        resolver.note_binding(symbol_name)
+        resolver.note_folding_site(self)
 
     def emit(self, current_addr: Address) -> bytes:
         return b""
@@ -87,6 +92,8 @@ class LabelDeclNode(NodeProtocol):
 
 
 class SymbolNode(NodeProtocol):
+    __slots__ = ("symbol_name", "expression", "resolver")
+
     def __init__(
         self,
         symbol_name: str,
@@ -96,6 +103,9 @@ class SymbolNode(NodeProtocol):
         self.symbol_name = symbol_name
         self.expression = expression
         self.resolver = resolver
+        resolver.note_binding(symbol_name)
+        if isinstance(expression, ExpressionAstNode):
+            resolver.note_folding_site(self)
 
     def emit(self, current_addr: Address) -> bytes:
         return b""
@@ -164,6 +174,7 @@ class ExternNode(NodeProtocol):
     def __init__(self, symbol_name: str, resolver: Resolver) -> None:
         self.symbol_name = symbol_name
         self.resolver = resolver
+        resolver.note_binding(symbol_name)
 
     def emit(self, current_addr: Address) -> bytes:
         return b""
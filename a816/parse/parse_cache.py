@@ -0,0 +1,164 @@
+"""Optional on-disk cache of parsed ASTs.
+
+`A816Parser.parse_as_ast` consults the active cache before scanning, so
+`a816` builds, `a816 fluff` and the LSP all skip re-parsing a file whose
+text (and every file it `.include`s) is unchanged since any of them last
+parsed it. Enabled per project with `parse-cache` in `a816.toml`.
+
+One entry per (file name, include paths) is kept, holding the digest of
+the text it was parsed from; a changed text overwrites the entry instead
+of adding one, so an editor session does not grow the cache per
+keystroke. Each `.include` is looked up again on load, so a new file
+shadowing it earlier on the search path also drops the entry. Entries
+are also keyed by a fingerprint of the parser
+sources, so upgrading or editing a816 drops every stale AST.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from a816.parse.ast.nodes import AstNode, IncludeAstNode
+from a816.parse.ast.visitor import walk
+from a816.parse.parser_states.directives import include_search_dirs, locate_include
+from a816.util import write_atomically
+
+logger = logging.getLogger("a816.parse_cache")
+
+CACHE_VERSION = 2
+
+
+@cache
+def parser_fingerprint() -> str:
+    """Digest of every source file under `a816/parse` plus `CACHE_VERSION`."""
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    package_dir = Path(__file__).parent
+    for source in sorted(package_dir.rglob("*.py")):
+        digest.update(source.relative_to(package_dir).as_posix().encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> str | None:
+    try:
+        with open(path, "rb") as fd:
+            return hashlib.sha256(fd.read()).hexdigest()
+    except OSError:
+        return None
+
+
+@dataclass(frozen=True, order=True)
+class _Include:
+    """One `.include` seen while parsing, with what is needed to redo its lookup."""
+
+    requested: str
+    search_dirs: tuple[str, ...]
+    resolved_path: str
+    digest: str | None
+
+    def is_current(self) -> bool:
+        """Still found at the same path (nothing shadows it now), unchanged."""
+        search_dirs = [Path(search_dir) for search_dir in self.search_dirs]
+        if locate_include(self.requested, search_dirs) != self.resolved_path:
+            return False
+        return _file_digest(self.resolved_path) == self.digest
+
+
+@dataclass
+class _Entry:
+    text_digest: str
+    # Every file `.include`d while parsing, nested ones included.
+    includes: list[_Include]
+    nodes: list[AstNode]
+
+
+class ParseCache:
+    """Pickled ASTs stored under `directory`, one file per parsed source."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _entry_path(self, filename: str, include_paths: list[Path] | None) -> Path:
+        key = hashlib.sha256(parser_fingerprint().encode())
+        key.update(filename.encode())
+        for include_path in include_paths or []:
+            key.update(b"\0" + str(include_path).encode())
+        return self.directory / f"{key.hexdigest()}.ast"
+
+    def load(self, text: str, filename: str, include_paths: list[Path] | None) -> list[AstNode] | None:
+        """Nodes parsed from exactly `text` (and unchanged includes), or None."""
+        entry_path = self._entry_path(filename, include_paths)
+        try:
+            with entry_path.open("rb") as fd:
+                # NOSONAR python:S5135: the entry was pickled by a816 itself
+                # into the project's own cache directory; there is no trust
+                # boundary between the writer and this reader.
+                entry = pickle.load(fd)  # NOSONAR
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            logger.debug("Ignoring unreadable parse cache entry %s", entry_path, exc_info=True)
+            return None
+        if not isinstance(entry, _Entry) or entry.text_digest != _text_digest(text):
+            return None
+        if not all(include.is_current() for include in entry.includes):
+            return None
+        return entry.nodes
+
+    def store(self, text: str, filename: str, include_paths: list[Path] | None, nodes: list[AstNode]) -> None:
+        """Record `nodes` as the parse of `text`; failures only log."""
+        includes = sorted(
+            {
+                _include_record(node, include_paths)
+                for node in walk(nodes)
+                if isinstance(node, IncludeAstNode) and node.resolved_path is not None
+            }
+        )
+        entry = _Entry(_text_digest(text), includes, nodes)
+        entry_path = self._entry_path(filename, include_paths)
+        try:
+            write_atomically(entry_path, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        except (OSError, pickle.PicklingError, RecursionError, TypeError, AttributeError):
+            logger.debug("Could not write parse cache entry %s", entry_path, exc_info=True)
+
+
+def _include_record(node: IncludeAstNode, include_paths: list[Path] | None) -> _Include:
+    position = node.file_info.position
+    parent_filename = position.file.filename if position and position.file else None
+    search_dirs = include_search_dirs(parent_filename, include_paths)
+    assert node.resolved_path is not None
+    return _Include(
+        node.file_path,
+        tuple(str(search_dir) for search_dir in search_dirs),
+        node.resolved_path,
+        _file_digest(node.resolved_path),
+    )
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+_active: ParseCache | None = None
+
+
+def enable_parse_cache(directory: Path) -> ParseCache:
+    """Make `A816Parser.parse_as_ast` read and write ASTs under `directory`."""
+    global _active
+    if _active is None or _active.directory != directory:
+        _active = ParseCache(directory)
+    return _active
+
+
+def disable_parse_cache() -> None:
+    global _active
+    _active = None
+
+
+def active_parse_cache() -> ParseCache | None:
+    return _active
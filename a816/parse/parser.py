@@ -1,5 +1,6 @@
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
 from pathlib import Path
 
 from a816.error_codes import E_PARSER_EXPECTED_TOKEN
@@ -60,9 +61,28 @@ def _got_label(token: Token) -> str:
 logger = logging.getLogger("a816.parser")
 
 
+# A streamed parser drops consumed tokens once this many have piled up
+# behind the cursor, amortising the `del buffer[:n]` shift.
+RELEASE_THRESHOLD = 4096
+# Tokens read from a stream per refill of the window.
+READ_AHEAD = 256
+
+
 class Parser:
-    def __init__(self, tokens: list[Token], initial_state: "StateFunc", include_paths: list[Path] | None = None):
-        self.tokens: list[Token] = tokens
+    def __init__(
+        self, tokens: Iterable[Token], initial_state: "StateFunc", include_paths: list[Path] | None = None
+    ) -> None:
+        # `tokens` is either a complete list, kept as is, or any iterable
+        # (e.g. `FastScanner.iter_scan`) pulled on demand into a sliding
+        # window. `pos` indexes that window, so it shifts down whenever
+        # `release()` drops consumed tokens.
+        self._streamed = not isinstance(tokens, list)
+        if isinstance(tokens, list):
+            self.tokens: list[Token] = tokens
+            self._pending: Iterator[Token] | None = None
+        else:
+            self.tokens = []
+            self._pending = iter(tokens)
         self.pos = 0
         self.initial_state: StateFunc = initial_state
         self.include_paths: list[Path] = include_paths or []
@@ -78,18 +98,42 @@ class Parser:
             logger.debug("Parser syntax error: %s", e)
             raise
 
+    def _pull(self, offset: int) -> Token:
+        """Token `offset` past the buffered window: read ahead from the stream."""
+        while self._pending is not None and len(self.tokens) <= offset:
+            buffered = len(self.tokens)
+            self.tokens.extend(islice(self._pending, READ_AHEAD))
+            if len(self.tokens) - buffered < READ_AHEAD:
+                self._pending = None
+        if offset < len(self.tokens):
+            return self.tokens[offset]
+        return Token(TokenType.EOF, "")
+
     def current(self) -> Token:
         try:
             return self.tokens[self.pos]
         except IndexError:
-            return Token(TokenType.EOF, "")
+            return self._pull(self.pos)
 
     def peek(self) -> Token:
         try:
-            token: Token = self.tokens[self.pos + 1]
-            return token
+            return self.tokens[self.pos + 1]
         except IndexError:
-            return Token(TokenType.EOF, "")
+            return self._pull(self.pos + 1)
+
+    def release(self) -> None:
+        """Forget streamed tokens before `pos - 1` (one `backup()` stays possible).
+
+        Called between statements. `pos` shifts down by the number of
+        dropped tokens, so code that saves `pos` to rewind must not span a
+        release. A no-op when the parser was given a list.
+        """
+        if not self._streamed:
+            return
+        drop = self.pos - 1
+        if drop >= RELEASE_THRESHOLD:
+            del self.tokens[:drop]
+            self.pos -= drop
 
     def next(self) -> Token:
         token = self.current()
@@ -99,6 +143,8 @@ class Parser:
     def backup(self) -> Token:
         token = self.current()
         self.pos -= 1
+        if self._streamed and self.pos < 0:
+            raise IndexError("cannot back up past released tokens")
         return token
 
 
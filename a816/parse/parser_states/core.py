@@ -15,7 +15,6 @@ from a816.parse.ast.nodes import (
     CommentAstNode,
     CompoundAstNode,
     DocstringAstNode,
-    IncludeBinaryAstNode,
     KeywordAstNode,
     LabelAstNode,
     ReserveAstNode,
@@ -41,6 +40,10 @@ from a816.parse.parser_states.directives import (
     parse_for,
     parse_if,
     parse_import,
+    parse_incbin,
+    parse_incbin_lz,
+    parse_incbrr,
+    parse_incgfx,
     parse_include,
     parse_include_ips,
     parse_label_decl,
@@ -75,7 +78,10 @@ _DIRECTIVE_HANDLERS: dict[str, Callable[[Parser, Token], AstNode]] = {
     # quoted string is consumed, `p.current()` is the NEXT token (often a
     # trailing comment on the following line), which mis-attributes the node's
     # source line and makes the formatter fold that comment onto the directive.
-    "incbin": lambda p, kw: IncludeBinaryAstNode(parse_directive_with_quoted_string(p), kw),
+    "incbin": parse_incbin,
+    "incbin_lz": parse_incbin_lz,
+    "incgfx": parse_incgfx,
+    "incbrr": parse_incbrr,
     "table": lambda p, kw: TableAstNode(parse_directive_with_quoted_string(p), kw),
     "macro": lambda p, _kw: parse_macro(p),
     "map": lambda p, _kw: parse_map(p),
@@ -135,6 +141,7 @@ def parse_block(p: Parser) -> list[AstNode]:
     while p.current().type != TokenType.EOF:
         if p.current().type == TokenType.RBRACE:
             break
+        p.release()
         statement = parse_decl(p)
         if statement is not None:
             decl.append(statement)
@@ -243,6 +250,7 @@ def _recover_to_next_statement(p: Parser) -> None:
 def parse_initial(p: Parser) -> list[AstNode]:
     statements: list[AstNode] = []
     while p.current().type != TokenType.EOF:
+        p.release()
         try:
             statement = parse_decl(p)
         except ParserSyntaxError as exc:
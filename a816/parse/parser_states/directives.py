@@ -5,6 +5,7 @@ ascii/text/incbin/table/.aN/.iN)."""
 from __future__ import annotations
 
 import ast
+import os
 from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -30,7 +31,11 @@ from a816.parse.ast.nodes import (
     IfAstNode,
     ImportAstNode,
     IncludeAstNode,
+    IncludeBinaryAstNode,
+    IncludeCompressedAstNode,
+    IncludeGraphicsAstNode,
     IncludeIpsAstNode,
+    IncludeSampleAstNode,
     LabelDeclAstNode,
     MacroAstNode,
     MapArgs,
@@ -45,7 +50,9 @@ from a816.parse.ast.nodes import (
     StructAstNode,
     Term,
 )
+from a816.parse.ast.visitor import walk
 from a816.parse.errors import ParserSyntaxError
+from a816.parse.fast_scanner import FastScanner
 from a816.parse.parser import (
     Parser,
     StateFunc,
@@ -53,8 +60,6 @@ from a816.parse.parser import (
     expect_token,
 )
 from a816.parse.parser_states.expr import parse_expression, parse_expression_list_inner
-from a816.parse.scanner import Scanner, ScannerStateFunc
-from a816.parse.scanner_states import lex_initial
 from a816.parse.tokens import Token, TokenType
 
 
@@ -246,6 +251,49 @@ def parse_directive_with_quoted_string(p: Parser) -> str:
     return string.value[1:-1]
 
 
+def parse_incbin(p: Parser, keyword: Token) -> IncludeBinaryAstNode:
+    """Parse `.incbin "path"` with an optional `, offset[, length]` region."""
+    path = parse_directive_with_quoted_string(p)
+    offset = length = None
+    if accept_token(p.current(), TokenType.COMMA):
+        p.next()
+        offset = parse_expression(p)
+        if accept_token(p.current(), TokenType.COMMA):
+            p.next()
+            length = parse_expression(p)
+    return IncludeBinaryAstNode(path, keyword, offset, length)
+
+
+def parse_incbin_lz(p: Parser, keyword: Token) -> IncludeCompressedAstNode:
+    """Parse `.incbin_lz "path", "codec"`."""
+    path = parse_directive_with_quoted_string(p)
+    expect_token(p.next(), TokenType.COMMA)
+    codec = parse_directive_with_quoted_string(p)
+    return IncludeCompressedAstNode(path, codec, keyword)
+
+
+def parse_incgfx(p: Parser, keyword: Token) -> IncludeGraphicsAstNode:
+    """Parse `.incgfx "path", bpp` with an optional `, "part"`."""
+    path = parse_directive_with_quoted_string(p)
+    expect_token(p.next(), TokenType.COMMA)
+    bpp = parse_expression(p)
+    part = None
+    if accept_token(p.current(), TokenType.COMMA):
+        p.next()
+        part = parse_directive_with_quoted_string(p)
+    return IncludeGraphicsAstNode(path, bpp, part, keyword)
+
+
+def parse_incbrr(p: Parser, keyword: Token) -> IncludeSampleAstNode:
+    """Parse `.incbrr "path"` with an optional `, loop_start`."""
+    path = parse_directive_with_quoted_string(p)
+    loop = None
+    if accept_token(p.current(), TokenType.COMMA):
+        p.next()
+        loop = parse_expression(p)
+    return IncludeSampleAstNode(path, loop, keyword)
+
+
 def parse_include_ips(p: Parser) -> IncludeIpsAstNode:
     current = p.current()
     string = parse_directive_with_quoted_string(p)
@@ -292,40 +340,112 @@ def parse_debug(p: Parser) -> DebugAstNode:
     return DebugAstNode(message_token.value[1:-1], message_token)
 
 
-def _resolve_include_path(p: Parser, keyword: Token, include_path: str) -> str:
-    """Locate an include file: parent-relative first, then `--include-path`s."""
-    if keyword.position and keyword.position.file:
-        parent_filename = keyword.position.file.filename
+def include_search_dirs(parent_filename: str | None, include_paths: list[Path] | None) -> list[Path]:
+    """Directories an `.include` in `parent_filename` is looked up in, in order.
+
+    The including file's own directory comes first (when it exists), then
+    every `--include-path`.
+    """
+    search_dirs: list[Path] = []
+    if parent_filename:
         if parent_filename.startswith("file://"):
             from urllib.parse import unquote, urlparse
 
             parent_filename = unquote(urlparse(parent_filename).path)
         parent_dir = Path(parent_filename).parent
         if parent_dir.exists():
-            candidate = parent_dir / include_path
-            if candidate.exists():
-                return str(candidate)
+            search_dirs.append(parent_dir)
+    search_dirs.extend(include_paths or [])
+    return search_dirs
+
 
-    for search_dir in p.include_paths or []:
+def locate_include(include_path: str, search_dirs: list[Path]) -> str:
+    """First `search_dirs` entry holding `include_path`, else the bare name."""
+    for search_dir in search_dirs:
         candidate = search_dir / include_path
         if candidate.exists():
             return str(candidate)
-
     return include_path  # let the eventual open() raise the canonical error
 
 
+def _resolve_include_path(p: Parser, keyword: Token, include_path: str) -> str:
+    """Locate an include file: parent-relative first, then `--include-path`s."""
+    parent_filename = keyword.position.file.filename if keyword.position and keyword.position.file else None
+    return locate_include(include_path, include_search_dirs(parent_filename, p.include_paths))
+
+
+# Stamp of one source file: (absolute path, mtime_ns, size).
+_FileStamp = tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class _CachedInclude:
+    """Parsed body of an included file plus the stamps it was parsed from.
+
+    `stamps` covers the file itself and every file it includes, so
+    touching a nested header invalidates the outer entry as well.
+    """
+
+    stamps: tuple[_FileStamp, ...]
+    nodes: tuple[AstNode, ...]
+
+
+# Per-process include cache: (resolved path, absolute path, include_paths)
+# -> parsed body. The resolved path string is part of the key because the
+# tokens it produced report it as their file name.
+_INCLUDE_CACHE: dict[tuple[str, str, tuple[Path, ...]], _CachedInclude] = {}
+
+
+def clear_include_cache() -> None:
+    """Drop every parsed include (tests, long-running LSP sessions)."""
+    _INCLUDE_CACHE.clear()
+
+
+def _stamp(path: str) -> _FileStamp:
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+def _is_fresh(entry: _CachedInclude) -> bool:
+    try:
+        return all(_stamp(stamp[0]) == stamp for stamp in entry.stamps)
+    except OSError:
+        return False
+
+
 def parse_include(p: Parser, keyword: Token) -> IncludeAstNode:
+    """Parse an `.include`, reusing the body parsed by an earlier occurrence.
+
+    Included nodes carry tokens positioned in the included file, so they
+    are identical wherever the file is included and are shared between
+    occurrences; only the `IncludeAstNode` itself (positioned at this
+    occurrence's keyword) and its node list are fresh. Shared nodes must
+    not be mutated.
+    """
     from a816.parse.parser_states.core import parse_initial
 
     include_path = parse_directive_with_quoted_string(p)
     resolved_path = _resolve_include_path(p, keyword, include_path)
-    with open(resolved_path, encoding="utf-8") as fd:
-        source = fd.read()
-    scanner = Scanner(cast(ScannerStateFunc, lex_initial))
-    tokens = scanner.scan(resolved_path, source)
-    parser = Parser(tokens, cast(StateFunc, parse_initial), include_paths=p.include_paths)
-    sub_ast = parser.parse()
-    return IncludeAstNode(include_path, sub_ast, keyword, resolved_path=resolved_path)
+    include_paths = tuple(p.include_paths or ())
+    key = (resolved_path, os.path.abspath(resolved_path), include_paths)
+    entry = _INCLUDE_CACHE.get(key)
+    if entry is None or not _is_fresh(entry):
+        # Stat before reading so an edit racing the parse leaves a stale stamp.
+        stamps = {_stamp(resolved_path)}
+        with open(resolved_path, encoding="utf-8") as fd:
+            source = fd.read()
+        scanner = FastScanner()
+        tokens = scanner.iter_scan(resolved_path, source)
+        parser = Parser(tokens, cast(StateFunc, parse_initial), include_paths=p.include_paths)
+        sub_ast = parser.parse()
+        for node in walk(sub_ast):
+            if isinstance(node, IncludeAstNode) and node.resolved_path is not None:
+                nested = _INCLUDE_CACHE.get((node.resolved_path, os.path.abspath(node.resolved_path), include_paths))
+                if nested is not None:
+                    stamps.update(nested.stamps)
+        entry = _CachedInclude(tuple(sorted(stamps)), tuple(sub_ast))
+        _INCLUDE_CACHE[key] = entry
+    return IncludeAstNode(include_path, list(entry.nodes), keyword, resolved_path=resolved_path)
 
 
 def _data_node(kind: str) -> Callable[[Parser, Token], DataNode]:
@@ -277,6 +277,9 @@ DIRECTIVE_NAMES = {
     "include",
     "include_ips",
     "incbin",
+    "incbin_lz",
+    "incgfx",
+    "incbrr",
     "pointer",
     "text",
     "ascii",
@@ -476,8 +479,15 @@ def _lex_brace(s: Scanner) -> bool:
 def _lex_block_comment(s: Scanner) -> bool:
     if not s.accept_prefix("/*"):
         return False
+    start_position = s.get_position()
     while not s.accept_prefix("*/"):
-        s.next()
+        if s.next() is None:
+            raise ScannerException(
+                "unterminated block comment",
+                start_position,
+                code=str(E_SCANNER_UNTERMINATED_STRING),
+                hint="block comments end with `*/`",
+            )
     s.emit(TokenType.COMMENT)
     return True
 
@@ -1,11 +1,29 @@
+from bisect import bisect_right
 from enum import Enum, auto
+from itertools import accumulate
 from typing import Any
 
 
 class File:
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, source: str | None = None):
+        """`source`, when given, is split into `lines` only on first access."""
         self.filename = filename
-        self.lines: list[str] = []
+        self._source = source
+        self._lines: list[str] | None = None if source is not None else []
+        self._line_starts: list[int] = []
+
+    @property
+    def lines(self) -> list[str]:
+        if self._lines is None:
+            assert self._source is not None
+            self._lines = self._source.split("\n")
+            self._source = None
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: list[str]) -> None:
+        self._lines = lines
+        self._source = None
 
     def append(self, line: str) -> None:
         self.lines.append(line)
@@ -13,10 +31,16 @@ class File:
     def get(self, lineno: int) -> str:
         return self.lines[lineno]
 
+    def position_at(self, offset: int) -> "Position":
+        """Line / column of character `offset` in the source split into `lines`."""
+        if len(self._line_starts) != len(self.lines):
+            self._line_starts = [0, *accumulate(len(line) + 1 for line in self.lines[:-1])]
+        line = bisect_right(self._line_starts, offset) - 1
+        return Position(line, offset - self._line_starts[line], self)
+
 
 class Position:
-    line = 0
-    column = 0
+    __slots__ = ("line", "column", "file")
 
     def __init__(self, line: int, column: int, file: File) -> None:
         self.line = line
@@ -80,10 +104,39 @@ class TokenType(Enum):
 
 
 class Token:
-    def __init__(self, type_: TokenType, value: str, position: Position | None = None) -> None:
+    """A lexeme and where it starts.
+
+    Tokens from `FastScanner` only record their source offset; `position`
+    is materialised from the file's line index on first access, so the
+    many tokens nobody asks about never allocate a `Position`.
+    """
+
+    __slots__ = ("type", "value", "_position", "_file", "_offset")
+
+    def __init__(
+        self,
+        type_: TokenType,
+        value: str,
+        position: Position | None = None,
+        file: File | None = None,
+        offset: int = 0,
+    ) -> None:
+        """Either pass `position`, or the `file` and character `offset` to derive it from lazily."""
         self.type: TokenType = type_
         self.value: str = value
-        self.position: Position | None = position
+        self._position = position
+        self._file = file
+        self._offset = offset
+
+    @property
+    def position(self) -> Position | None:
+        if self._position is None and self._file is not None:
+            self._position = self._file.position_at(self._offset)
+        return self._position
+
+    def located(self, type_: TokenType, value: str) -> "Token":
+        """A token for another lexeme at this token's location, without materialising it."""
+        return Token(type_, value, self._position, self._file, self._offset)
 
     @property
     def end_position(self) -> Position | None:
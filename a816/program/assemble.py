@@ -24,7 +24,7 @@ from a816.protocols import NodeProtocol
 from a816.writers import IPSWriter, ObjectWriter, OverlapError, SFCWriter, WriteAuditor, Writer
 
 if TYPE_CHECKING:
-    from a816.symbols import Resolver
+    from a816.symbols import Resolver, RootSymbolIndex
 
 logger = logging.getLogger("a816")
 
@@ -173,11 +173,16 @@ class AssembleMixin:
             return -1
 
     def _classify_object_symbol(
-        self, name: str, value: int, label_names: set[str], absolute_label_names: set[str]
+        self,
+        name: str,
+        value: int,
+        label_names: set[str],
+        absolute_label_names: set[str],
+        root_symbols: RootSymbolIndex,
     ) -> tuple[SymbolType, SymbolSection, int]:
         # Anonymous-block labels stay LOCAL (would otherwise leak as globals);
         # `_` prefix marks private; root-scope (or NamedScope dotted) is GLOBAL.
-        if name.startswith("_") or not self.resolver.is_root_scope_symbol(name):
+        if name.startswith("_") or name not in root_symbols:
             symbol_type = SymbolType.LOCAL
         else:
             symbol_type = SymbolType.GLOBAL
@@ -194,11 +199,14 @@ class AssembleMixin:
     def _export_object_symbols(self, object_writer: ObjectWriter) -> None:
         label_names = {n for n, _ in self.resolver.get_all_labels(mangle_nested=True)}
         absolute_label_names = {n for n, _ in self.resolver.get_all_absolute_labels(mangle_nested=True)}
+        root_symbols = self.resolver.root_symbol_index()
         self._publish_named_scope_bare_names(object_writer)
         for name, value in self.resolver.get_all_symbols():
             if self._should_skip_symbol_export(name, label_names):
                 continue
-            sym_type, section, sym_value = self._classify_object_symbol(name, value, label_names, absolute_label_names)
+            sym_type, section, sym_value = self._classify_object_symbol(
+                name, value, label_names, absolute_label_names, root_symbols
+            )
             object_writer.add_symbol(name, sym_value, sym_type, section)
 
     def _publish_named_scope_bare_names(self, object_writer: ObjectWriter) -> None:
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import logging
 import os
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
@@ -16,14 +17,12 @@ from a816.object_file import ObjectFile
 from a816.parse.mzparser import A816Parser
 from a816.parse.nodes import (
     AllocNode,
-    BinaryNode,
-    LabelNode,
     LinkedModuleNode,
-    SymbolNode,
 )
 from a816.program.assemble import AssembleMixin
 from a816.program.debug import DebugMixin
 from a816.program.emit import EmitMixin
+from a816.program.fixpoint import ResolveStats, resolve_to_fixpoint
 from a816.program.link import LinkMixin
 from a816.program.object_emit import ObjectEmitMixin
 from a816.protocols import NodeProtocol
@@ -80,6 +79,8 @@ class Program(EmitMixin, ObjectEmitMixin, AssembleMixin, DebugMixin, LinkMixin):
         self._program_nodes: list[NodeProtocol] = []
         # (snes_logical, physical, size, src) appended when A816_EMIT_TRACE=1.
         self._emit_trace: list[tuple[int, int, int, str]] = []
+        # Pass and node-evaluation counts of the last `resolve_labels`.
+        self.resolve_stats: ResolveStats | None = None
 
     def add_module_path(self, path: str | Path) -> None:
         """Add a directory to the module search path for .import directives.
@@ -166,36 +167,20 @@ class Program(EmitMixin, ObjectEmitMixin, AssembleMixin, DebugMixin, LinkMixin):
                 Program._collect_linked_modules(node.body, out)
 
     def resolve_labels(self, program_nodes: list[NodeProtocol]) -> None:
-        """Resolve all labels and symbols through multi-pass processing.
+        """Resolve all labels and symbols, repeating passes until they settle.
 
-        Performs two passes over the program nodes:
-        1. First pass: Process symbol definitions and forward references
-        2. Second pass: Process label definitions with known addresses
+        The first pass binds labels with forward symbols left out, then
+        the pool allocator places `.alloc` blocks. Later passes
+        re-evaluate only the nodes whose PC or referenced symbols moved,
+        until a pass changes nothing (see `a816.program.fixpoint`).
 
         Args:
             program_nodes: List of executable nodes from parsing.
-        """
-        self.resolver.last_used_scope = 0
-
-        previous_pc = self.resolver.reloc_address
-
-        for node in program_nodes:
-            if isinstance(node, SymbolNode):
-                continue
-            previous_pc = node.pc_after(previous_pc)
 
-        # Run the freespace allocator between passes so .alloc / .relocate
-        # blocks see their final addresses when binding labels in pass 2.
-        self.resolver.allocate_pools()
-
-        self.resolver_reset()
-
-        previous_pc = self.resolver.reloc_address
-        for node in program_nodes:
-            if isinstance(node, LabelNode) or isinstance(node, BinaryNode):
-                continue
-            previous_pc = node.pc_after(previous_pc)
-        self.resolver_reset()
+        Raises:
+            NodeError: symbol values oscillate or never settle (E0203).
+        """
+        self.resolve_stats = resolve_to_fixpoint(program_nodes, self.resolver, self.resolver_reset)
 
     def _to_physical(self, logical_address: int) -> int:
         """Translate a logical SNES bus address to its physical ROM offset.
@@ -209,17 +194,20 @@ class Program(EmitMixin, ObjectEmitMixin, AssembleMixin, DebugMixin, LinkMixin):
         caller would have written the logical address pre-multi-section
         anyway, so the fallback preserves existing behavior.
         """
-        from a816.exceptions import UnmappedBankError
+        return self._to_physical_all([logical_address])[0]
 
+    def _to_physical_all(self, logical_addresses: Iterable[int]) -> list[int]:
+        """`_to_physical` of every address, through one bulk bus conversion."""
+        logical_addresses = list(logical_addresses)
         try:
             bus = self.resolver.get_bus()
-            addr = bus.get_address(logical_address)
-            physical = addr.physical
-        except (KeyError, UnmappedBankError):
-            return logical_address
-        if physical is None:
-            return logical_address
-        return physical
+        except KeyError:
+            return logical_addresses
+        physicals = bus.physical_addresses(logical_addresses)
+        return [
+            logical if physical is None else physical
+            for logical, physical in zip(logical_addresses, physicals, strict=True)
+        ]
 
     @staticmethod
     def _emit_trace_enabled() -> bool:
@@ -244,11 +232,10 @@ class Program(EmitMixin, ObjectEmitMixin, AssembleMixin, DebugMixin, LinkMixin):
         if not self._emit_trace_enabled():
             return
         files = getattr(linked_obj, "files", []) or []
-        for section in linked_obj.sections:
-            if not section.code:
-                continue
+        sections = [section for section in linked_obj.sections if section.code]
+        physicals = self._to_physical_all(section.placed_base for section in sections)
+        for section, phys in zip(sections, physicals, strict=True):
             snes = section.placed_base
-            phys = self._to_physical(snes)
             size = len(section.code)
             if section.lines:
                 _, file_idx, line, *_rest = section.lines[0]
@@ -21,6 +21,8 @@ from a816.protocols import NodeProtocol
 from a816.writers import Writer
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from a816.symbols import Resolver
 
 logger = logging.getLogger("a816")
@@ -33,6 +35,7 @@ class EmitMixin:
         resolver: Resolver
 
         def _to_physical(self, logical_address: int) -> int: ...
+        def _to_physical_all(self, logical_addresses: Iterable[int]) -> list[int]: ...
         def _trace_block(self, snes: int, phys: int, size: int, src: str = ...) -> None: ...
         def _record_debug_line(self, node: NodeProtocol, address: int) -> None: ...
 
@@ -81,9 +84,10 @@ class EmitMixin:
             return
         self._flush_pending(writer, state)
         blocks = node.emit_blocks(self.resolver.reloc_address)
-        for base, block in blocks:
-            if block:
-                writer.write_block(block, self._to_physical(base))
+        written = [(base, block) for base, block in blocks if block]
+        physicals = self._to_physical_all(base for base, _ in written)
+        for (_, block), physical in zip(written, physicals, strict=True):
+            writer.write_block(block, physical)
         # Only relocatable modules consume linear PC at the import site;
         # pinned sections land at their declared `*=` and the importer's
         # PC stays where it was.
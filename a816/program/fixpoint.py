@@ -0,0 +1,227 @@
+"""Worklist label resolution: resolve passes repeat until symbols settle.
+
+Every pass walks the program to thread the PC, but a node is only
+re-evaluated when something it reads moved since it last ran: its
+input PC, the register sizes, its scope, or one of the symbols its
+expressions name. Other nodes replay their recorded result. Passes
+stop once a pass changes no symbol. A symbol state seen before means
+the layout oscillates, and after `MAX_PASSES` resolution gives up; both
+raise `NodeError` (E0203) naming the symbols still moving.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from a816.cpu.mapping import Address
+from a816.error_codes import E_SYMBOL_UNSTABLE
+from a816.parse.ast.expression import expression_names
+from a816.parse.ast.nodes import ExpressionAstNode
+from a816.parse.nodes import (
+    BinaryNode,
+    ByteNode,
+    DataArrayNode,
+    DataLoopNode,
+    ExpressionNode,
+    LabelDeclNode,
+    LabelNode,
+    LongNode,
+    NodeError,
+    OpcodeNode,
+    RegisterSizeNode,
+    ReserveNode,
+    SymbolNode,
+    WordNode,
+)
+from a816.protocols import NodeProtocol, ValueNodeProtocol
+from a816.symbols import Resolver, Scope
+
+logger = logging.getLogger("a816.resolve")
+
+MAX_PASSES = 16
+
+_Bindings = list[tuple[dict[str, int | str], dict[str, str]]]
+
+
+@dataclass
+class ResolveStats:
+    """What `resolve_to_fixpoint` did, kept on `Program.resolve_stats`."""
+
+    passes: int = 0
+    # `pc_after` calls per pass; the first pass evaluates every node.
+    evaluated: list[int] = field(default_factory=list)
+    # Node visits answered from the previous pass's record.
+    skipped: int = 0
+    # Operand sizes measured per pass, opcode length memo hits excluded.
+    measured: list[int] = field(default_factory=list)
+
+    @property
+    def revisited(self) -> int:
+        """Nodes evaluated again after the first pass."""
+        return sum(self.evaluated[1:])
+
+
+@dataclass
+class _Visit:
+    pc_in: int
+    a_size: int
+    i_size: int
+    scope: Scope
+    pc_out: Address
+    a_size_out: int
+    i_size_out: int
+
+
+def _value_names(value_node: ValueNodeProtocol | None) -> frozenset[str]:
+    if isinstance(value_node, ExpressionNode):
+        return expression_names(value_node.expression)
+    return frozenset()
+
+
+def _dependencies(node: NodeProtocol) -> frozenset[str] | None:
+    """Symbols `node.pc_after` reads, or None when it must always run.
+
+    Only nodes whose `pc_after` is a function of the input PC, the
+    register sizes, the current scope and these symbols qualify; scope,
+    position, alloc and module nodes mutate resolver state and always run.
+    """
+    if isinstance(node, OpcodeNode):
+        return _value_names(node.value_node) | _value_names(node.value_node2)
+    if isinstance(
+        node, ByteNode | WordNode | LongNode | DataArrayNode | DataLoopNode | LabelNode | BinaryNode | RegisterSizeNode
+    ):
+        return frozenset()
+    if isinstance(node, ReserveNode):
+        return _value_names(node.size_node)
+    if isinstance(node, SymbolNode | LabelDeclNode) and isinstance(node.expression, ExpressionAstNode):
+        return expression_names(node.expression)
+    return None
+
+
+def _bindings(resolver: Resolver) -> _Bindings:
+    return [(dict(scope.symbols), dict(scope.external_aliases)) for scope in resolver.scopes]
+
+
+def _changed_names(before: _Bindings, after: _Bindings) -> set[str]:
+    changed: set[str] = set()
+    for (symbols_before, aliases_before), (symbols_after, aliases_after) in zip(before, after, strict=True):
+        for old, new in ((symbols_before, symbols_after), (aliases_before, aliases_after)):
+            if old != new:
+                changed.update(name for name in old.keys() | new.keys() if old.get(name) != new.get(name))
+    return changed
+
+
+def _fingerprint(bindings: _Bindings) -> int:
+    return hash(tuple((frozenset(symbols.items()), frozenset(aliases.items())) for symbols, aliases in bindings))
+
+
+class _Worklist:
+    def __init__(self, program_nodes: list[NodeProtocol], resolver: Resolver) -> None:
+        self.nodes = program_nodes
+        self.resolver = resolver
+        self.dependencies = [_dependencies(node) for node in program_nodes]
+        self.visits: list[_Visit | None] = [None] * len(program_nodes)
+        self.stats = ResolveStats()
+
+    def run_pass(self, changed: set[str], skip: Callable[[NodeProtocol], bool]) -> None:
+        resolver = self.resolver
+        pc = resolver.reloc_address
+        evaluated = 0
+        measurements = resolver.size_measurements
+        for index, node in enumerate(self.nodes):
+            if skip(node):
+                continue
+            dependencies = self.dependencies[index]
+            visit = self.visits[index]
+            if (
+                visit is not None
+                and dependencies is not None
+                and visit.pc_in == pc.logical_value
+                and visit.a_size == resolver.a_size
+                and visit.i_size == resolver.i_size
+                and visit.scope is resolver.current_scope
+                and changed.isdisjoint(dependencies)
+            ):
+                pc = visit.pc_out
+                resolver.a_size = visit.a_size_out
+                resolver.i_size = visit.i_size_out
+                self.stats.skipped += 1
+                continue
+            pc_in, a_size, i_size, scope = pc.logical_value, resolver.a_size, resolver.i_size, resolver.current_scope
+            pc = node.pc_after(pc)
+            evaluated += 1
+            if dependencies is not None:
+                self.visits[index] = _Visit(pc_in, a_size, i_size, scope, pc, resolver.a_size, resolver.i_size)
+        self.stats.passes += 1
+        self.stats.evaluated.append(evaluated)
+        self.stats.measured.append(resolver.size_measurements - measurements)
+
+    def unstable(self, changed: set[str], reason: str) -> NodeError:
+        names = ", ".join(sorted(changed)[:10])
+        more = f" (+{len(changed) - 10} more)" if len(changed) > 10 else ""
+        anchor = next(
+            (
+                node
+                for node, dependencies in zip(self.nodes, self.dependencies, strict=True)
+                if dependencies is not None and not changed.isdisjoint(dependencies) and hasattr(node, "file_info")
+            ),
+            None,
+        )
+        return NodeError(
+            f"Symbol values {reason} after {self.stats.passes} resolve passes: {names}{more}",
+            getattr(anchor, "file_info", None),  # type: ignore[arg-type]
+            code=str(E_SYMBOL_UNSTABLE),
+            hint="An address feeding an operand width that moves that same address cannot settle; "
+            "give the operand an explicit size (`.b`, `.w`, `.l`).",
+        )
+
+
+def resolve_to_fixpoint(
+    program_nodes: list[NodeProtocol],
+    resolver: Resolver,
+    reset: Callable[[], None],
+) -> ResolveStats:
+    """Bind every label and symbol of `program_nodes` to its final value.
+
+    The first pass leaves `SymbolNode`s out, as forward references are
+    not bound yet, and pools are allocated once it is done so later
+    passes see `.alloc` placements. `reset` rewinds PC and scope
+    tracking between passes.
+    """
+    worklist = _Worklist(program_nodes, resolver)
+    resolver.last_used_scope = 0
+    before = _bindings(resolver)
+    worklist.run_pass(set(), lambda node: isinstance(node, SymbolNode))
+    resolver.allocate_pools()
+    reset()
+    after = _bindings(resolver)
+    changed = _changed_names(before, after)
+    seen = {_fingerprint(after)}
+
+    while True:
+        before = after
+        worklist.run_pass(changed, lambda node: False)
+        reset()
+        after = _bindings(resolver)
+        changed = _changed_names(before, after)
+        if not changed:
+            break
+        fingerprint = _fingerprint(after)
+        if fingerprint in seen:
+            raise worklist.unstable(changed, "oscillate")
+        if worklist.stats.passes >= MAX_PASSES:
+            raise worklist.unstable(changed, "still change")
+        seen.add(fingerprint)
+
+    stats = worklist.stats
+    logger.debug(
+        "Resolved in %d passes: %s node evaluations per pass, %d revisited, %d skipped, %s sizes measured",
+        stats.passes,
+        stats.evaluated,
+        stats.revisited,
+        stats.skipped,
+        stats.measured,
+    )
+    return stats
@@ -11,6 +11,8 @@ from a816.object_file import ObjectFile, SymbolSection, SymbolType
 from a816.writers import IPSWriter, SFCWriter
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from a816.symbols import Resolver
 
 
@@ -21,7 +23,7 @@ class LinkMixin:
         resolver: Resolver
         logger: logging.Logger
 
-        def _to_physical(self, logical_address: int) -> int: ...
+        def _to_physical_all(self, logical_addresses: Iterable[int]) -> list[int]: ...
         def _trace_linked_sections(self, linked_obj: ObjectFile) -> None: ...
         def _flush_emit_trace(self, output_path: Path) -> None: ...
 
@@ -140,9 +142,10 @@ class LinkMixin:
                 ips_emitter = IPSWriter(f, copier_header)
                 ips_emitter.begin()
 
-                for section in linked_obj.sections:
-                    if section.code:
-                        ips_emitter.write_block(section.code, self._to_physical(section.placed_base))
+                sections = [section for section in linked_obj.sections if section.code]
+                physicals = self._to_physical_all(section.placed_base for section in sections)
+                for section, physical in zip(sections, physicals, strict=True):
+                    ips_emitter.write_block(section.code, physical)
 
                 ips_emitter.end()
                 self._trace_linked_sections(linked_obj)
@@ -183,9 +186,10 @@ class LinkMixin:
                 sfc_emitter = SFCWriter(f)
                 sfc_emitter.begin()
 
-                for section in linked_obj.sections:
-                    if section.code:
-                        sfc_emitter.write_block(section.code, self._to_physical(section.placed_base))
+                sections = [section for section in linked_obj.sections if section.code]
+                physicals = self._to_physical_all(section.placed_base for section in sections)
+                for section, physical in zip(sections, physicals, strict=True):
+                    sfc_emitter.write_block(section.code, physical)
 
                 sfc_emitter.end()
                 self._trace_linked_sections(linked_obj)
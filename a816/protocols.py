@@ -17,6 +17,8 @@ if TYPE_CHECKING:  # pragma: nocover
 class ValueNodeProtocol(Protocol):
     """Protocol for nodes that represent values (numbers, expressions)."""
 
+    __slots__ = ()
+
     def get_value(self) -> int:
         """Returns the value of the node as an int."""
 
@@ -31,22 +33,23 @@ class ValueNodeProtocol(Protocol):
         - 3-4 hex digits: word ('w')
         - 5+ hex digits: long ('l')
         """
-        retval: Literal["b", "w", "l"]
+        return operand_size_for_length(self.get_value_string_len())
 
-        value_length = self.get_value_string_len()
-        if value_length <= 2:
-            retval = "b"
-        elif value_length <= 4:
-            retval = "w"
-        else:
-            retval = "l"
 
-        return retval
+def operand_size_for_length(value_length: int) -> Literal["b", "w", "l"]:
+    """Operand size of a value spelled with `value_length` hex digits."""
+    if value_length <= 2:
+        return "b"
+    if value_length <= 4:
+        return "w"
+    return "l"
 
 
 class NodeProtocol(Protocol):
     """Protocol for executable nodes in the assembly output."""
 
+    __slots__ = ()
+
     def emit(self, current_addr: Address) -> bytes:
         """Emits the node as bytes."""
 
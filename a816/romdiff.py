@@ -0,0 +1,303 @@
+"""ROM diffing: build an IPS or BPS patch from two ROM images.
+
+Backs `xdds diff base.sfc target.sfc -o out.ips|out.bps`. Both images are
+memory-mapped and compared in `CHUNK_SIZE` windows: identical windows are
+skipped with a single `bytes.__eq__` (memcmp), differing windows are XOR-ed
+as big integers and the non-zero byte runs are picked out with a compiled
+regex, so the per-byte work stays in C.
+
+Record selection is size-driven:
+
+  - IPS: a small dynamic program over the diff runs decides, for every
+    identical gap, whether to bridge it inside the current record or to
+    start a new one, and for every repeated-byte span whether an RLE
+    record is cheaper than literal bytes.
+  - BPS: identical stretches become `SourceRead`, differing bytes
+    `TargetRead`, and long repeats a distance-1 `TargetCopy`.
+"""
+
+import re
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO, Literal
+
+from a816.util import MappedBytes, map_file
+
+CHUNK_SIZE = 1 << 16
+
+IPS_HEADER = b"PATCH"
+IPS_FOOTER = b"EOF"
+# A record whose offset encodes as b"EOF" would be read back as the footer.
+IPS_EOF_OFFSET = 0x454F46
+IPS_MAX_OFFSET = 0xFFFFFF
+IPS_MAX_RECORD = 0xFFFF
+_IPS_RECORD_HEADER = 5  # 3 bytes offset + 2 bytes size
+_IPS_RLE_RECORD = 8  # header + 2 bytes count + 1 byte value
+
+BPS_HEADER = b"BPS1"
+_BPS_SOURCE_READ = 0
+_BPS_TARGET_READ = 1
+_BPS_TARGET_COPY = 3
+# Shortest repeat worth a TargetCopy: one action + one offset varint plus
+# the TargetRead header needed to resume literals afterwards.
+_BPS_MIN_REPEAT = 8
+
+PatchFormat = Literal["ips", "bps"]
+
+_NON_ZERO = re.compile(rb"[^\x00]+")
+_REPEAT = re.compile(rb"(.)\1{3,}", re.DOTALL)
+
+
+def diff_runs(base: MappedBytes, target: MappedBytes, chunk_size: int = CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Return the sorted `[start, end)` ranges where `target` differs from `base`.
+
+    Bytes of `target` past the end of `base` always count as different.
+    Runs that straddle a chunk boundary are merged back together.
+    """
+    runs: list[tuple[int, int]] = []
+
+    def add(start: int, end: int) -> None:
+        if runs and runs[-1][1] == start:
+            runs[-1] = (runs[-1][0], end)
+        else:
+            runs.append((start, end))
+
+    common = min(len(base), len(target))
+    for offset in range(0, common, chunk_size):
+        end = min(offset + chunk_size, common)
+        a = base[offset:end]
+        b = target[offset:end]
+        if a == b:
+            continue
+        xored = (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(end - offset, "little")
+        for match in _NON_ZERO.finditer(xored):
+            add(offset + match.start(), offset + match.end())
+    if len(target) > common:
+        add(common, len(target))
+    return runs
+
+
+def _repeat_spans(target: MappedBytes, start: int, end: int, min_length: int) -> Iterator[tuple[int, int]]:
+    """Yield `[start, end)` spans of at least `min_length` identical bytes."""
+    for match in _REPEAT.finditer(target[start:end]):
+        if match.end() - match.start() >= min_length:
+            yield start + match.start(), start + match.end()
+
+
+# -- IPS ---------------------------------------------------------------------
+
+_GAP, _LITERAL, _REPEATED = 0, 1, 2
+_INF = float("inf")
+
+
+def _ips_tokens(target: MappedBytes, runs: list[tuple[int, int]]) -> list[tuple[int, int, int]]:
+    """Split diff runs into gap / literal / repeated tokens for `_plan_ips`."""
+    tokens: list[tuple[int, int, int]] = []
+    previous_end: int | None = None
+    for start, end in runs:
+        if previous_end is not None:
+            tokens.append((_GAP, previous_end, start))
+        cursor = start
+        for rep_start, rep_end in _repeat_spans(target, start, end, 4):
+            if rep_start > cursor:
+                tokens.append((_LITERAL, cursor, rep_start))
+            tokens.append((_REPEATED, rep_start, rep_end))
+            cursor = rep_end
+        if cursor < end:
+            tokens.append((_LITERAL, cursor, end))
+        previous_end = end
+    return tokens
+
+
+def _rle_cost(length: int) -> int:
+    return _IPS_RLE_RECORD * -(-length // IPS_MAX_RECORD)
+
+
+def _plan_ips(tokens: list[tuple[int, int, int]]) -> list[tuple[bool, int, int]]:
+    """Pick the smallest record layout covering every non-gap token.
+
+    Two running costs are tracked: `closed` (no record open, the next
+    literal needs a fresh header) and `open_` (a literal record can be
+    extended for free). Returns `(is_rle, start, end)` records.
+    """
+    closed: float = 0
+    open_: float = _INF
+    # Per token: how `open_` was reached ("open"/"extend"/None) and how
+    # `closed` was reached ("literal"/"skip_closed"/"skip_open"/"rle_closed"/"rle_open").
+    trail: list[tuple[str | None, str]] = []
+    for kind, start, end in tokens:
+        length = end - start
+        if kind == _GAP:
+            # Bridging costs the gap bytes; a fresh header costs 5, so a
+            # gap longer than that is never worth bridging.
+            new_open = open_ + length if length <= _IPS_RECORD_HEADER else _INF
+            how_open: str | None = "extend" if new_open < _INF else None
+            new_closed, how_closed = (closed, "skip_closed") if closed <= open_ else (open_, "skip_open")
+        else:
+            if open_ <= closed + _IPS_RECORD_HEADER:
+                new_open, how_open = open_ + length, "extend"
+            else:
+                new_open, how_open = closed + _IPS_RECORD_HEADER + length, "open"
+            new_closed, how_closed = new_open, "literal"
+            if kind == _REPEATED:
+                rle = _rle_cost(length)
+                if closed + rle < new_closed:
+                    new_closed, how_closed = closed + rle, "rle_closed"
+                if open_ + rle < new_closed:
+                    new_closed, how_closed = open_ + rle, "rle_open"
+        trail.append((how_open, how_closed))
+        open_, closed = new_open, new_closed
+
+    # Backtrack from the closed state after the last token.
+    actions: list[str] = []
+    state = "closed"
+    for how_open, how_closed in reversed(trail):
+        if state == "closed" and how_closed != "literal":
+            actions.append("rle" if how_closed.startswith("rle") else "skip")
+            state = "open" if how_closed.endswith("open") else "closed"
+            continue
+        assert how_open is not None
+        actions.append(how_open)
+        state = "open" if how_open == "extend" else "closed"
+    actions.reverse()
+
+    records: list[tuple[bool, int, int]] = []
+    literal: list[int] | None = None
+    for (_kind, start, end), action in zip(tokens, actions, strict=True):
+        if action == "extend" and literal is not None:
+            literal[1] = end
+            continue
+        if literal is not None:
+            records.append((False, literal[0], literal[1]))
+            literal = None
+        if action == "open":
+            literal = [start, end]
+        elif action == "rle":
+            records.append((True, start, end))
+    if literal is not None:
+        records.append((False, literal[0], literal[1]))
+    return records
+
+
+def _ips_offset(offset: int) -> bytes:
+    if offset > IPS_MAX_OFFSET:
+        raise ValueError(f"IPS cannot address offset 0x{offset:X} (max 0x{IPS_MAX_OFFSET:X}); use a .bps output")
+    return offset.to_bytes(3, "big")
+
+
+def _write_ips_literal(out: BinaryIO, target: MappedBytes, start: int, end: int) -> None:
+    while start < end:
+        if start == IPS_EOF_OFFSET:
+            start -= 1  # re-emit the (unchanged) previous byte to dodge the footer marker
+        size = min(IPS_MAX_RECORD, end - start)
+        out.write(_ips_offset(start) + size.to_bytes(2, "big"))
+        out.write(target[start : start + size])
+        start += size
+
+
+def _write_ips_rle(out: BinaryIO, target: MappedBytes, start: int, end: int) -> None:
+    if start == IPS_EOF_OFFSET:
+        _write_ips_literal(out, target, start, min(start + 1, end))
+        start += 1
+    while start < end:
+        size = min(IPS_MAX_RECORD, end - start)
+        out.write(_ips_offset(start) + b"\x00\x00" + size.to_bytes(2, "big") + target[start : start + 1])
+        start += size
+
+
+def write_ips(out: BinaryIO, base: MappedBytes, target: MappedBytes) -> None:
+    """Write an IPS patch turning `base` into `target` to `out`.
+
+    A target shorter than the base gets the common truncation extension
+    (3-byte big-endian size after the footer).
+    """
+    out.write(IPS_HEADER)
+    for is_rle, start, end in _plan_ips(_ips_tokens(target, diff_runs(base, target))):
+        if is_rle:
+            _write_ips_rle(out, target, start, end)
+        else:
+            _write_ips_literal(out, target, start, end)
+    out.write(IPS_FOOTER)
+    if len(target) < len(base):
+        out.write(_ips_offset(len(target)))
+
+
+# -- BPS ---------------------------------------------------------------------
+
+
+def _bps_number(value: int) -> bytes:
+    """Encode `value` with the BPS variable-length integer scheme."""
+    out = bytearray()
+    while True:
+        low = value & 0x7F
+        value >>= 7
+        if value == 0:
+            out.append(0x80 | low)
+            return bytes(out)
+        out.append(low)
+        value -= 1
+
+
+def _bps_action(command: int, length: int) -> bytes:
+    return _bps_number(((length - 1) << 2) | command)
+
+
+def _bps_diff_runs(runs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Bridge one-byte gaps: a literal byte is cheaper than two action headers."""
+    merged: list[tuple[int, int]] = []
+    for start, end in runs:
+        if merged and start - merged[-1][1] <= 1:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def write_bps(out: BinaryIO, base: MappedBytes, target: MappedBytes) -> None:
+    """Write a BPS patch turning `base` into `target` to `out`."""
+    body = bytearray(BPS_HEADER)
+    body += _bps_number(len(base)) + _bps_number(len(target)) + _bps_number(0)
+    output_offset = 0
+    target_relative = 0
+
+    def target_read(start: int, end: int) -> None:
+        if end > start:
+            body.extend(_bps_action(_BPS_TARGET_READ, end - start))
+            body.extend(target[start:end])
+
+    for start, end in _bps_diff_runs(diff_runs(base, target)):
+        if start > output_offset:
+            body.extend(_bps_action(_BPS_SOURCE_READ, start - output_offset))
+        cursor = start
+        for rep_start, rep_end in _repeat_spans(target, start, end, _BPS_MIN_REPEAT):
+            # Emit the first byte of the repeat literally, then replay it.
+            target_read(cursor, rep_start + 1)
+            delta = rep_start - target_relative
+            body.extend(_bps_action(_BPS_TARGET_COPY, rep_end - rep_start - 1))
+            body.extend(_bps_number((abs(delta) << 1) | (delta < 0)))
+            target_relative = rep_end - 1
+            cursor = rep_end
+        target_read(cursor, end)
+        output_offset = end
+    if output_offset < len(target):
+        body.extend(_bps_action(_BPS_SOURCE_READ, len(target) - output_offset))
+
+    body += zlib.crc32(base).to_bytes(4, "little")
+    body += zlib.crc32(target).to_bytes(4, "little")
+    body += zlib.crc32(body).to_bytes(4, "little")
+    out.write(body)
+
+
+def patch_format_for(path: Path) -> PatchFormat:
+    """Infer the patch format from the output suffix (`.bps` or IPS)."""
+    return "bps" if path.suffix.lower() == ".bps" else "ips"
+
+
+def diff_files(base_path: Path, target_path: Path, output_path: Path, patch_format: PatchFormat | None = None) -> int:
+    """Diff two ROM files into `output_path`. Returns the patch size in bytes."""
+    patch_format = patch_format or patch_format_for(output_path)
+    writer = write_bps if patch_format == "bps" else write_ips
+    with map_file(base_path) as base, map_file(target_path) as target, open(output_path, "wb") as out:
+        writer(out, base, target)
+        return out.tell()
@@ -1,13 +1,15 @@
 import logging
 from collections.abc import ItemsView
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
 
 from a816.context import AssemblyContext
 from a816.cpu.mapping import Address, Bus
 from a816.cpu.types import RomType
 from a816.exceptions import ExternalSymbolReference, SymbolNotDefined
-from a816.parse.ast.nodes import BlockAstNode
+from a816.parse.ast.nodes import BlockAstNode, ExpressionAstNode
 from a816.pool import Pool
+from a816.protocols import operand_size_for_length
 from script import Table
 
 
@@ -71,6 +73,114 @@ def _publish_named_dotted(scope: "NamedScope", parent: "Scope") -> None:
 
 logger = logging.getLogger("a816")
 
+_V = TypeVar("_V")
+
+
+_UNBOUND = object()
+_UNDEFINED = object()
+
+
+def _same_width(old: object, new: object) -> bool:
+    """Whether a bare operand over a symbol rebound from `old` to `new` keeps its width."""
+    if type(old) is int and type(new) is int:
+        return operand_size_for_length(len(hex(old)) - 2) == operand_size_for_length(len(hex(new)) - 2)
+    return old is new
+
+
+class _BindingTable(dict[str, _V]):
+    """Name table of a scope that bumps `Resolver.lookup_generation`
+    whenever a name appears or disappears, so memoized scope lookups
+    start over. Rebinding an existing name keeps them valid: they cache
+    which scope owns a name, not its value.
+
+    Every binding that changes what a name resolves to from this scope
+    also bumps the name's counter in `Resolver.value_generations`, and
+    in `width_generations` unless the operand width stays the same;
+    opcode length memos key on those. Binding a name that did not
+    resolve from here bumps neither: a failed lookup measured nothing.
+    """
+
+    __slots__ = ("_scope",)
+
+    def __init__(self, scope: "Scope") -> None:
+        super().__init__()
+        self._scope = scope
+
+    @property
+    def _resolver(self) -> "Resolver":
+        return self._scope.resolver
+
+    def _bump(self, key: str, width: bool = True) -> None:
+        values = self._resolver.value_generations
+        values[key] = values.get(key, 0) + 1
+        if width:
+            widths = self._resolver.width_generations
+            widths[key] = widths.get(key, 0) + 1
+
+    def _shadowed(self, key: str) -> object:
+        """What `key` resolved to from this scope before being bound here.
+
+        `_UNDEFINED` when it did not resolve, so nothing was computed
+        from it; `_UNBOUND` when that can't be told cheaply.
+        """
+        scope = self._scope
+        if key in scope.symbols or key in scope.code_symbols or key in scope.external_aliases:
+            return _UNBOUND
+        try:
+            if scope.parent is not None:
+                return scope.parent.value_for(key)
+        except (SymbolNotDefined, ExternalSymbolReference):
+            pass
+        return _UNBOUND if scope.is_external_symbol(key) else _UNDEFINED
+
+    def __setitem__(self, key: str, value: _V) -> None:
+        old = self.get(key, _UNBOUND)
+        if old is _UNBOUND:
+            old = self._shadowed(key)
+            self._resolver.lookup_generation += 1
+        if old is _UNDEFINED:
+            pass
+        elif old is _UNBOUND:
+            self._bump(key)
+        elif old is not value and (type(old) is not type(value) or type(old) not in (int, str) or old != value):
+            self._bump(key, width=not _same_width(old, value))
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._resolver.lookup_generation += 1
+        self._bump(key)
+
+    def __ior__(self, other: Any) -> "_BindingTable[_V]":  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            return super().pop(key, *default)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> tuple[str, _V]:
+        key, value = super().popitem()
+        self._resolver.lookup_generation += 1
+        self._bump(key)
+        return key, value
+
+    def clear(self) -> None:
+        for key in list(self):
+            del self[key]
+
 
 class Scope:
     """A symbol scope for managing labels, symbols, and tables.
@@ -83,6 +193,8 @@ class Scope:
     - External symbol declarations
 
     Symbol lookup traverses up the parent chain until found or root is reached.
+    The scope that answers each name is memoized until a name is added to or
+    removed from any scope of the resolver.
     """
 
     def __init__(self, resolver: "Resolver", parent: "Scope | None" = None) -> None:
@@ -92,13 +204,19 @@ class Scope:
             resolver: The parent Resolver managing this scope.
             parent: Optional parent scope for hierarchical lookup.
         """
-        self.symbols: dict[str, int | str] = {}
-        self.code_symbols: dict[str, BlockAstNode] = {}
+        self.symbols: dict[str, int | str] = _BindingTable(self)
+        self.code_symbols: dict[str, BlockAstNode] = _BindingTable(self)
         self.external_symbols: set[str] = set()
         # Aliased externals: name -> expression string (e.g. "extern_sym + 1").
         # The alias name behaves like an external symbol locally; the linker
         # resolves it once the underlying externs are known.
-        self.external_aliases: dict[str, str] = {}
+        self.external_aliases: dict[str, str] = _BindingTable(self)
+        # Memoized lookups, valid while `_memo_generation` matches the
+        # resolver's `lookup_generation`: the scope `value_for` reads a
+        # name from, and `is_external_symbol` answers.
+        self._owners: dict[str, Scope] = {}
+        self._externals: dict[str, bool] = {}
+        self._memo_generation = -1
         self.parent = parent
         self.resolver: Resolver = resolver
         self.table: Table | None = None
@@ -128,6 +246,7 @@ class Scope:
         + codegen layers catch the user-visible duplicates (struct
         redefinition, etc.), so this is a silent upsert.
         """
+        self.resolver.note_binding(symbol)
         if isinstance(value, BlockAstNode):
             self.code_symbols[symbol] = value
         else:
@@ -135,7 +254,10 @@ class Scope:
 
     def add_external_symbol(self, symbol: str) -> None:
         """Mark a symbol as external (defined in another object file)"""
-        self.external_symbols.add(symbol)
+        if symbol not in self.external_symbols:
+            self.resolver.lookup_generation += 1
+            self.resolver.extern_generation += 1
+            self.external_symbols.add(symbol)
 
     def add_external_alias(self, symbol: str, expression_str: str) -> None:
         """Register an alias whose value is a deferred expression over externs.
@@ -144,7 +266,8 @@ class Scope:
         emit deferred relocations. The linker resolves the alias by
         evaluating ``expression_str`` against the final symbol map.
         """
-        self.external_symbols.add(symbol)
+        self.resolver.note_binding(symbol)
+        self.add_external_symbol(symbol)
         self.external_aliases[symbol] = expression_str
 
     def lookup_alias(self, symbol: str) -> str | None:
@@ -176,16 +299,27 @@ class Scope:
         the dotted prefix per `Resolver._export_name`). Avoids forcing
         consumers to `.extern Foo.x` per member.
         """
-        if symbol in self.external_symbols:
-            return True
-        if "." in symbol:
-            head = symbol.split(".", 1)[0]
-            if head in self.external_symbols:
+        if self._memo_generation != self.resolver.lookup_generation:
+            self._reset_memo()
+        external = self._externals.get(symbol)
+        if external is None:
+            external = self._externals[symbol] = self._find_external(symbol)
+        return external
+
+    def _find_external(self, symbol: str) -> bool:
+        head = symbol.split(".", 1)[0] if "." in symbol else None
+        scope: Scope | None = self
+        while scope is not None:
+            if symbol in scope.external_symbols or head in scope.external_symbols:
                 return True
-        if self.parent:
-            return self.parent.is_external_symbol(symbol)
+            scope = scope.parent
         return False
 
+    def _reset_memo(self) -> None:
+        self._owners.clear()
+        self._externals.clear()
+        self._memo_generation = self.resolver.lookup_generation
+
     def __getitem__(self, item: str) -> int | str | BlockAstNode:
         try:
             return self.code_symbols[item]
@@ -211,22 +345,40 @@ class Scope:
             return self.table
 
     def value_for(self, symbol: str) -> int | str | BlockAstNode | None:
-        if self.parent:
-            if symbol in self.symbols or symbol in self.code_symbols:
-                return self[symbol]
+        if self._memo_generation != self.resolver.lookup_generation:
+            self._reset_memo()
+        owner = self._owners.get(symbol)
+        if owner is None:
+            owner = self._owners[symbol] = self._find_owner(symbol)
+        return owner[symbol]
+
+    def _find_owner(self, symbol: str) -> "Scope":
+        """Innermost scope binding `symbol`, or the root scope when none does."""
+        scope = self
+        while scope.parent is not None:
             # External alias declared at this level (e.g. macro arg bound to
             # an extern expression) needs to be visible here so eval can defer.
-            if symbol in self.external_aliases:
-                return self[symbol]
-            return self.parent.value_for(symbol)
-        else:
-            return self[symbol]
+            if symbol in scope.symbols or symbol in scope.code_symbols or symbol in scope.external_aliases:
+                return scope
+            scope = scope.parent
+        return scope
 
 
 class InternalScope(Scope):
     pass
 
 
+@dataclass
+class FoldingConstant:
+    """A name bound at codegen, as tracked by `Resolver.register_constant`."""
+
+    # None once the name has been given two different values.
+    value: int | None
+    sites: int = 0
+    # (right-hand side, defining scope) of each `NAME = expr` definition.
+    sources: list[tuple[ExpressionAstNode, Scope]] = field(default_factory=list)
+
+
 class AllocBodyScope(Scope):
     """Scope spanning an `.alloc` body. Isolates underscore-private
     labels from sibling allocs in the same module without forcing the
@@ -263,6 +415,30 @@ high_rom_bus.editable = False
 BUS_MAPPING = {RomType.low_rom: low_rom_bus, RomType.high_rom: high_rom_bus}
 
 
+class RootSymbolIndex:
+    """Answers :meth:`Resolver.is_root_scope_symbol` for every symbol of an export.
+
+    Root names are plain dict lookups; the NamedScope members are indexed
+    on the first miss, so classifying is linear instead of one scan of
+    every scope per symbol.
+    """
+
+    def __init__(self, resolver: "Resolver") -> None:
+        self.resolver = resolver
+        self.root = resolver.scopes[0] if resolver.scopes else None
+        self._named_members: set[str] | None = None
+
+    def __contains__(self, name: str) -> bool:
+        root = self.root
+        if root is None:
+            return False
+        if name in root.symbols or name in root.code_symbols or name in root.labels:
+            return True
+        if self._named_members is None:
+            self._named_members = self.resolver.named_scope_member_names()
+        return name in self._named_members
+
+
 class Resolver:
     """Symbol resolver managing scopes, addresses, and CPU state during assembly.
 
@@ -315,8 +491,24 @@ class Resolver:
         self.rom_type = RomType.low_rom
         self.current_scope_index = 0
         self.last_used_scope = 0
+        # Bumped whenever a name is added to or removed from any scope;
+        # invalidates every scope's memoized lookups.
+        self.lookup_generation = 0
+        # Per-name counters bumped when a binding comes, goes or changes
+        # value, and when it comes, goes or changes operand width (8, 16
+        # or 24-bit). `.extern` can turn any dotted name external, so it
+        # bumps `extern_generation` instead. `OpcodeNode` measures its
+        # length again only once a counter it reads moved.
+        self.value_generations: dict[str, int] = {}
+        self.width_generations: dict[str, int] = {}
+        self.extern_generation = 0
+        # Operand lengths `OpcodeNode.pc_after` measured rather than
+        # reused. Sampled per pass by `ResolveStats`.
+        self.size_measurements = 0
         self.current_scope: Scope = Scope(self)
         self.scopes = [self.current_scope]
+        # Position of each scope in `scopes`, the `__sc<idx>__` mangle index.
+        self.scope_ordinals: dict[Scope, int] = {self.current_scope: 0}
         self.bus = Bus()
         self.pc = 0
         self.reloc_address: Address
@@ -367,8 +559,49 @@ class Resolver:
         # rebuild re-stats them: editing an asset must invalidate the
         # cached object the same way editing the `.s` does.
         self.dependency_files: set[str] = set()
+        # Constant-folding bookkeeping, consumed once by `fold_constants`
+        # after codegen. `binding_counts` counts every site that binds a
+        # name (eager `add_symbol`s plus nodes that bind at resolve time);
+        # `folding_constants` holds names whose value is fixed at codegen,
+        # and `folding_sites` the (node, scope) pairs whose `expression`
+        # may be folded.
+        self.binding_counts: dict[str, int] = {}
+        self.folding_constants: dict[str, FoldingConstant] = {}
+        self.folding_sites: list[tuple[Any, Scope]] = []
         self.set_position(pc)
 
+    def note_binding(self, name: str) -> None:
+        """Record one more site that binds `name`."""
+        self.binding_counts[name] = self.binding_counts.get(name, 0) + 1
+
+    def register_constant(
+        self,
+        name: str,
+        value: int,
+        sites: int,
+        expression: ExpressionAstNode | None = None,
+    ) -> None:
+        """Record that `name` was bound to `value` in the current scope.
+
+        `sites` is how many `note_binding` calls this definition accounts
+        for. `expression` is the right-hand side of a `NAME = expr`
+        definition, which is re-evaluated on every resolve pass: the value
+        only stays fixed when its operands do. A name defined several
+        times with different values is never folded.
+        """
+        constant = self.folding_constants.get(name)
+        if constant is None:
+            constant = self.folding_constants[name] = FoldingConstant(value)
+        elif constant.value != value:
+            constant.value = None
+        constant.sites += sites
+        if expression is not None:
+            constant.sources.append((expression, self.current_scope))
+
+    def note_folding_site(self, node: Any) -> None:
+        """Queue `node.expression` for folding in the current scope."""
+        self.folding_sites.append((node, self.current_scope))
+
     def allocate_pools(self) -> None:
         """Run the allocator on every declared pool.
 
@@ -407,21 +640,24 @@ class Resolver:
         self.reloc_address = addr + 0
         self.reloc = False
 
-    def append_named_scope(self, name: str) -> None:
-        scope = NamedScope(name, self, self.current_scope)
+    def _append_scope(self, scope: "Scope") -> None:
+        self.scope_ordinals[scope] = len(self.scopes)
         self.scopes.append(scope)
 
+    def append_named_scope(self, name: str) -> None:
+        # Members publish as `name.member` on every pass; counting the scope
+        # name keeps another binding's dotted names from being folded.
+        self.note_binding(name)
+        self._append_scope(NamedScope(name, self, self.current_scope))
+
     def append_scope(self) -> None:
-        scope = Scope(self, self.current_scope)
-        self.scopes.append(scope)
+        self._append_scope(Scope(self, self.current_scope))
 
     def append_alloc_body_scope(self) -> None:
-        scope = AllocBodyScope(self, self.current_scope)
-        self.scopes.append(scope)
+        self._append_scope(AllocBodyScope(self, self.current_scope))
 
     def append_internal_scope(self) -> None:
-        scope = InternalScope(self, self.current_scope)
-        self.scopes.append(scope)
+        self._append_scope(InternalScope(self, self.current_scope))
 
     def use_next_scope(self) -> None:
         self.last_used_scope += 1
@@ -545,7 +781,7 @@ class Resolver:
         # while the definition exports `__sc0__name`.
         if owner is None or (owner is self.scopes[0] and not isinstance(owner, AllocBodyScope)):
             return name
-        return self._export_name(name, owner, self.scopes.index(owner), mangle_nested=True)
+        return self._export_name(name, owner, self.scope_ordinals[owner], mangle_nested=True)
 
     @staticmethod
     def _mangle(name: str, idx: int, mangle: bool) -> str:
@@ -600,3 +836,24 @@ class Resolver:
                 if qualified in root.symbols or qualified in root.labels:
                     return True
         return False
+
+    def root_symbol_index(self) -> "RootSymbolIndex":
+        """:meth:`is_root_scope_symbol` for many names, without a scope scan each."""
+        return RootSymbolIndex(self)
+
+    def named_scope_member_names(self) -> set[str]:
+        """Members NamedScopes published into the root as ``scope.member``."""
+        if not self.scopes:
+            return set()
+        root = self.scopes[0]
+        prefixes = {scope.name for scope in self.scopes if isinstance(scope, NamedScope)}
+        members: set[str] = set()
+        for table in (root.symbols, root.labels):
+            for qualified in table:
+                head, dot, member = qualified.partition(".")
+                while dot:
+                    if head in prefixes:
+                        members.add(member)
+                    part, dot, member = member.partition(".")
+                    head = f"{head}.{part}"
+        return members
@@ -1,8 +1,16 @@
 """Shared utilities used across multiple a816 subsystems."""
 
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 
+# Read-only byte source: a plain bytes object or a live memory map.
+# Both slice to `bytes` and support `len()`.
+MappedBytes = bytes | mmap.mmap
+
 
 def uri_to_path(uri: str) -> Path:
     """Convert a file:// URI (or a plain path) to a Path."""
@@ -33,3 +41,81 @@ def resolve_asset_path(path: str, include_paths: list[Path]) -> str:
         if hit.exists():
             return str(hit)
     return path
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    """Write `data` to `path` through a temporary file and `os.replace`.
+
+    Readers in other processes see either the previous file or the whole
+    new one, never a partial write. Raises OSError after removing the
+    temporary file.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def map_file(path: Path | str) -> Iterator[MappedBytes]:
+    """Memory-map `path` read-only for the duration of the block.
+
+    Empty files cannot be mapped; they yield `b""` instead so callers do
+    not need a special case.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+
+# Assets smaller than this are read into memory; larger ones are mapped.
+# Each live map holds a file descriptor, so small assets don't get one.
+ASSET_MAP_THRESHOLD = 64 * 1024
+
+# Process-wide asset contents, keyed by absolute path, most recently used
+# last. An entry is reused while the file's mtime, size and inode match
+# the recorded stat. The cache is bounded so that a long-lived process
+# (the LSP, a watch loop) does not keep a map, and its file descriptor,
+# open for every asset it ever included; an evicted map closes once no
+# node holds it.
+_ASSET_ENTRIES = 64
+_assets: dict[str, tuple[tuple[int, int, int], MappedBytes]] = {}
+
+
+def read_asset(path: str) -> MappedBytes:
+    """Contents of the asset file at `path`, shared across the process.
+
+    Every module that includes the same unchanged file gets the same
+    object: large files are memory-mapped once and only the slices a
+    caller takes are copied out. A changed file is read again; maps
+    handed out before stay with their holders, so tools that rewrite an
+    asset in place mid-build should write a new file and rename it.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _assets.pop(key, None)
+    if cached is not None and cached[0] == signature:
+        content = cached[1]
+    else:
+        with open(path, "rb") as f:
+            if stat.st_size < ASSET_MAP_THRESHOLD:
+                content = f.read()
+            else:
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _assets[key] = (signature, content)
+    if len(_assets) > _ASSET_ENTRIES:
+        del _assets[next(iter(_assets))]
+    return content
+
+
+def clear_asset_cache() -> None:
+    """Forget every cached asset (the maps close once no node holds them)."""
+    _assets.clear()
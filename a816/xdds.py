@@ -8,19 +8,31 @@ Like xxd but displays SNES logical addresses based on the selected memory mappin
 
 import argparse
 import logging
+import os
 import shutil
 import sys
 import tempfile
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TextIO
 
 from a816.cpu.cpu_65c816 import RomType
 from a816.cpu.disassembler import Disassembler, disassemble_function, format_disassembly, format_disassembly_block
 from a816.cpu.mapping import Bus
 from a816.symbols import high_rom_bus, low_rom_bus
+from a816.util import MappedBytes, map_file
 
 logger = logging.getLogger("xdds")
 
+# Output is produced in batches of this many rows / instructions so a
+# pipe reader (`less`, `grep`) sees the first lines right away while the
+# per-write overhead stays amortised over large chunks.
+OUTPUT_BATCH_ROWS = 1024
+
+# byte -> printable ASCII or ".", for `bytes.translate`.
+_ASCII_TABLE = bytes(b if 32 <= b < 127 else ord(".") for b in range(256))
+
 
 def get_bus_for_rom_type(rom_type: RomType) -> Bus | None:
     """Get the Bus instance for a given RomType."""
@@ -73,16 +85,15 @@ def logical_to_physical(bus: Bus, logical_addr: int) -> int | None:
 
 def physical_to_logical(bus: Bus, physical_addr: int) -> int:
     """Convert physical ROM address to SNES logical address."""
-    for mapping in bus.mappings.values():
-        if mapping.writable:
-            continue
-        logical = mapping.logical_address(physical_addr)
-        return logical
-    return physical_addr
+    return bus.logical_addresses([physical_addr])[0]
 
 
 def apply_ips_patch(rom_path: Path, ips_path: Path, output_path: Path) -> None:
-    """Apply an IPS patch to a ROM file."""
+    """Apply an IPS patch to a ROM file.
+
+    Honours the truncation extension: three bytes after the footer give
+    the final size of the patched file.
+    """
     shutil.copy(rom_path, output_path)
 
     with open(ips_path, "rb") as ips_file:
@@ -94,6 +105,9 @@ def apply_ips_patch(rom_path: Path, ips_path: Path, output_path: Path) -> None:
             while True:
                 record_offset = ips_file.read(3)
                 if record_offset == b"EOF":
+                    truncate = ips_file.read(3)
+                    if len(truncate) == 3:
+                        rom_file.truncate(int.from_bytes(truncate, "big"))
                     break
                 if len(record_offset) < 3:
                     raise ValueError("Unexpected end of IPS file")
@@ -118,33 +132,60 @@ def apply_ips_patch(rom_path: Path, ips_path: Path, output_path: Path) -> None:
                     rom_file.write(data)
 
 
+def iter_hexdump(
+    data: bytes | memoryview,
+    bus: Bus,
+    start_offset: int = 0,
+    bytes_per_line: int = 16,
+    show_ascii: bool = True,
+) -> Iterator[str]:
+    """Yield the hex dump as pre-formatted chunks of `OUTPUT_BATCH_ROWS` lines.
+
+    Each batch is copied out of `data` once; hex and ASCII columns come
+    from `bytes.hex` / `bytes.translate` instead of per-byte formatting.
+    """
+    hex_width = bytes_per_line * 3 - 1
+    batch_size = bytes_per_line * OUTPUT_BATCH_ROWS
+    for batch_start in range(0, len(data), batch_size):
+        block = bytes(data[batch_start : batch_start + batch_size])
+        printable = block.translate(_ASCII_TABLE).decode("ascii") if show_ascii else ""
+        rows: list[str] = []
+        row_offsets = range(0, len(block), bytes_per_line)
+        logical_addrs = bus.logical_addresses(start_offset + batch_start + i for i in row_offsets)
+        for i, logical_addr in zip(row_offsets, logical_addrs, strict=True):
+            # Format: $BB:AAAA where BB is bank and AAAA is address
+            hex_part = block[i : i + bytes_per_line].hex(" ").ljust(hex_width)
+            prefix = f"${(logical_addr >> 16) & 0xFF:02x}:{logical_addr & 0xFFFF:04x}  {hex_part}"
+            rows.append(f"{prefix}  {printable[i : i + bytes_per_line]}" if show_ascii else prefix)
+        rows.append("")
+        yield "\n".join(rows)
+
+
 def hexdump(
-    data: bytes,
+    data: bytes | memoryview,
     bus: Bus,
     start_offset: int = 0,
     bytes_per_line: int = 16,
     show_ascii: bool = True,
+    out: TextIO | None = None,
 ) -> None:
-    """Print hex dump with SNES logical addresses."""
-    for i in range(0, len(data), bytes_per_line):
-        physical_addr = start_offset + i
-        logical_addr = physical_to_logical(bus, physical_addr)
-
-        # Format: $BB:AAAA where BB is bank and AAAA is address
-        bank = (logical_addr >> 16) & 0xFF
-        addr = logical_addr & 0xFFFF
-
-        # Hex bytes
-        line_data = data[i : i + bytes_per_line]
-        hex_part = " ".join(f"{b:02x}" for b in line_data)
-        hex_part = hex_part.ljust(bytes_per_line * 3 - 1)
-
-        if show_ascii:
-            # ASCII representation
-            ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in line_data)
-            print(f"${bank:02x}:{addr:04x}  {hex_part}  {ascii_part}")
-        else:
-            print(f"${bank:02x}:{addr:04x}  {hex_part}")
+    """Print hex dump with SNES logical addresses (to stdout unless `out` is given)."""
+    (out or sys.stdout).writelines(iter_hexdump(data, bus, start_offset, bytes_per_line, show_ascii))
+
+
+def _write_batched(lines: Iterable[str], out: TextIO | None = None) -> None:
+    """Write `lines` newline-terminated, `OUTPUT_BATCH_ROWS` at a time."""
+    stream = out or sys.stdout
+    batch: list[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= OUTPUT_BATCH_ROWS:
+            batch.append("")
+            stream.write("\n".join(batch))
+            batch = []
+    if batch:
+        batch.append("")
+        stream.write("\n".join(batch))
 
 
 def show_mapping_info(rom_type: RomType) -> None:
@@ -316,12 +357,23 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="With --func, also recurse into jsr / jsl targets.",
     )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Whole-ROM recursive-descent disassembly (with -d): seed from the reset / NMI / IRQ"
+        " vectors and --debug labels, propagate M/X across rep/sep. Cached next to the ROM.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="With --analyze, neither read nor write the <rom>.xdds.json analysis sidecar.",
+    )
 
     return parser
 
 
 def disassemble(
-    data: bytes,
+    data: bytes | memoryview,
     bus: Bus,
     start_offset: int,
     m_flag: bool = True,
@@ -331,22 +383,27 @@ def disassemble(
     a816_syntax: bool = False,
     symbol_map: dict[int, str] | None = None,
 ) -> None:
-    """Disassemble and print 65c816 code with SNES logical addresses."""
+    """Disassemble and print 65c816 code with SNES logical addresses.
+
+    Plain listings stream as instructions are decoded; `a816_syntax`
+    needs the whole block up front to place branch-target labels.
+    """
     start_logical = physical_to_logical(bus, start_offset)
     disasm = Disassembler(m_flag=m_flag, x_flag=x_flag)
-    instructions = disasm.disassemble(data, start_logical, count)
 
     if a816_syntax:
-        for line in format_disassembly_block(
-            instructions, show_bytes=show_bytes, a816_syntax=True, symbol_map=symbol_map
-        ):
-            print(line)
+        instructions = disasm.disassemble(data, start_logical, count)
+        _write_batched(
+            format_disassembly_block(instructions, show_bytes=show_bytes, a816_syntax=True, symbol_map=symbol_map)
+        )
     else:
-        for inst in instructions:
-            print(format_disassembly(inst, show_bytes=show_bytes, a816_syntax=False))
+        _write_batched(
+            format_disassembly(inst, show_bytes=show_bytes, a816_syntax=False)
+            for inst in disasm.iter_disassemble(data, start_logical, count)
+        )
 
 
-def make_rom_data_provider(rom_bytes: bytes, bus: Bus) -> Callable[[int, int], bytes]:
+def make_rom_data_provider(rom_bytes: MappedBytes, bus: Bus) -> Callable[[int, int], bytes]:
     """Return a callable `(logical_addr, length) -> bytes` backed by `rom_bytes`.
 
     Returns an empty bytes object when the address has no physical mapping
@@ -418,10 +475,16 @@ def _resolve_physical_start(args: argparse.Namespace, bus: Bus) -> int:
     return physical_start
 
 
-def _read_slice(input_file: Path, physical_start: int, length: int | None) -> bytes:
-    with open(input_file, "rb") as f:
-        f.seek(physical_start)
-        return f.read(length) if length else f.read()
+@contextmanager
+def _mapped_slice(input_file: Path, physical_start: int, length: int | None) -> Iterator[memoryview]:
+    """Zero-copy window `[physical_start, physical_start + length)` of the memory-mapped ROM.
+
+    Only the pages actually touched by the dump are read from disk.
+    """
+    with map_file(input_file) as rom, memoryview(rom) as whole:
+        end = len(whole) if not length else min(len(whole), physical_start + length)
+        with whole[min(physical_start, end) : end] as window:
+            yield window
 
 
 def _resolve_bus(args: argparse.Namespace) -> tuple[RomType, Bus]:
@@ -454,31 +517,110 @@ def _require_symbol(name: str | None, name_to_addr: dict[str, int], flag: str) -
     return name_to_addr[name]
 
 
-def _emit_function(
-    args: argparse.Namespace, input_file: Path, bus: Bus, entry: int, symbol_map: dict[int, str] | None
+def _label_seeds(debug_path: Path | None, m_flag: bool, x_flag: bool) -> list[tuple[int, bool, bool]]:
+    """Code-label entry points from a .adbg file (constants and aliases are skipped)."""
+    if debug_path is None:
+        return []
+    from a816.debug_info import SymbolKind
+    from a816.debug_info import read as read_debug
+
+    info = read_debug(debug_path)
+    return [(sym.address, m_flag, x_flag) for sym in info.symbols if sym.kind == SymbolKind.LABEL]
+
+
+def _emit_analysis(
+    args: argparse.Namespace, rom_path: Path, input_file: Path, bus: Bus, symbol_map: dict[int, str] | None
 ) -> None:
-    with open(input_file, "rb") as f:
-        rom_bytes = f.read()
-    provider = make_rom_data_provider(rom_bytes, bus)
-    instructions = disassemble_function(
-        entry,
-        provider,
+    from a816.cpu.rom_analysis import analyze_rom_file, default_cache_path
+
+    analysis = analyze_rom_file(
+        input_file,
+        bus,
+        extra_seeds=_label_seeds(args.debug, args.m_flag, args.x_flag),
         m_flag=args.m_flag,
         x_flag=args.x_flag,
-        follow_calls=args.follow_calls,
+        cache_path=None if args.no_cache else default_cache_path(rom_path),
+    )
+    instructions = analysis.instructions()
+    logger.info(
+        f"Analysis: {len(analysis.blocks)} blocks, {len(instructions)} instructions from"
+        f" {len(analysis.seeds)} seeds{' (cached)' if analysis.from_cache else ''}"
+    )
+    conflicts = analysis.conflicts()
+    if conflicts:
+        logger.warning(f"{len(conflicts)} addresses decoded under conflicting M/X states")
+    _write_batched(
+        format_disassembly_block(
+            instructions, show_bytes=not args.no_bytes, a816_syntax=args.asm, symbol_map=symbol_map
+        )
+    )
+
+
+def _emit_function(
+    args: argparse.Namespace, input_file: Path, bus: Bus, entry: int, symbol_map: dict[int, str] | None
+) -> None:
+    with map_file(input_file) as rom_bytes:
+        provider = make_rom_data_provider(rom_bytes, bus)
+        instructions = disassemble_function(
+            entry,
+            provider,
+            m_flag=args.m_flag,
+            x_flag=args.x_flag,
+            follow_calls=args.follow_calls,
+        )
+    _write_batched(
+        format_disassembly_block(
+            instructions, show_bytes=not args.no_bytes, a816_syntax=args.asm, symbol_map=symbol_map
+        )
     )
-    if args.asm:
-        for line in format_disassembly_block(
-            instructions, show_bytes=not args.no_bytes, a816_syntax=True, symbol_map=symbol_map
-        ):
-            print(line)
-    else:
-        for inst in instructions:
-            print(format_disassembly(inst, show_bytes=not args.no_bytes, a816_syntax=False))
+
+
+def create_diff_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="xdds diff",
+        description="Build an IPS or BPS patch that turns BASE into TARGET",
+    )
+    parser.add_argument("base_file", type=Path, help="Original ROM")
+    parser.add_argument("target_file", type=Path, help="Modified ROM")
+    parser.add_argument(
+        "-o", "--output", type=Path, dest="output_file", required=True, help="Output patch (.ips or .bps)"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("ips", "bps"),
+        default=None,
+        help="Patch format (default: inferred from the output suffix, IPS unless .bps)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
+    return parser
+
+
+def _run_diff(argv: list[str]) -> None:
+    from a816.romdiff import diff_files
+
+    args = create_diff_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(levelname)s - %(message)s")
+    for path in (args.base_file, args.target_file):
+        if not path.exists():
+            logger.error(f"Input file not found: {path}")
+            sys.exit(-1)
+    try:
+        size = diff_files(args.base_file, args.target_file, args.output_file, args.format)
+    except ValueError as e:
+        logger.error(str(e))  # NOSONAR python:S8572
+        sys.exit(-1)
+    logger.info(f"Wrote {args.output_file} ({size} bytes)")
 
 
 def xdds_main() -> None:
-    args = create_parser().parse_args()
+    argv = sys.argv[1:]
+    # `xdds diff ...` is the only subcommand; everything else is the
+    # legacy dump / disassemble invocation.
+    if argv and argv[0] == "diff":
+        _run_diff(argv[1:])
+        return
+    args = create_parser().parse_args(argv)
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(levelname)s - %(message)s")
 
     rom_type, bus = _resolve_bus(args)
@@ -496,6 +638,9 @@ def xdds_main() -> None:
     if func_addr is not None and not args.disasm:
         logger.error("--func requires -d / --disasm")
         sys.exit(-1)
+    if args.analyze and not args.disasm:
+        logger.error("--analyze requires -d / --disasm")
+        sys.exit(-1)
 
     input_file = args.input_file
     tmp_path: Path | None = None
@@ -508,25 +653,35 @@ def xdds_main() -> None:
             sys.exit(-1)
 
         physical_start = _resolve_physical_start(args, bus)
-        data = _read_slice(input_file, physical_start, args.length)
         symbol_map = addr_to_name or None
 
-        if func_addr is not None:
+        if args.analyze:
+            _emit_analysis(args, args.input_file, input_file, bus, symbol_map)
+        elif func_addr is not None:
             _emit_function(args, input_file, bus, func_addr, symbol_map)
-        elif args.disasm:
-            disassemble(
-                data,
-                bus,
-                physical_start,
-                m_flag=args.m_flag,
-                x_flag=args.x_flag,
-                count=args.count,
-                show_bytes=not args.no_bytes,
-                a816_syntax=args.asm,
-                symbol_map=symbol_map,
-            )
         else:
-            hexdump(data, bus, physical_start, args.cols, not args.no_ascii)
+            with _mapped_slice(input_file, physical_start, args.length) as data:
+                if args.disasm:
+                    disassemble(
+                        data,
+                        bus,
+                        physical_start,
+                        m_flag=args.m_flag,
+                        x_flag=args.x_flag,
+                        count=args.count,
+                        show_bytes=not args.no_bytes,
+                        a816_syntax=args.asm,
+                        symbol_map=symbol_map,
+                    )
+                else:
+                    hexdump(data, bus, physical_start, args.cols, not args.no_ascii)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Reader went away (`xdds rom.sfc | head`): silence the flush at
+        # interpreter exit instead of dumping a traceback.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
     finally:
         if tmp_path is not None and tmp_path.exists():
             tmp_path.unlink()
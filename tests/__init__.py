@@ -1,3 +1,4 @@
+from a816.program import Program
 from a816.writers import Writer
 
 
@@ -18,3 +19,10 @@ class StubWriter(Writer):
 
     def end(self) -> None:
         """not needed by StubWriter"""
+
+
+def emitted(source: str, filename: str = "test.s") -> bytes:
+    """Bytes `source` assembles to, in emission order."""
+    writer = StubWriter()
+    Program().assemble_string_with_emitter(source, filename, writer)
+    return b"".join(writer.data)
@@ -0,0 +1,27 @@
+"""Micro-benchmarks for the hot paths of the assembler and tools.
+
+Not collected by pytest (files are named `bench_*.py`); run one directly:
+
+    python -m tests.benchmarks.bench_disassembler
+
+Each module prints one line per scenario with the best-of-N wall time.
+"""
+
+import time
+from collections.abc import Callable
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Return the fastest of `repeat` runs of `fn`, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, seconds: float, items: int, unit: str) -> None:
+    """Print a scenario's time and throughput (`items` per second)."""
+    rate = items / seconds if seconds else float("inf")
+    print(f"{name:<40} {seconds * 1000:10.2f} ms  {rate:14,.0f} {unit}/s")
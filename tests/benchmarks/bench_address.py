@@ -0,0 +1,68 @@
+"""PC advancement over a LoROM bus, one instruction-sized step per node,
+and bulk logical/physical conversion."""
+
+from typing import Any
+
+from a816.cpu.mapping import Address, Bus, Mapping
+from a816.symbols import low_rom_bus
+from tests.benchmarks import best_of, report
+
+NODES = 100_000
+STEP = 3
+
+
+class _DictLookupAddress(Address):
+    """`Address` as it was before per-bank arrays: every construction and
+    addition resolves the bank through `Bus.lookup` and `Bus.mappings`."""
+
+    __slots__ = ()
+
+    def __init__(self, bus: Bus, logical_value: int) -> None:
+        self.bus = bus
+        self.logical_value = logical_value
+        self.mapping = self._get_mapping()
+
+    def _get_mapping(self) -> Mapping:
+        return self.bus.mappings[self.bus.lookup[self._get_bank()]]
+
+    def __add__(self, other: Any) -> "_DictLookupAddress":
+        mapping = self._get_mapping()
+        physical_address = mapping.physical_address(self.logical_value)
+        if physical_address is not None:
+            logical_address = mapping.logical_address(physical_address + other)
+        else:
+            logical_address = self.logical_value + other
+        return _DictLookupAddress(self.bus, logical_address)
+
+
+def _walk_dict_lookups(bus: Bus) -> None:
+    pc: Address = _DictLookupAddress(bus, 0x008000)
+    for _ in range(NODES):
+        pc = pc + STEP
+
+
+def _walk_addresses(bus: Bus) -> None:
+    pc = bus.get_address(0x008000)
+    for _ in range(NODES):
+        pc = pc + STEP
+
+
+def main() -> None:
+    bus = low_rom_bus
+    report("advance PC, dict lookups", best_of(lambda: _walk_dict_lookups(bus)), NODES, "nodes")
+    report("advance PC, Address + bank array", best_of(lambda: _walk_addresses(bus)), NODES, "nodes")
+
+    logicals = [(bus.get_address(0x008000) + offset).logical_value for offset in range(0, NODES * STEP, STEP)]
+    physicals = list(range(0, NODES * STEP, STEP))
+    report(
+        "logical -> physical, one Address each",
+        best_of(lambda: [bus.get_address(value).physical for value in logicals]),
+        NODES,
+        "addresses",
+    )
+    report("logical -> physical, bulk", best_of(lambda: bus.physical_addresses(logicals)), NODES, "addresses")
+    report("physical -> logical, bulk", best_of(lambda: bus.logical_addresses(physicals)), NODES, "addresses")
+
+
+if __name__ == "__main__":
+    main()
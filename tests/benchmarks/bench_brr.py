@@ -0,0 +1,37 @@
+"""BRR encoding of one second of 32 kHz audio, with the pruned
+filter/shift search and with the exhaustive one."""
+
+import math
+import random
+from functools import partial
+
+from a816.brr import _MAX_SHIFT, decode_brr, encode_brr
+from tests.benchmarks import best_of, report
+
+RATE = 32000
+
+
+def _signal() -> list[int]:
+    rng = random.Random(816)
+    return [
+        int(8000 * math.sin(2 * math.pi * 220 * i / RATE) + 5000 * math.sin(2 * math.pi * 1330 * i / RATE))
+        + rng.randint(-400, 400)
+        for i in range(RATE)
+    ]
+
+
+def _snr(source: list[int], decoded: list[int]) -> float:
+    noise = sum((a - b) ** 2 for a, b in zip(source, decoded, strict=False))
+    return 10 * math.log10(sum(a * a for a in source) / noise)
+
+
+def main() -> None:
+    samples = _signal()
+    for name, window in (("pruned search", 1), ("exhaustive search", _MAX_SHIFT)):
+        seconds = best_of(partial(encode_brr, samples, shift_window=window), repeat=1)
+        snr = _snr(samples, decode_brr(encode_brr(samples, shift_window=window).data))
+        report(f"encode, {name} ({snr:.1f} dB)", seconds, len(samples), "samples")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compression throughput of each `.incbin_lz` codec on tile-like data,
+and a rebuild served from the on-disk asset cache."""
+
+import random
+import tempfile
+from functools import partial
+from pathlib import Path
+
+from a816 import asset_cache, compression
+from tests.benchmarks import best_of, report
+
+SIZE = 0x8000
+
+
+def _tiles() -> bytes:
+    # 4bpp tiles drawn from a small palette of rows, with blank runs:
+    # repetitive like real graphics, without being trivially so.
+    rng = random.Random(816)
+    rows = [bytes(rng.randrange(4) for _ in range(8)) for _ in range(24)]
+    out = bytearray()
+    while len(out) < SIZE:
+        out += bytes(32) if rng.random() < 0.2 else b"".join(rng.choice(rows) for _ in range(4))
+    return bytes(out[:SIZE])
+
+
+def main() -> None:
+    data = _tiles()
+    for codec in compression.CODECS.values():
+        packed = codec.compress(data)
+        ratio = len(packed) / len(data)
+        report(f"{codec.name} compress ({ratio:.0%})", best_of(partial(codec.compress, data)), len(data), "B")
+        report(
+            f"{codec.name} decompress",
+            best_of(partial(codec.decompress, packed)),
+            len(data),
+            "B",
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        asset_cache.enable_asset_cache(Path(directory))
+        compression.compress(data, "lz77")
+
+        def rebuild() -> bytes:
+            asset_cache._memo.clear()
+            return compression.compress(data, "lz77")
+
+        report("lz77 rebuild, disk cache hit", best_of(rebuild), len(data), "B")
+        asset_cache.disable_asset_cache()
+
+
+if __name__ == "__main__":
+    main()
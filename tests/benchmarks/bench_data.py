@@ -0,0 +1,60 @@
+"""Assembly of a 16k-entry `.dw` table, one array node per directive
+and one node per value."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from a816.parse.ast.nodes import DataNode, ExpressionAstNode
+from a816.parse.codegen import base, directives
+from a816.parse.codegen.base import GenNodes
+from a816.parse.nodes import ExpressionNode, WordNode
+from a816.parse.tokens import Token
+from a816.program import Program
+from a816.symbols import Resolver
+from tests import StubWriter
+from tests.benchmarks import best_of, report
+
+ENTRIES = 0x4000
+PER_LINE = 16
+
+_VALUES = [f"0x{(index * 0x9E37) & 0xFFFF:04X}" for index in range(ENTRIES)]
+_LINES = [", ".join(_VALUES[start : start + PER_LINE]) for start in range(0, ENTRIES, PER_LINE)]
+_SOURCE = "*=0x018000\nBASE = 0x1000\n" + "".join(f".dw {line}, BASE + {index}\n" for index, line in enumerate(_LINES))
+
+
+def _generate_dw_per_value(node: DataNode, resolver: Resolver, macro_definitions: object, file_info: Token) -> GenNodes:
+    # What `.dw` generated before data arrays: one node per value.
+    code: GenNodes = []
+    for expr in node.data:
+        assert isinstance(expr, ExpressionAstNode)
+        code.append(WordNode(ExpressionNode(expr, resolver, file_info)))
+    return code
+
+
+@contextmanager
+def _per_value_nodes() -> Iterator[None]:
+    base.generators["dw"] = _generate_dw_per_value
+    try:
+        yield
+    finally:
+        base.generators["dw"] = directives.generate_dw
+
+
+def _scenario(name: str) -> None:
+    entries = ENTRIES + len(_LINES)
+    report(
+        f"assemble, {name}",
+        best_of(lambda: Program().assemble_string_with_emitter(_SOURCE, "bench_data.s", StubWriter())),
+        entries,
+        "entries",
+    )
+
+
+def main() -> None:
+    _scenario("one array per directive")
+    with _per_value_nodes():
+        _scenario("one node per value")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Linear disassembly throughput: one 64 KiB bank and a whole 4 MiB ROM."""
+
+import random
+
+from a816.cpu.disassembler import Disassembler, format_disassembly
+from tests.benchmarks import best_of, report
+
+BANK_SIZE = 0x10000
+ROM_SIZE = 0x400000
+
+
+def _rom(size: int) -> bytes:
+    return random.Random(0x816).randbytes(size)
+
+
+def _disassemble(data: bytes) -> int:
+    return len(Disassembler().disassemble(data, 0x008000))
+
+
+def _format(data: bytes) -> int:
+    return sum(len(format_disassembly(inst)) for inst in Disassembler().iter_disassemble(data, 0x008000))
+
+
+def main() -> None:
+    bank = _rom(BANK_SIZE)
+    rom = _rom(ROM_SIZE)
+    report("disassemble 64 KiB bank", best_of(lambda: _disassemble(bank)), BANK_SIZE, "bytes")
+    report("disassemble + format 64 KiB bank", best_of(lambda: _format(bank)), BANK_SIZE, "bytes")
+    report("disassemble 4 MiB ROM", best_of(lambda: _disassemble(rom), repeat=1), ROM_SIZE, "bytes")
+
+
+if __name__ == "__main__":
+    main()
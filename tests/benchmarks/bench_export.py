@@ -0,0 +1,71 @@
+"""Object-mode symbol export of a module with many labels across many
+scopes: half named `.scope` blocks, half anonymous blocks."""
+
+from a816.program import Program
+from a816.writers import ObjectWriter
+from tests.benchmarks import best_of, report
+
+SCOPES = 1_000
+LABELS_PER_SCOPE = 10
+
+
+def _source() -> str:
+    blocks = []
+    for scope in range(SCOPES):
+        body = "".join(f"label_{scope}_{index}:\nrts\n" for index in range(LABELS_PER_SCOPE))
+        blocks.append(f".scope module_{scope} {{\n{body}}}\n" if scope % 2 else f"{{\n{body}}}\n")
+    return "*=0x008000\n" + "".join(blocks)
+
+
+def _resolved() -> Program:
+    program = Program()
+    error, nodes = program.parser.parse(_source())
+    assert error is None
+    program.resolve_labels(nodes)
+    return program
+
+
+def _classify_per_name(program: Program, names: list[str]) -> None:
+    # What export did before the index: one scan of every scope per symbol.
+    for name in names:
+        program.resolver.is_root_scope_symbol(name)
+
+
+def _classify_indexed(program: Program, names: list[str]) -> None:
+    root_symbols = program.resolver.root_symbol_index()
+    for name in names:
+        _ = name in root_symbols
+
+
+def main() -> None:
+    program = _resolved()
+    resolver = program.resolver
+    # Every label's source name; the named-scope members miss the root and
+    # used to fall through to the scan.
+    names = [name for scope in resolver.scopes for name in scope.labels]
+    report(
+        "classify, scan scopes per symbol", best_of(lambda: _classify_per_name(program, names)), len(names), "symbols"
+    )
+    report("classify, root symbol index", best_of(lambda: _classify_indexed(program, names)), len(names), "symbols")
+
+    scopes = resolver.scopes
+    report(
+        "scope ordinal, list.index", best_of(lambda: [scopes.index(scope) for scope in scopes]), len(scopes), "scopes"
+    )
+    report(
+        "scope ordinal, map",
+        best_of(lambda: [resolver.scope_ordinals[scope] for scope in scopes]),
+        len(scopes),
+        "scopes",
+    )
+
+    report(
+        "export object symbols",
+        best_of(lambda: program._export_object_symbols(ObjectWriter("bench.o"))),
+        SCOPES * LABELS_PER_SCOPE,
+        "symbols",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Resolve + emit of an expression-heavy source: struct offsets and table math."""
+
+from collections.abc import Callable
+
+from a816.parse.ast import expression
+from a816.parse.ast.nodes import ExpressionAstNode
+from a816.program import Program
+from a816.protocols import NodeProtocol
+from a816.writers import Writer
+from tests.benchmarks import best_of, report
+
+ENTRIES = 5_000
+
+_HEADER = """
+.struct Entity {
+    word x
+    word y
+    byte hp
+    byte flags
+    word script
+}
+ENTITIES = 0x7E2000
+STRIDE = Entity.__size
+*=0x008000
+"""
+
+
+def _source() -> str:
+    lines = [_HEADER]
+    for index in range(ENTRIES):
+        lines.append(f"entry_{index}:")
+        lines.append(f"    lda (ENTITIES + {index % 64} * STRIDE + Entity.hp) & 0xFFFF")
+        lines.append(f"    .dw (entry_{index} + {index} * 3 - Entity.script) & 0xFFFF, STRIDE * {index % 16} + 0x8000")
+    return "\n".join(lines) + "\n"
+
+
+class _NullWriter(Writer):
+    def begin(self) -> None: ...
+
+    def write_block(self, block: bytes, block_address: int) -> None: ...
+
+    def write_block_header(self, block: bytes, block_address: int) -> None: ...
+
+    def end(self) -> None: ...
+
+
+def _parsed(source: str) -> tuple[Program, list[NodeProtocol]]:
+    program = Program()
+    error, nodes = program.parser.parse(source, "bench.s")
+    assert error is None, error
+    return program, nodes
+
+
+def _resolve_and_emit(program: Program, nodes: list[NodeProtocol]) -> None:
+    """Unsized operands are evaluated on both resolve passes, every value again at emit."""
+    program.resolve_labels(nodes)
+    program.emit(nodes, _NullWriter())
+
+
+def _uncached_compile(
+    compile_expression: Callable[[ExpressionAstNode], object],
+) -> Callable[[ExpressionAstNode], object]:
+    """Recompile on every evaluation: the cost of running `shunting_yard` per value request."""
+
+    def compile_every_time(node: ExpressionAstNode) -> object:
+        node.compiled = None
+        return compile_expression(node)
+
+    return compile_every_time
+
+
+def main() -> None:
+    program, nodes = _parsed(_source())
+    lines = ENTRIES * 3
+
+    compile_expression = expression.compile_expression
+    expression.compile_expression = _uncached_compile(compile_expression)  # type: ignore[assignment]
+    try:
+        report(
+            "resolve + emit, recompiled per value", best_of(lambda: _resolve_and_emit(program, nodes)), lines, "lines"
+        )
+    finally:
+        expression.compile_expression = compile_expression
+    report("resolve + emit, compiled once", best_of(lambda: _resolve_and_emit(program, nodes)), lines, "lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Assembly of a 64k-entry `.for` word table, rolled into one data loop
+node and unrolled into a scope and nodes per iteration."""
+
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from a816.parse.codegen import flow
+from a816.program import Program
+from tests import StubWriter
+from tests.benchmarks import best_of, report
+
+ENTRIES = 0x10000
+
+_SOURCE = f"*=0x018000\n.for i := 0, {ENTRIES} {{\n    .dw (i * 0x9E37) & 0xFFFF\n}}\n"
+
+
+@contextmanager
+def _unrolled() -> Iterator[None]:
+    is_data_table = flow._is_data_table
+    flow._is_data_table = lambda body: False
+    try:
+        yield
+    finally:
+        flow._is_data_table = is_data_table
+
+
+def _assemble() -> None:
+    Program().assemble_string_with_emitter(_SOURCE, "bench_for.s", StubWriter())
+
+
+def _peak_parse_mib() -> float:
+    # Peak while the node list is alive: parsed and code-generated, not emitted.
+    tracemalloc.start()
+    try:
+        error, _nodes = Program().parser.parse(_SOURCE)
+        assert error is None
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    finally:
+        tracemalloc.stop()
+
+
+def _scenario(name: str) -> None:
+    report(f"assemble, {name}", best_of(_assemble), ENTRIES, "entries")
+    print(f"{'  peak memory after codegen':<40} {_peak_parse_mib():10.2f} MiB")
+
+
+def main() -> None:
+    _scenario("rolled data loop")
+    with _unrolled():
+        _scenario("unrolled")
+
+
+if __name__ == "__main__":
+    main()
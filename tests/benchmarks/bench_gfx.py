@@ -0,0 +1,49 @@
+"""Conversion of a 256x256 4bpp screen to deduplicated SNES tiles, with
+the whole-image bitplane gather and with a per-pixel reference loop."""
+
+import random
+
+from a816 import gfx
+from a816.gfx import IndexedImage
+from tests.benchmarks import best_of, report
+
+SIZE = 256
+
+
+def _screen() -> IndexedImage:
+    # A few distinct tiles scattered over the screen, some mirrored.
+    rng = random.Random(816)
+    tiles = [[bytes(rng.randrange(16) for _ in range(8)) for _ in range(8)] for _ in range(48)]
+    layout = [rng.choice(tiles) for _ in range((SIZE // 8) ** 2)]
+    layout = [tile if rng.random() < 0.7 else [row[::-1] for row in tile] for tile in layout]
+    columns = SIZE // 8
+    pixels = b"".join(layout[(y // 8) * columns + column][y % 8] for y in range(SIZE) for column in range(columns))
+    return IndexedImage(SIZE, SIZE, pixels, [(0, 0, 0)] * 16)
+
+
+def _bitplanes_per_pixel(pixels: bytes, depth: int) -> list[bytes]:
+    # Reference: gather each plane byte pixel by pixel.
+    return [
+        bytes(
+            sum(((pixels[lane * 8 + x] >> plane) & 1) << (7 - x) for x in range(8)) for lane in range(len(pixels) // 8)
+        )
+        for plane in range(depth)
+    ]
+
+
+def main() -> None:
+    image = _screen()
+    tiles = (SIZE // 8) ** 2
+    report("convert, bitplane gather", best_of(lambda: gfx.convert_image(image, 4)), tiles, "tiles")
+    assert gfx._bitplanes(image.pixels, 4) == _bitplanes_per_pixel(image.pixels, 4)
+    bitplanes = gfx._bitplanes
+    gfx._bitplanes = _bitplanes_per_pixel
+    try:
+        report("convert, per-pixel planes", best_of(lambda: gfx.convert_image(image, 4)), tiles, "tiles")
+    finally:
+        gfx._bitplanes = bitplanes
+    print(f"{'  distinct tiles':<40} {len(gfx.convert_image(image, 4).tiles) // 32:10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Codegen of several modules that each `.incbin` regions of one large
+asset, with the shared asset cache and with a read per include."""
+
+import tempfile
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from a816 import util
+from a816.program import Program
+from tests.benchmarks import best_of, report
+
+ASSET_SIZE = 4 << 20
+MODULES = 16
+REGION = 0x8000
+
+
+def _sources(asset: Path) -> list[str]:
+    return [
+        f'*=0x{0x018000 + module * 0x10000:06X}\n.incbin "{asset}", 0x{module * REGION:X}, 0x{REGION:X}\n'
+        for module in range(MODULES)
+    ]
+
+
+@contextmanager
+def _read_per_include() -> Iterator[None]:
+    read_asset = util.read_asset
+    util.read_asset = lambda path: Path(path).read_bytes()
+    try:
+        yield
+    finally:
+        util.read_asset = read_asset
+
+
+def _generate(sources: list[str]) -> list[object]:
+    util.clear_asset_cache()
+    modules: list[object] = []
+    for source in sources:
+        error, nodes = Program().parser.parse(source)
+        assert error is None
+        modules.append(nodes)
+    return modules
+
+
+def _scenario(name: str, sources: list[str]) -> None:
+    report(f"codegen, {name}", best_of(lambda: _generate(sources)), MODULES, "modules")
+    tracemalloc.start()
+    try:
+        modules = _generate(sources)
+        current, _ = tracemalloc.get_traced_memory()
+        del modules
+    finally:
+        tracemalloc.stop()
+    print(f"{'  held by the nodes':<40} {current / (1 << 20):10.2f} MiB")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        asset = Path(directory) / "asset.bin"
+        asset.write_bytes(bytes(range(256)) * (ASSET_SIZE // 256))
+        sources = _sources(asset)
+        _scenario("shared asset cache", sources)
+        with _read_per_include():
+            _scenario("read per include", sources)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Codegen of a macro-heavy source: one DMA setup macro applied thousands
+of times, with and without pre-lowered macro templates."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from a816.parse.codegen import code_gen, macros
+from a816.parse.mzparser import A816Parser, _gc_paused
+from a816.program import Program
+from tests.benchmarks import best_of, report
+
+APPLICATIONS = 3_000
+
+_MACRO = """.macro dma_copy(channel, src, dst, size) {
+    lda.b #0x01
+    sta.w 0x4300 + channel * 0x10
+    lda.b #dst & 0xFF
+    sta.w 0x4301 + channel * 0x10
+    ldx.w #src & 0xFFFF
+    stx.w 0x4302 + channel * 0x10
+    lda.b #src >> 16
+    sta.w 0x4304 + channel * 0x10
+    ldx.w #size
+    stx.w 0x4305 + channel * 0x10
+    lda.b #1 << channel
+    sta.w 0x420B
+}
+"""
+
+
+def _source() -> str:
+    calls = "".join(f"dma_copy({index % 8}, 0x7E2000 + {index}, 0x18, {index + 1})\n" for index in range(APPLICATIONS))
+    return f"{_MACRO}*=0x8000\n{calls}"
+
+
+@contextmanager
+def _without_templates() -> Iterator[None]:
+    lower = macros._lower
+    macros._lower = lambda node, args: macros._GeneratorStep(node)
+    try:
+        yield
+    finally:
+        macros._lower = lower
+
+
+def _scenario(name: str, source: str) -> None:
+    # A fresh AST per run, so every run lowers the template on its first application.
+    runs = iter([(A816Parser.parse_as_ast(source).nodes, Program().resolver) for _ in range(3)])
+
+    def generate() -> None:
+        ast, resolver = next(runs)
+        with _gc_paused():  # as `A816Parser.parse` runs codegen
+            code_gen(ast, resolver)
+
+    report(name, best_of(generate), APPLICATIONS * 12, "nodes")
+
+
+def main() -> None:
+    source = _source()
+    _scenario(f"codegen, {APPLICATIONS} macro applications", source)
+    with _without_templates():
+        _scenario("codegen, no macro templates", source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Memory held by the AST and the executable nodes of a large synthetic
+project: routines of opcodes, labels, symbol definitions and data tables
+in nested blocks."""
+
+import tracemalloc
+from collections.abc import Callable
+
+from a816.parse.mzparser import A816Parser
+from a816.program import Program
+
+ROUTINES = 2_000
+
+
+def _routine(index: int) -> str:
+    return (
+        f"OFFSET_{index} = 0x{index * 4:04X}\n"
+        f"routine_{index}:\n"
+        "{\n"
+        "    loop:\n"
+        f"    lda.w table_{index} + OFFSET_{index}, x\n"
+        "    sta.l 0x7E2000, x\n"
+        "    inx\n"
+        "    cpx.w #0x0010\n"
+        "    bne loop\n"
+        "    rts\n"
+        f"    table_{index}:\n"
+        f"    .dw {', '.join(str(value) for value in range(index % 7, index % 7 + 8))}\n"
+        "    .db 1, 2, 3, 4\n"
+        "}\n"
+    )
+
+
+_SOURCE = "*=0x008000\n" + "".join(_routine(index) for index in range(ROUTINES))
+_LINES = _SOURCE.count("\n")
+
+
+def _measure(name: str, build: Callable[[], object]) -> None:
+    """Print the MiB still allocated while `build`'s result is alive, and the peak."""
+    tracemalloc.start()
+    try:
+        result = build()
+        current, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    print(f"{name:<40} {current / (1 << 20):10.2f} MiB  {peak / (1 << 20):10.2f} MiB peak")
+
+
+def _nodes() -> object:
+    program = Program()
+    error, nodes = program.parser.parse(_SOURCE)
+    assert error is None
+    return program, nodes
+
+
+def main() -> None:
+    _measure(f"AST, {_LINES} lines", lambda: A816Parser.parse_as_ast(_SOURCE))
+    _measure("AST + executable nodes", _nodes)
+
+
+if __name__ == "__main__":
+    main()
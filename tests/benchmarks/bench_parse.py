@@ -0,0 +1,41 @@
+"""Scan + parse of a large generated data source: wall time and peak traced memory."""
+
+import random
+import tracemalloc
+
+from a816.parse.mzparser import A816Parser
+from tests.benchmarks import best_of, report
+
+DATA_LINES = 50_000
+
+
+def _data_source() -> str:
+    """Table and dialogue data, the shape of our generated `.s` files."""
+    rng = random.Random(0x816)
+    lines = []
+    for index in range(DATA_LINES):
+        if index % 4 == 0:
+            lines.append(f'    .text "line {index} of the dialogue script"')
+        else:
+            lines.append("    .db " + ", ".join(f"0x{rng.randrange(256):02x}" for _ in range(8)))
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    source = _data_source()
+    report(
+        "parse_as_ast 50k-line data file",
+        best_of(lambda: A816Parser.parse_as_ast(source, "data.s")),
+        DATA_LINES,
+        "lines",
+    )
+    tracemalloc.start()
+    result = A816Parser.parse_as_ast(source, "data.s")
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert result.error is None
+    print(f"{'peak memory, parse_as_ast':<40} {peak / 2**20:10.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
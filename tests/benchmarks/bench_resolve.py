@@ -0,0 +1,102 @@
+"""Label resolution of large programs: a straight-line one with a late-bound
+pointer, and one whose code lives in `.alloc` bodies of unsized opcodes.
+Also times re-sizing unchanged opcodes, with and without the length memo."""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from a816.parse.nodes import OpcodeNode
+from a816.program import Program
+from a816.program.fixpoint import ResolveStats
+from a816.protocols import NodeProtocol
+from tests.benchmarks import best_of, report
+
+INSTRUCTIONS = 10_000
+ROUTINES = 200
+
+
+def _straight_line_source() -> str:
+    body = "".join(f"lda.w #{index & 0xFF}\nsta.w 0x2100\n" for index in range(INSTRUCTIONS // 2))
+    return f"*=0x8000\nstart:\n{body}PTR = start + 2\nlda.w PTR\nend:\n"
+
+
+def _alloc_source() -> str:
+    per_routine = INSTRUCTIONS // ROUTINES // 2
+    routines = []
+    for routine in range(ROUTINES):
+        body = "".join(f"lda table_{routine}\nsta table_{routine} + {index}\n" for index in range(per_routine))
+        routines.append(f".alloc routine_{routine} in code {{\ntable_{routine}:\n{body}rts\n}}\n")
+    return ".pool code {\n    range 0x008000 0x00FFFF\n    range 0x018000 0x01FFFF\n}\n" + "".join(routines)
+
+
+def _parsed(source: str) -> tuple[Program, list[NodeProtocol]]:
+    program = Program()
+    error, nodes = program.parser.parse(source)
+    assert error is None
+    return program, nodes
+
+
+@contextmanager
+def _without_length_memo() -> Iterator[None]:
+    length_stamp = OpcodeNode._length_stamp
+    OpcodeNode._length_stamp = lambda self: (object(),)  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        OpcodeNode._length_stamp = length_stamp  # type: ignore[method-assign]
+
+
+def _print_stats(stats: ResolveStats, nodes: int) -> None:
+    print(f"  passes={stats.passes} evaluated={stats.evaluated} revisited={stats.revisited} skipped={stats.skipped}")
+    print(f"  operand sizes measured per pass={stats.measured}")
+    print(f"  a full re-walk every pass would evaluate {nodes * stats.passes} nodes")
+
+
+def _scenario(name: str, source: str) -> None:
+    # `.alloc` slots are requested once per node list, so every run resolves a fresh parse.
+    parsed = iter([_parsed(source) for _ in range(3)])
+    resolved: list[tuple[Program, list[NodeProtocol]]] = []
+
+    def resolve() -> None:
+        program, nodes = next(parsed)
+        program.resolve_labels(nodes)
+        resolved.append((program, nodes))
+
+    seconds = best_of(resolve)
+    program, nodes = resolved[-1]
+    report(name, seconds, len(nodes), "nodes")
+    assert program.resolve_stats is not None
+    _print_stats(program.resolve_stats, len(nodes))
+
+
+def _remeasure_scenario(operand: str) -> None:
+    # What every pass after the first does to an opcode whose inputs did not move.
+    program, nodes = _parsed("".join(f"lda {operand}\n" for _ in range(INSTRUCTIONS)))
+    program.resolver.current_scope.add_symbol("table", 0x8000)
+    start = program.resolver.get_bus().get_address(0x8000)
+
+    def walk() -> None:
+        for node in nodes:
+            node.pc_after(start)
+
+    walk()
+    report(f"pc_after `lda {operand}`", best_of(walk), len(nodes), "nodes")
+    with _without_length_memo():
+        report(f"pc_after `lda {operand}`, no length memo", best_of(walk), len(nodes), "nodes")
+
+
+def main() -> None:
+    scenarios: list[tuple[str, Callable[[], str]]] = [
+        ("straight-line program", _straight_line_source),
+        (f"{ROUTINES} .alloc routines", _alloc_source),
+    ]
+    for name, source in scenarios:
+        _scenario(name, source())
+        with _without_length_memo():
+            _scenario(f"{name}, no length memo", source())
+    for operand in ("table", "table + 3"):
+        _remeasure_scenario(operand)
+
+
+if __name__ == "__main__":
+    main()
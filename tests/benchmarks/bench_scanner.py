@@ -0,0 +1,57 @@
+"""Lexer throughput (reference `Scanner` vs the regex `FastScanner`) and token memory."""
+
+import random
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from a816.parse.fast_scanner import FastScanner
+from a816.parse.scanner import Scanner
+from a816.parse.scanner_states import lex_initial
+from tests.benchmarks import best_of, report
+
+ROOT = Path(__file__).resolve().parents[2]
+TARGET_LINES = 50_000
+DATA_LINES = 50_000
+
+
+def _corpus() -> str:
+    """Every `.s` file of the stdlib and test suite, repeated to ~`TARGET_LINES` lines."""
+    sources = [path.read_text() for path in sorted(ROOT.glob("a816/stdlib/**/*.s")) + sorted(ROOT.glob("tests/**/*.s"))]
+    unit = "\n".join(sources) + "\n"
+    return unit * max(1, TARGET_LINES // unit.count("\n"))
+
+
+def _data_file() -> str:
+    """A generated table: `DATA_LINES` lines of eight `.db` bytes each."""
+    rng = random.Random(0x816)
+    rows = (", ".join(f"0x{rng.randrange(256):02x}" for _ in range(8)) for _ in range(DATA_LINES))
+    return "".join(f"    .db {row}\n" for row in rows)
+
+
+def _peak_memory(scan: Callable[[], object]) -> int:
+    """Peak traced allocation while `scan` runs and its result is alive."""
+    tracemalloc.start()
+    try:
+        result = scan()
+        peak = tracemalloc.get_traced_memory()[1]
+        del result
+        return peak
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    source = _corpus()
+    lines = source.count("\n")
+    report("Scanner(lex_initial)", best_of(lambda: Scanner(lex_initial).scan("bench.s", source)), lines, "lines")
+    report("FastScanner", best_of(lambda: FastScanner().scan("bench.s", source)), lines, "lines")
+
+    data = _data_file()
+    report("FastScanner, 50k-line .db file", best_of(lambda: FastScanner().scan("data.s", data)), DATA_LINES, "lines")
+    peak = _peak_memory(lambda: FastScanner().scan("data.s", data))
+    print(f"{'peak memory, 50k-line .db file':<40} {peak / 2**20:10.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Symbol lookups from the innermost of a deep stack of nested scopes."""
+
+from a816.symbols import Resolver, Scope
+from tests.benchmarks import best_of, report
+
+DEPTH = 24
+NAMES = 200
+ROUNDS = 50
+
+
+def _nested_resolver() -> tuple[Resolver, Scope]:
+    resolver = Resolver()
+    for index in range(NAMES):
+        resolver.current_scope.add_symbol(f"global_{index}", index)
+    for level in range(DEPTH):
+        resolver.append_scope()
+        resolver.use_next_scope()
+        resolver.current_scope.add_symbol(f"local_{level}", level)
+    return resolver, resolver.current_scope
+
+
+def _lookups(scope: Scope) -> None:
+    names = [f"global_{index}" for index in range(NAMES)]
+    for _ in range(ROUNDS):
+        for name in names:
+            scope.value_for(name)
+            scope.is_external_symbol(name)
+
+
+def _walked_lookups(scope: Scope) -> None:
+    names = [f"global_{index}" for index in range(NAMES)]
+    for _ in range(ROUNDS):
+        for name in names:
+            scope._find_owner(name)[name]
+            scope._find_external(name)
+
+
+def main() -> None:
+    _, scope = _nested_resolver()
+    lookups = NAMES * ROUNDS
+    report(f"walk {DEPTH} scopes per lookup", best_of(lambda: _walked_lookups(scope)), lookups, "lookups")
+    report("memoized lookup", best_of(lambda: _lookups(scope)), lookups, "lookups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""BRR encoding behind `.incbrr` and `a816 brr`."""
+
+from __future__ import annotations
+
+import io
+import math
+import random
+import wave
+from pathlib import Path
+
+import pytest
+
+from a816.brr import _MAX_SHIFT, BLOCK_BYTES, brr_main, decode_brr, encode_brr, read_wav
+from a816.parse.ast.nodes import IncludeSampleAstNode
+from a816.parse.mzparser import A816Parser
+from a816.parse.nodes import NodeError
+from a816.program import Program
+from tests import emitted
+
+
+def _tone(length: int = 4096) -> list[int]:
+    rng = random.Random(816)
+    return [int(9000 * math.sin(i * 0.06) + 5000 * math.sin(i * 0.29) + rng.randint(-300, 300)) for i in range(length)]
+
+
+def _snr(source: list[int], decoded: list[int]) -> float:
+    noise = sum((a - b) ** 2 for a, b in zip(source, decoded, strict=True))
+    return 10 * math.log10(sum(a * a for a in source) / noise)
+
+
+def _wav(samples: list[int], channels: int = 1, width: int = 2) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(width)
+        writer.setframerate(32000)
+        if width == 1:
+            writer.writeframes(bytes((sample >> 8) + 0x80 for sample in samples))
+        else:
+            writer.writeframes(b"".join(sample.to_bytes(width, "little", signed=True) for sample in samples))
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("signal", ["tone", "sweep"])
+def test_round_trip_snr(signal: str) -> None:
+    if signal == "tone":
+        samples = _tone()
+    else:
+        samples = [int(20000 * math.sin(i * i * 1e-5)) for i in range(4096)]
+
+    encoded = encode_brr(samples)
+
+    assert len(encoded.data) == len(samples) // 16 * BLOCK_BYTES
+    assert _snr(samples, decode_brr(encoded.data)) > 30
+
+
+def test_pruned_search_matches_the_exhaustive_one() -> None:
+    samples = _tone(1024)
+
+    pruned = _snr(samples, decode_brr(encode_brr(samples).data))
+    exhaustive = _snr(samples, decode_brr(encode_brr(samples, shift_window=_MAX_SHIFT).data))
+
+    assert pruned > exhaustive - 0.5
+
+
+def test_flags_and_loop_alignment() -> None:
+    samples = _tone(100)
+
+    one_shot = encode_brr(samples)
+    looped = encode_brr(samples, loop_start=36)
+
+    assert [one_shot.data[index] & 3 for index in range(0, len(one_shot.data), BLOCK_BYTES)] == [0] * 6 + [1]
+    # 12 samples of silence move the loop start to the start of block 3.
+    assert looped.loop_offset == 3 * BLOCK_BYTES
+    assert looped.data[-BLOCK_BYTES] & 3 == 3
+    assert looped.data[3 * BLOCK_BYTES] & 0x0C == 0
+    assert decode_brr(looped.data)[12:112] == pytest.approx(samples, abs=600)
+    with pytest.raises(ValueError, match="whole number of 16-sample blocks"):
+        encode_brr(samples, loop_start=30)
+
+
+def test_wav_formats_are_read_as_mono_16_bit() -> None:
+    assert read_wav(_wav([0x1234, -0x1234]))[0] == [0x1234, -0x1234]
+    assert read_wav(_wav([0x1200, -0x1200], width=1))[0] == [0x1200, -0x1200]
+    assert read_wav(_wav([1000, 3000, -100, -300], channels=2))[0] == [2000, -200]
+    assert read_wav(_wav([0x123456], width=3))[0] == [0x1234]
+
+
+def test_incbrr_emits_blocks_and_loop_symbol(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    samples = _tone(64)
+    Path("bell.wav").write_bytes(_wav(samples))
+    source = '*=0x8000\n.incbrr "bell.wav", 16\n.dw bell_wav__size, bell_wav__loop\n'
+
+    assert emitted(source) == encode_brr(samples, 16).data + b"\x24\x00\x09\x00"
+
+
+def test_incbrr_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("bell.wav").write_bytes(_wav(_tone(64)))
+    Path("noise.wav").write_bytes(b"RIFF....")
+    Path("truncated.wav").write_bytes(b"RIFF")
+    Path("empty.wav").write_bytes(_wav([]))
+
+    with pytest.raises(NodeError, match="loop start 99 is outside"):
+        Program().parser.parse('.incbrr "bell.wav", 99\n')
+    with pytest.raises(NodeError, match="not a PCM WAV"):
+        Program().parser.parse('.incbrr "noise.wav"\n')
+    with pytest.raises(NodeError, match=r"not a PCM WAV file\n"):
+        Program().parser.parse('.incbrr "truncated.wav"\n')
+    with pytest.raises(NodeError, match="WAV has no samples"):
+        Program().parser.parse('.incbrr "empty.wav"\n')
+    with pytest.raises(ValueError, match="no samples to encode"):
+        encode_brr([])
+
+
+def test_canonical_form_and_symbols() -> None:
+    (looped, one_shot) = A816Parser.parse_as_ast('.incbrr "bell.wav",  LOOP * 16\n.incbrr "kick.wav"\n').nodes
+    assert isinstance(looped, IncludeSampleAstNode) and isinstance(one_shot, IncludeSampleAstNode)
+
+    assert looped.to_canonical() == '.incbrr "bell.wav", LOOP * 16'
+    assert looped.auto_symbols == ["bell_wav", "bell_wav__size", "bell_wav__loop"]
+    assert one_shot.auto_symbols == ["kick_wav", "kick_wav__size"]
+
+
+def test_cli_writes_brr(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    sample = tmp_path / "bell.wav"
+    sample.write_bytes(_wav(_tone(64)))
+
+    assert brr_main([str(sample), "--loop", "0"]) == 0
+
+    assert (tmp_path / "bell.brr").read_bytes() == encode_brr(_tone(64), 0).data
+    assert "4 blocks, loop at byte 0x0" in capsys.readouterr().out
@@ -0,0 +1,111 @@
+"""Codecs behind `.incbin_lz` and their output cache."""
+
+from __future__ import annotations
+
+import dataclasses
+import random
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from a816 import asset_cache, compression
+from a816.parse.mzparser import A816Parser
+from a816.parse.nodes import NodeError
+from a816.program import Program
+from tests import emitted
+
+_rng = random.Random(816)
+_SAMPLES = [
+    b"",
+    b"\x42",
+    b"abcabcabcabcabcabcabc",
+    bytes(0x1000),
+    bytes(_rng.randrange(256) for _ in range(0x800)),
+    bytes(_rng.choice(b"\x00\x01\x02\x03") for _ in range(0x3000)),
+    bytes(range(256)) * 40,
+]
+
+
+@pytest.fixture(autouse=True)
+def _no_cache() -> Iterator[None]:
+    asset_cache.disable_asset_cache()
+    yield
+    asset_cache.disable_asset_cache()
+
+
+@pytest.mark.parametrize("codec", sorted(compression.CODECS))
+@pytest.mark.parametrize("data", _SAMPLES, ids=range(len(_SAMPLES)))
+def test_round_trip(codec: str, data: bytes) -> None:
+    packed = compression.CODECS[codec].compress(data)
+
+    assert compression.CODECS[codec].decompress(packed) == data
+
+
+def test_known_encodings() -> None:
+    assert compression.rle_compress(b"ab" + b"c" * 5) == b"\x01ab\x82c\xff"
+    # One literal, then a 3-byte copy from 1 byte back.
+    assert compression.lz77_compress(b"aaaa") == b"\x10\x04\x00\x00\x40a\x00\x00"
+    assert compression.lz4snes_compress(b"") == b"\x00\x00\x00"
+
+
+def test_repetitive_data_shrinks() -> None:
+    data = b"".join(bytes([index % 7]) * 16 for index in range(0x400))
+
+    assert all(len(codec.compress(data)) < len(data) // 4 for codec in compression.CODECS.values())
+
+
+def test_corrupt_streams_are_errors() -> None:
+    with pytest.raises(ValueError, match="truncated"):
+        compression.lz77_decompress(compression.lz77_compress(b"x" * 100)[:-1])
+    with pytest.raises(ValueError, match="back"):
+        compression.lz4snes_decompress(b"\x08\x00\x10a\x05\x00")
+    with pytest.raises(ValueError, match="0xffff"):
+        compression.lz4snes_compress(bytes(0x10000))
+
+
+def test_incbin_lz_emits_the_compressed_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("map.bin").write_bytes(b"\x07" * 40)
+
+    assert emitted('*=0x8000\n.incbin_lz "map.bin", "rle"\n.db map_bin__size\n') == b"\xa5\x07\xff\x03"
+
+
+def test_unknown_codec_is_an_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("map.bin").write_bytes(b"\x00")
+
+    with pytest.raises(NodeError, match="unknown codec 'zip'"):
+        Program().parser.parse('.incbin_lz "map.bin", "zip"\n')
+
+
+def test_canonical_form() -> None:
+    (node,) = A816Parser.parse_as_ast('.incbin_lz "map.bin",   "lz4snes"\n').nodes
+
+    assert node.to_canonical() == '.incbin_lz "map.bin", "lz4snes"'
+
+
+def test_rebuild_reads_the_disk_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    data = bytes(range(64)) * 8
+    asset_cache.enable_asset_cache(tmp_path)
+    packed = compression.compress(data, "lz77")
+    assert len(list(tmp_path.glob("*.bin"))) == 1
+
+    # As in a fresh process: nothing in memory, and the encoder must not run.
+    asset_cache._memo.clear()
+    codec = compression.CODECS["lz77"]
+    monkeypatch.setitem(compression.CODECS, "lz77", dataclasses.replace(codec, compress=_unexpected))
+
+    assert compression.compress(data, "lz77") == packed
+
+
+def test_unwritable_disk_cache_is_skipped(tmp_path: Path) -> None:
+    (tmp_path / "assets").write_bytes(b"")
+    asset_cache.enable_asset_cache(tmp_path / "assets")
+
+    assert compression.compress(b"\x07" * 40, "rle") == b"\xa5\x07\xff"
+    assert [path.name for path in tmp_path.iterdir()] == ["assets"]
+
+
+def _unexpected(data: bytes) -> bytes:
+    raise AssertionError("compressed again")
@@ -0,0 +1,71 @@
+"""Codegen folds expressions over literals and immutable names into integer literals."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from a816.object_file import ObjectFile
+from a816.parse.nodes import ExpressionNode, OpcodeNode
+from a816.program import Program
+from tests import emitted
+
+
+def _operands(source: str) -> list[str]:
+    program = Program()
+    error, nodes = program.parser.parse(source)
+    assert error is None
+    return [
+        node.value_node.expression.to_canonical()
+        for node in nodes
+        if isinstance(node, OpcodeNode) and isinstance(node.value_node, ExpressionNode)
+    ]
+
+
+def test_literals_and_constants_fold() -> None:
+    source = "DMA_BASE = 0x4300\nCHANNEL = DMA_BASE + 0x10 * 3\nlda.w CHANNEL + 2\nlda.w 1 << 4\n"
+
+    assert _operands(source) == ["17202", "16"]
+    assert emitted("*=0x8000\n" + source) == b"\xad\x32\x43\xad\x10\x00"
+
+
+def test_struct_offsets_fold_inside_symbolic_expression() -> None:
+    source = ".struct Entity {\n    word x\n    word y\n}\nentities:\nlda.w entities + Entity.y * 2\n"
+
+    assert _operands(source) == ["entities + 4"]
+
+
+def test_reassigned_name_stays_symbolic() -> None:
+    source = "COUNT := 1\nlda.w COUNT + 1\nCOUNT := 2\n"
+
+    assert _operands(source) == ["COUNT + 1"]
+    assert emitted("*=0x8000\n" + source) == b"\xad\x03\x00"
+
+
+def test_name_also_bound_as_label_stays_symbolic() -> None:
+    source = "OFFSET = 4\n{\n    lda.w OFFSET\nOFFSET:\n}\n"
+
+    assert _operands(source) == ["OFFSET"]
+
+
+def test_constant_over_reassigned_name_stays_symbolic() -> None:
+    source = "BASE := 0x10\nPTR = BASE + 1\nlda.w PTR\nBASE := 0x20\n"
+
+    assert _operands(source) == ["PTR"]
+    assert emitted("*=0x8000\n" + source) == b"\xad\x21\x00"
+
+
+def test_name_reused_as_macro_argument_stays_symbolic_everywhere() -> None:
+    source = "SIZE = 2\n.macro load(SIZE) {\n    lda.w SIZE\n}\nload(3)\nlda.w SIZE\n"
+
+    assert _operands(source) == ["SIZE", "SIZE"]
+    assert emitted("*=0x8000\n" + source) == b"\xad\x03\x00\xad\x02\x00"
+
+
+def test_object_relocation_carries_folded_expression(tmp_path: Path) -> None:
+    source = tmp_path / "main.s"
+    source.write_text(".extern table\nSTRIDE = 4\nlda.l table + STRIDE * 3\n", encoding="utf-8")
+
+    assert Program().assemble_as_object(str(source), tmp_path / "main.o") == 0
+
+    relocations = ObjectFile.from_file(str(tmp_path / "main.o")).sections[0].expression_relocations
+    assert [expression for _, expression, _ in relocations] == ["table + 12"]
@@ -0,0 +1,48 @@
+"""`.db`/`.dw`/`.dl` directives generate one `DataArrayNode` each."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from a816.object_file import ObjectFile
+from a816.parse.nodes import DataArrayNode
+from a816.program import Program
+
+
+def _arrays(source: str) -> tuple[Program, list[DataArrayNode]]:
+    program = Program()
+    error, nodes = program.parser.parse(source)
+    assert error is None
+    program.resolve_labels(nodes)
+    return program, [node for node in nodes if isinstance(node, DataArrayNode)]
+
+
+def test_each_directive_is_one_array_of_its_width() -> None:
+    program, arrays = _arrays("*=0x8000\nBASE = 0x10\n.db 1, 0x1FF, -1\n.dw BASE, 0x1234\n.dl end, 0xABCDEF\nend:\n")
+
+    assert [(array.size, array.byte_count) for array in arrays] == [(1, 3), (2, 4), (3, 6)]
+    address = program.resolver.reloc_address
+    assert [array.emit(address) for array in arrays] == [
+        b"\x01\xff\xff",
+        b"\x10\x00\x34\x12",
+        b"\x0d\x80\x00\xef\xcd\xab",
+    ]
+
+
+def test_only_symbolic_entries_are_evaluated_again() -> None:
+    program, (array,) = _arrays("*=0x8000\nvalue := 0\nvalue := 1\n.dw 0x0102, value, 3\n")
+    address = program.resolver.reloc_address
+
+    assert array.emit(address) == b"\x02\x01\x01\x00\x03\x00"
+    program.resolver.current_scope.add_symbol("value", 0x0405)
+    assert array.emit(address) == b"\x02\x01\x05\x04\x03\x00"
+
+
+def test_object_relocations_land_at_their_entry_offsets(tmp_path: Path) -> None:
+    source = tmp_path / "main.s"
+    source.write_text(".extern table\n.dw 1, table, 2, table + 1\n.dl 0, table\n", encoding="utf-8")
+
+    assert Program().assemble_as_object(str(source), tmp_path / "main.o") == 0
+
+    section = ObjectFile.from_file(str(tmp_path / "main.o")).sections[0]
+    assert section.expression_relocations == [(2, "table", 2), (6, "table + 1", 2), (11, "table", 3)]
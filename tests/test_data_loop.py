@@ -0,0 +1,64 @@
+"""`.for` loops over data directives stay rolled in one `DataLoopNode`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from a816.module_builder import build_with_imports
+from a816.object_file import ObjectFile
+from a816.parse.nodes import DataLoopNode, SymbolNode
+from a816.program import Program
+from tests import emitted
+
+_TABLE = "*=0x8000\nBASE = 0x10\n.for i := 0, 4 {\n    ; entry\n    .db i, BASE + i\n    .dw i * 0x100\n}\nafter:\n.dl after\n"
+
+
+def test_data_only_body_generates_one_loop_node() -> None:
+    program = Program()
+    error, nodes = program.parser.parse(_TABLE)
+    assert error is None
+
+    (loop,) = [node for node in nodes if isinstance(node, DataLoopNode)]
+    assert len(loop.body) == 2
+    assert loop.iteration_size == 4
+    assert not [node for node in nodes if isinstance(node, SymbolNode) and node.symbol_name == "i"]
+
+
+def test_rolled_table_emits_every_iteration_and_advances_the_pc() -> None:
+    entries = b"".join(bytes([i, 0x10 + i]) + (i * 0x100).to_bytes(2, "little") for i in range(4))
+
+    assert emitted(_TABLE) == entries + b"\x10\x80\x00"
+
+
+def test_body_with_code_is_still_unrolled() -> None:
+    source = "*=0x8000\n.for i := 0, 3 {\n    .db i\n    lda.b #i\n}\n"
+    program = Program()
+    error, nodes = program.parser.parse(source)
+    assert error is None
+
+    assert not [node for node in nodes if isinstance(node, DataLoopNode)]
+    assert emitted(source) == b"\x00\xa9\x00\x01\xa9\x01\x02\xa9\x02"
+
+
+_LABEL_TABLE = "*=0x8000\n.for i := 0, 3 {\n    .db i\n    .dw entries\n}\nentries:\n.db 0xff\n"
+_LABEL_TABLE_BYTES = bytes.fromhex("000980010980020980ff")
+
+
+def test_object_mode_relocates_every_iteration(tmp_path: Path) -> None:
+    source = tmp_path / "main.s"
+    source.write_text(_LABEL_TABLE)
+    assert Program().assemble_as_object(str(source), tmp_path / "main.o") == 0
+
+    (section,) = ObjectFile.from_file(str(tmp_path / "main.o")).sections
+    assert section.code == _LABEL_TABLE_BYTES
+    assert section.expression_relocations == [(1, "entries", 2), (4, "entries", 2), (7, "entries", 2)]
+
+
+def test_linked_build_emits_rolled_table(tmp_path: Path) -> None:
+    source = tmp_path / "main.s"
+    source.write_text(_LABEL_TABLE)
+    out = tmp_path / "out.sfc"
+
+    result = build_with_imports(source, out, output_format="sfc", output_dir=tmp_path / "build")
+    assert result.exit_code == 0
+    assert out.read_bytes()[: len(_LABEL_TABLE_BYTES)] == _LABEL_TABLE_BYTES
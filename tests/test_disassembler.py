@@ -1,6 +1,7 @@
 """Tests for 65c816 disassembler."""
 
 from a816.cpu.disassembler import (
+    DECODE_TABLES,
     OPCODE_TABLE,
     AddrMode,
     Disassembler,
@@ -8,6 +9,7 @@ from a816.cpu.disassembler import (
     collect_labels,
     format_disassembly,
     format_disassembly_block,
+    operand_formatter,
 )
 
 
@@ -38,6 +40,49 @@ class TestOpcodeTable:
             assert isinstance(size, int)
 
 
+class TestDecodeTables:
+    """The per-(M, X) flat tables agree with OPCODE_TABLE."""
+
+    def test_four_tables_of_256(self) -> None:
+        assert [len(table) for tables in DECODE_TABLES for table in tables] == [256] * 4
+
+    def test_entries_match_opcode_table(self) -> None:
+        for m_flag in (False, True):
+            for x_flag in (False, True):
+                disasm = Disassembler(m_flag=m_flag, x_flag=x_flag)
+                table = DECODE_TABLES[m_flag][x_flag]
+                for opcode in range(256):
+                    entry = table[opcode]
+                    if opcode not in OPCODE_TABLE:
+                        assert entry is None
+                        continue
+                    mnemonic, mode, base_size = OPCODE_TABLE[opcode]
+                    assert entry is not None
+                    assert (entry.mnemonic, entry.mode) == (mnemonic, mode)
+                    assert entry.length == 1 + disasm.get_operand_size(base_size)
+                    assert entry.sets_flags == (mnemonic in ("rep", "sep"))
+                    assert entry.format is operand_formatter(mnemonic, mode)
+
+    def test_immediate_width_follows_flags(self) -> None:
+        lengths = {
+            (m_flag, x_flag, opcode): entry.length
+            for m_flag in (False, True)
+            for x_flag in (False, True)
+            for opcode in (0xA9, 0xA2)
+            if (entry := DECODE_TABLES[m_flag][x_flag][opcode]) is not None
+        }
+        assert lengths[(True, True, 0xA9)] == 2  # lda #imm, M=1
+        assert lengths[(False, True, 0xA9)] == 3  # lda #imm, M=0
+        assert lengths[(True, False, 0xA2)] == 3  # ldx #imm, X=0
+
+    def test_decoded_instructions_carry_the_entry_formatter(self) -> None:
+        inst = Disassembler().decode_instruction(bytes([0x4C, 0x00, 0x80]), 0x008000)
+        entry = DECODE_TABLES[True][True][0x4C]
+        assert inst is not None and entry is not None
+        assert inst.formatter is entry.format
+        assert inst.format_operand(label_map={0x008000: "start"}) == "start"
+
+
 class TestDisassembler:
     """Tests for the Disassembler class."""
 
@@ -203,6 +248,28 @@ class TestDisassembler:
         instructions = disasm.disassemble(b"", 0x8000)
         assert len(instructions) == 0
 
+    def test_decode_at_offset_matches_slice(self) -> None:
+        code = bytes([0xEA, 0xAD, 0x34, 0x12, 0x22, 0x56, 0x34, 0x12])
+        for offset in (0, 1, 4):
+            assert Disassembler().decode_instruction(code, 0x8000, offset) == Disassembler().decode_instruction(
+                code[offset:], 0x8000
+            )
+
+    def test_decode_at_offset_past_end(self) -> None:
+        assert Disassembler().decode_instruction(b"\xea", 0x8000, 1) is None
+
+    def test_decode_at_offset_truncated_operand(self) -> None:
+        inst = Disassembler().decode_instruction(b"\xea\xad\x34", 0x8001, 1)
+        assert inst is not None
+        assert inst.mnemonic == ".db"
+        assert inst.operand_bytes == b"\xad\x34"
+
+    def test_disassemble_memoryview(self) -> None:
+        code = bytes([0xA9, 0x12, 0x8D, 0x00, 0x21, 0x60])
+        from_view = Disassembler().disassemble(memoryview(code), 0x8000)
+        assert from_view == Disassembler().disassemble(code, 0x8000)
+        assert all(type(inst.operand_bytes) is bytes for inst in from_view)
+
 
 class TestInstruction:
     """Tests for the Instruction class."""
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from a816.parse.ast.expression import eval_expression_str
+from a816.parse.ast.expression import eval_expression, eval_expression_str, expr_to_ast
 from a816.parse.errors import ParserSyntaxError
 from a816.symbols import Resolver
 
@@ -109,3 +109,16 @@ class ExpressionsTest(TestCase):
 
         value = eval_expression_str("0x2 < 0b100", resolver)
         self.assertTrue(value)
+
+    def test_compiled_once_and_reevaluated_against_current_values(self) -> None:
+        resolver = Resolver()
+        resolver.current_scope.add_symbol("base", 0x100)
+        expression = expr_to_ast("(base + 2) * 3 - 1")
+
+        self.assertEqual(eval_expression(expression, resolver), 0x305)
+        program = expression.compiled
+        self.assertIsNotNone(program)
+
+        resolver.current_scope.add_symbol("base", 0x200)
+        self.assertEqual(eval_expression(expression, resolver), 0x605)
+        self.assertIs(expression.compiled, program)
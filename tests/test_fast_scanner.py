@@ -0,0 +1,108 @@
+"""Differential tests: `FastScanner` must lex exactly like `Scanner(lex_initial)`."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from a816.parse.fast_scanner import FastScanner
+from a816.parse.scanner import Scanner
+from a816.parse.scanner_states import lex_initial
+from a816.parse.tokens import Token, TokenType
+
+ROOT = Path(__file__).resolve().parents[1]
+CORPUS = sorted(ROOT.glob("a816/stdlib/**/*.s")) + sorted(ROOT.glob("tests/**/*.s"))
+
+SNIPPETS = [
+    "",
+    "\n\n",
+    "nop",
+    "nop ; naked\ninx\n",
+    "asl\nasl a\n",
+    "lda #0x12\nsta.w foo,x\nlda (dp),y\nlda [dp],y\nlda (1,s),y\n",
+    "lda.b 3\njsr.l far ; call\n",
+    "mvn 0x7e, 0x7f\nmvp src,dst\n",
+    "loop: dex\nbne loop\n",
+    "x := 3 + (y << 2) * 4\nfoo.bar = 3\n",
+    "*= 0x8000\n@= 0x1000\n",
+    ".if a >= 2 {\n.db 1, 2, 3\n} .else {\n.dw 0b101, 0o17, 012\n}\n",
+    ".macro m(a, b) {{\n lda #a\n}}\n",
+    "lda (ptr).field.sub\nlda [ptr].x\n",
+    ".text \"esc\\\"aped\"\n.ascii 'it\\'s'\n",
+    '"""doc\nstring"""\nlda #1\n',
+    "'''doc\\'''\n'''\nnop\n",
+    "/* multi\nline */ lda #1\n",
+    'lda \'c\'\nlda #"""x\ny"""\n',
+    "lda\t0x12\n\tnop\n",
+    "0\n1\n0x\n0b102\n",
+    # Everything below makes the reference scanner raise: the fast path must defer to it.
+    ".unknown 1\nlda #1\n",
+    "lda 1,q\n",
+    "lda.q 1\n",
+    "'unterminated\nnop\n",
+    '"""never closed\nnop\n',
+    "/* never closed",
+    "lda # $12\n",
+    "a\0b\n",
+]
+
+_FUZZ_ALPHABET = [*" \t\n\n;:=.,()[]{}#*+-/&|~<>!@'\"\\0123x9bo"] + [
+    "lda", "nop", "mvn", "rts", "foo", "x", "y", ".w", ".db", ".b", '"""', "'''", "/*", "*/",
+    "0x1F", "label:", " ,x", "sta.l", "jsr", "a.b", ".macro", "inx",
+]  # fmt: skip
+
+
+def _signature(tokens: list[Token]) -> list[tuple[object, ...]]:
+    return [
+        (t.type, t.value, t.position.line if t.position else None, t.position.column if t.position else None)
+        for t in tokens
+    ]
+
+
+def _assert_same(source: str) -> None:
+    reference = Scanner(lex_initial)
+    expected = reference.scan("test.s", source)
+    fast = FastScanner()
+    actual = fast.scan("test.s", source)
+    assert _signature(actual) == _signature(expected)
+    assert [(str(e), str(e.position)) for e in fast.errors] == [(str(e), str(e.position)) for e in reference.errors]
+    assert fast.file.lines == reference.file.lines
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda p: str(p.relative_to(ROOT)))
+def test_corpus_matches_reference(path: Path) -> None:
+    _assert_same(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("source", SNIPPETS)
+def test_snippet_matches_reference(source: str) -> None:
+    _assert_same(source)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_input_matches_reference(seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(500):
+        _assert_same("".join(rng.choice(_FUZZ_ALPHABET) for _ in range(rng.randrange(1, 30))))
+
+
+def test_errors_are_collected_through_fallback() -> None:
+    scanner = FastScanner()
+    tokens = scanner.scan("test.s", ".bogus\nnop\n")
+    assert [str(e) for e in scanner.errors] == ["unknown directive `.bogus`"]
+    assert [t.value for t in tokens] == ["nop", ""]
+
+
+def test_positions_are_derived_lazily() -> None:
+    tokens = FastScanner().scan("test.s", "nop\n  lda #1\n")
+    lda = tokens[1]
+    assert lda._position is None
+    assert lda.position is not None
+    assert (lda.position.line, lda.position.column, lda.position.file.filename) == (1, 2, "test.s")
+    assert lda.position is lda.position
+
+
+def test_repeated_values_are_shared() -> None:
+    tokens = FastScanner().scan("test.s", ".db 0x1234, 0x1234\n")
+    first, second = (t for t in tokens if t.type == TokenType.NUMBER)
+    assert first.value is second.value
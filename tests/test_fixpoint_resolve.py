@@ -0,0 +1,113 @@
+"""Worklist label resolution: passes repeat until symbols settle, and only
+nodes whose inputs moved are evaluated again."""
+
+from __future__ import annotations
+
+import pytest
+
+from a816.cpu.mapping import Address
+from a816.parse.nodes import NodeError
+from a816.program import Program
+from a816.program.fixpoint import MAX_PASSES
+from a816.protocols import NodeProtocol
+from a816.symbols import Resolver
+from tests import emitted
+
+
+class _CountingNode(NodeProtocol):
+    """Binds `name` to a new value on every pass, cycling through `period` values."""
+
+    def __init__(self, resolver: Resolver, name: str, period: int) -> None:
+        self.resolver = resolver
+        self.name = name
+        self.period = period
+        self.calls = 0
+
+    def emit(self, current_addr: Address) -> bytes:
+        return b""
+
+    def pc_after(self, current_pc: Address) -> Address:
+        self.resolver.current_scope.add_symbol(self.name, self.calls % self.period)
+        self.calls += 1
+        return current_pc
+
+
+def _resolved(source: str) -> tuple[Program, list[NodeProtocol]]:
+    program = Program()
+    error, nodes = program.parser.parse(source)
+    assert error is None
+    program.resolve_labels(nodes)
+    return program, nodes
+
+
+def test_second_pass_only_revisits_nodes_reading_moved_symbols() -> None:
+    body = "".join(f"lda.w #{index}\nsta.w 0x2100\n" for index in range(50))
+    program, nodes = _resolved(f"*=0x8000\nstart:\n{body}PTR = start + 2\nlda.w PTR\nend:\n")
+
+    stats = program.resolve_stats
+    assert stats is not None
+    # PTR is first bound on pass two, so its reader runs once more on pass three.
+    assert stats.passes == 3
+    assert stats.evaluated[0] == len(nodes) - 1  # the deferred symbol waits for pass two
+    assert stats.evaluated[2] == 2  # the PTR reader, plus `*=` which always runs
+    assert stats.revisited < 10
+    assert program.resolver.current_scope.value_for("PTR") == 0x8002
+    assert program.resolver.current_scope.value_for("end") == 0x8000 + 50 * 6 + 3
+
+
+def test_resolution_matches_emitted_layout() -> None:
+    source = "*=0x8000\nstart:\nlda.w PTR\nPTR = start + 3\nnext:\njmp.w next\n"
+
+    assert emitted(source) == b"\xad\x03\x80\x4c\x03\x80"
+
+
+@pytest.mark.parametrize(("period", "reason"), [(2, "oscillate"), (MAX_PASSES + 2, "still change")])
+def test_symbols_that_never_settle_are_reported(period: int, reason: str) -> None:
+    program = Program()
+    error, nodes = program.parser.parse("*=0x8000\nlda.w 0\n")
+    assert error is None
+    nodes.append(_CountingNode(program.resolver, "drift", period))
+
+    with pytest.raises(NodeError, match=f"Symbol values {reason} after .*: drift") as excinfo:
+        program.resolve_labels(nodes)
+
+    assert excinfo.value.code == "E0203"
+
+
+@pytest.mark.parametrize(
+    ("operand", "values", "lengths", "measured"),
+    [
+        # A bare symbol is measured again only when its value class changes.
+        ("target", [0x12, 0x34, 0x1234, 0x1235, 0x12], [2, 2, 3, 3, 2], [1, 1, 2, 2, 3]),
+        # Any other expression is measured again whenever a symbol it names moves.
+        ("target + 1", [0x12, 0x12, 0x34], [2, 2, 2], [1, 1, 2]),
+    ],
+)
+def test_opcode_length_is_measured_again_only_when_its_inputs_move(
+    operand: str, values: list[int], lengths: list[int], measured: list[int]
+) -> None:
+    program = Program()
+    error, nodes = program.parser.parse(f"lda {operand}\n")
+    assert error is None
+    (opcode,) = nodes
+    resolver = program.resolver
+    start = resolver.get_bus().get_address(0x8000)
+
+    for value, length, count in zip(values, lengths, measured, strict=True):
+        resolver.current_scope.add_symbol("target", value)
+        assert opcode.pc_after(start).logical_value - start.logical_value == length
+        assert resolver.size_measurements == count
+
+
+def test_alloc_body_sizes_are_reused_on_later_passes() -> None:
+    body = "".join(f"entry_{index}:\nlda entry_{index}\njsr entry_0\n" for index in range(20))
+    program, _ = _resolved(
+        f".pool bank {{\n    range 0x008000 0x00FFFF\n    strategy order\n}}\n.alloc table in bank {{\n{body}}}\n"
+    )
+
+    stats = program.resolve_stats
+    assert stats is not None
+    # Pass one measures the body; the passes placing and settling its labels reuse those sizes.
+    assert stats.passes == 3
+    assert stats.measured == [40, 0, 0]
+    assert program.resolver.current_scope.value_for("entry_19") == 0x8000 + 19 * 6
@@ -0,0 +1,145 @@
+"""Indexed PNG conversion behind `.incgfx` and `a816 gfx`."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+
+from a816 import asset_cache
+from a816.gfx import IndexedImage, convert_image, gfx_main, read_indexed_png
+from a816.parse.mzparser import A816Parser
+from a816.parse.nodes import NodeError
+from a816.program import Program
+from tests import emitted
+
+_PALETTE = [(0, 0, 0), (255, 255, 255), (255, 0, 0), (0, 255, 0)]
+
+
+def _filtered(kind: int, row: bytes, previous: bytes) -> bytes:
+    out = bytearray()
+    for index, value in enumerate(row):
+        left = row[index - 1] if index else 0
+        up = previous[index]
+        up_left = previous[index - 1] if index else 0
+        estimate = left + up - up_left
+        paeth = min((abs(estimate - left), 0, left), (abs(estimate - up), 1, up), (abs(estimate - up_left), 2, up_left))
+        predictor = [0, left, up, (left + up) >> 1, paeth[2]][kind]
+        out.append((value - predictor) & 0xFF)
+    return bytes(out)
+
+
+def _png(pixels: list[list[int]], depth: int = 8, palette: list[tuple[int, int, int]] = _PALETTE) -> bytes:
+    """Indexed PNG of `pixels`, each scanline using the next filter type."""
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    raw = bytearray()
+    previous = bytes((len(pixels[0]) * depth + 7) // 8)
+    for number, row in enumerate(pixels):
+        bits = "".join(f"{value:0{depth}b}" for value in row)
+        packed = int(bits.ljust(len(previous) * 8, "0"), 2).to_bytes(len(previous), "big")
+        raw += bytes([number % 5]) + _filtered(number % 5, packed, previous)
+        previous = packed
+    header = struct.pack(">IIBBBBB", len(pixels[0]), len(pixels), depth, 3, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"PLTE", b"".join(bytes(color) for color in palette))
+        + chunk(b"IDAT", zlib.compress(bytes(raw)))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _image(tiles: list[list[list[int]]]) -> list[list[int]]:
+    """Pixel rows of 8x8 `tiles` laid out left to right."""
+    return [[value for tile in tiles for value in tile[y]] for y in range(8)]
+
+
+_ARROW = [[1 if x <= y else 0 for x in range(8)] for y in range(8)]
+
+
+@pytest.mark.parametrize("depth", [1, 2, 4, 8])
+def test_png_decodes_every_filter_and_depth(depth: int) -> None:
+    pixels = [[(x * 3 + y * 5) % (1 << depth) for x in range(13)] for y in range(7)]
+
+    image = read_indexed_png(_png(pixels, depth))
+
+    assert (image.width, image.height, image.palette) == (13, 7, _PALETTE)
+    assert image.pixels == bytes(value for row in pixels for value in row)
+
+
+def test_planar_layout_per_bpp() -> None:
+    def first_row(value: int) -> IndexedImage:
+        return IndexedImage(8, 8, bytes([value] * 8 + [0] * 56), _PALETTE)
+
+    assert convert_image(first_row(0b10), 2).tiles == b"\x00\xff" + bytes(14)
+    assert convert_image(first_row(0b1011), 4).tiles == b"\xff\xff" + bytes(14) + b"\x00\xff" + bytes(14)
+    assert convert_image(first_row(0x81), 8).tiles == b"\xff" + bytes(47) + b"\x00\xff" + bytes(14)
+
+
+def test_flipped_tiles_are_stored_once() -> None:
+    hflip = [row[::-1] for row in _ARROW]
+    vflip = _ARROW[::-1]
+    pixels = _image([_ARROW, hflip, vflip, [row[::-1] for row in vflip], _ARROW])
+
+    tile_set = convert_image(read_indexed_png(_png(pixels)), 2)
+
+    assert len(tile_set.tiles) == 16
+    assert struct.unpack("<5H", tile_set.tilemap) == (0, 0x4000, 0x8000, 0xC000, 0)
+    assert tile_set.palette == b"\x00\x00\xff\x7f\x1f\x00\xe0\x03"
+
+
+def test_high_index_bits_select_the_tile_palette() -> None:
+    pixels = _image([[[0x21] * 8] * 8, [[0x11, 0x12] * 4] * 8])
+
+    tile_set = convert_image(read_indexed_png(_png(pixels, palette=_PALETTE * 16)), 4)
+
+    assert struct.unpack("<2H", tile_set.tilemap) == (2 << 10, 1 << 10 | 1)
+    with pytest.raises(ValueError, match="mixes palettes 0, 1"):
+        convert_image(IndexedImage(8, 8, bytes([0x01, 0x11] * 32), []), 4)
+
+
+def test_incgfx_emits_each_part(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("font.png").write_bytes(_png(_image([_ARROW, _ARROW])))
+    source = (
+        '*=0x8000\n.incgfx "font.png", 2\n.incgfx "font.png", 1 + 1, "map"\n.db font_png__size, font_png__map__size\n'
+    )
+    tile_set = convert_image(read_indexed_png(Path("font.png").read_bytes()), 2)
+    assert emitted(source) == tile_set.tiles + tile_set.tilemap + b"\x10\x04"
+
+
+def test_incgfx_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("odd.png").write_bytes(_png([[0] * 12] * 8))
+
+    with pytest.raises(NodeError, match="not a whole number of 8x8 tiles"):
+        Program().parser.parse('.incgfx "odd.png", 4\n')
+    with pytest.raises(NodeError, match="part must be one of"):
+        Program().parser.parse('.incgfx "odd.png", 4, "sprites"\n')
+
+
+def test_canonical_form() -> None:
+    (node,) = A816Parser.parse_as_ast('.incgfx "font.png",  BPP,   "palette"\n').nodes
+
+    assert node.to_canonical() == '.incgfx "font.png", BPP, "palette"'
+
+
+def test_cli_writes_parts_and_fills_the_cache(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    image = tmp_path / "font.png"
+    image.write_bytes(_png(_image([_ARROW, [[0] * 8] * 8])))
+    asset_cache.enable_asset_cache(tmp_path / "cache")
+    try:
+        assert gfx_main([str(image), "--bpp", "2", "-o", str(tmp_path / "out")]) == 0
+    finally:
+        asset_cache.disable_asset_cache()
+
+    assert (tmp_path / "out" / "font.tiles").stat().st_size == 32
+    assert (tmp_path / "out" / "font.map").read_bytes() == b"\x00\x00\x01\x00"
+    assert (tmp_path / "out" / "font.pal").stat().st_size == 8
+    assert len(list((tmp_path / "cache").glob("*.bin"))) == 1
+    assert "2 tiles, 2 map entries" in capsys.readouterr().out
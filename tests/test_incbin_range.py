@@ -0,0 +1,68 @@
+"""`.incbin "path", offset, length` regions and the shared asset cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from a816 import util
+from a816.parse.mzparser import A816Parser
+from a816.parse.nodes import NodeError
+from a816.program import Program
+from a816.util import ASSET_MAP_THRESHOLD, read_asset
+from tests import emitted
+
+
+def test_region_of_a_file_and_its_size_symbol(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("dump.bin").write_bytes(bytes(range(16)))
+
+    assert emitted('*=0x8000\n.incbin "dump.bin", 2 + 2, 3\n.db dump_bin__size\n') == b"\x04\x05\x06\x03"
+    assert emitted('*=0x8000\n.incbin "dump.bin", 14\n') == b"\x0e\x0f"
+
+
+def test_region_past_the_end_is_an_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("dump.bin").write_bytes(bytes(16))
+
+    with pytest.raises(NodeError, match="outside the file"):
+        Program().parser.parse('.incbin "dump.bin", 12, 8\n')
+
+
+def test_range_round_trips_through_canonical_form() -> None:
+    (node,) = A816Parser.parse_as_ast('.incbin "dump.bin", 0x10, LENGTH\n').nodes
+
+    assert node.to_canonical() == '.incbin "dump.bin", 0x10, LENGTH'
+
+
+def test_asset_is_shared_until_the_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "large.bin"
+    path.write_bytes(b"\x01" * ASSET_MAP_THRESHOLD)
+
+    first = read_asset(str(path))
+    assert read_asset(str(path)) is first
+    assert first[:2] == b"\x01\x01"
+
+    # Replace the file rather than rewrite it under the live map.
+    replacement = tmp_path / "large.bin.new"
+    replacement.write_bytes(b"\x02" * (ASSET_MAP_THRESHOLD + 1))
+    os.replace(replacement, path)
+    assert read_asset(str(path))[:2] == b"\x02\x02"
+    assert first[:2] == b"\x01\x01"
+
+
+def test_asset_cache_keeps_the_most_recent_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(util, "_ASSET_ENTRIES", 2)
+    monkeypatch.setattr(util, "_assets", {})
+    paths = [tmp_path / f"{index}.bin" for index in range(3)]
+    for path in paths:
+        path.write_bytes(b"\x00")
+
+    first = read_asset(str(paths[0]))
+    read_asset(str(paths[1]))
+    assert read_asset(str(paths[0])) is first
+    read_asset(str(paths[2]))
+
+    assert list(util._assets) == [str(paths[0]), str(paths[2])]
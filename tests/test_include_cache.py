@@ -0,0 +1,76 @@
+"""Parsed-include cache: a header included several times is parsed once, and
+an edit to it (or to a header it includes) is picked up on the next parse."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from a816.parse.ast.nodes import IncludeAstNode
+from a816.parse.mzparser import A816Parser
+from a816.parse.parser_states.directives import clear_include_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> Iterator[None]:
+    clear_include_cache()
+    yield
+    clear_include_cache()
+
+
+def _includes(source: str, tmp_path: Path) -> list[IncludeAstNode]:
+    result = A816Parser.parse_as_ast(source, str(tmp_path / "main.s"), include_paths=[tmp_path])
+    assert result.error is None
+    return [node for node in result.nodes if isinstance(node, IncludeAstNode)]
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_repeated_include_shares_body_with_own_position(tmp_path: Path) -> None:
+    (tmp_path / "regs.s").write_text("INIDISP = 0x2100\n")
+
+    first, second = _includes(".include 'regs.s'\nnop\n.include 'regs.s'\n", tmp_path)
+
+    assert first.included_nodes[0] is second.included_nodes[0]
+    assert first.included_nodes is not second.included_nodes
+    first_position, second_position = first.file_info.position, second.file_info.position
+    body_position = second.included_nodes[0].file_info.position
+    assert first_position is not None and second_position is not None and body_position is not None
+    assert first_position.line == 0
+    assert second_position.line == 2
+    assert body_position.file.filename.endswith("regs.s")
+
+
+def test_edited_include_is_reparsed(tmp_path: Path) -> None:
+    header = tmp_path / "regs.s"
+    header.write_text("INIDISP = 0x2100\n")
+    (before,) = _includes(".include 'regs.s'\n", tmp_path)
+
+    header.write_text("INIDISP = 0x2101\n")
+    _bump_mtime(header)
+    (after,) = _includes(".include 'regs.s'\n", tmp_path)
+
+    assert after.included_nodes[0] is not before.included_nodes[0]
+    assert after.included_nodes[0].to_canonical() == "INIDISP = 0x2101"
+
+
+def test_edited_nested_include_invalidates_outer(tmp_path: Path) -> None:
+    inner = tmp_path / "inner.s"
+    inner.write_text("A = 1\n")
+    (tmp_path / "outer.s").write_text(".include 'inner.s'\n")
+    (before,) = _includes(".include 'outer.s'\n", tmp_path)
+
+    inner.write_text("A = 2\n")
+    _bump_mtime(inner)
+    (after,) = _includes(".include 'outer.s'\n", tmp_path)
+
+    nested = after.included_nodes[0]
+    assert isinstance(nested, IncludeAstNode)
+    assert nested is not before.included_nodes[0]
+    assert nested.included_nodes[0].to_canonical() == "A = 2"
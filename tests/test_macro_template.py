@@ -0,0 +1,60 @@
+"""Macro bodies are lowered once and instantiated per application."""
+
+from __future__ import annotations
+
+from a816.parse.ast.nodes import MacroAstNode
+from a816.parse.codegen import code_gen
+from a816.parse.mzparser import A816Parser
+from a816.parse.nodes import ExpressionNode, OpcodeNode
+from a816.program import Program
+from tests import emitted
+
+
+def _opcodes(source: str) -> list[OpcodeNode]:
+    program = Program()
+    error, nodes = program.parser.parse(source)
+    assert error is None
+    return [node for node in nodes if isinstance(node, OpcodeNode)]
+
+
+def _operand(node: OpcodeNode) -> str:
+    assert isinstance(node.value_node, ExpressionNode)
+    return node.value_node.expression.to_canonical()
+
+
+def test_template_is_lowered_once_and_shared_by_applications() -> None:
+    ast = A816Parser.parse_as_ast(".macro store(value) {\n    lda.b #value\n    sta.w 0x2100\n}\nstore(1)\nstore(2)\n")
+    (macro,) = [node for node in ast.nodes if isinstance(node, MacroAstNode)]
+    program = Program()
+
+    nodes = code_gen(ast.nodes, program.resolver)
+
+    assert macro.template is not None
+    first, second = [node for node in nodes if isinstance(node, OpcodeNode) and node.opcode == "lda"]
+    assert first is not second
+    assert first.value_node is not second.value_node
+    assert isinstance(first.value_node, ExpressionNode) and isinstance(second.value_node, ExpressionNode)
+    assert first.value_node.expression is second.value_node.expression
+
+
+def test_literal_subtrees_are_folded_and_constants_folded_per_application() -> None:
+    source = (
+        "OFFSET = 2\n"
+        ".macro copy(channel) {\n"
+        "    sta.w 0x4300 + channel * (0x08 + 0x08)\n"
+        "    sta.w 0x4300 + OFFSET\n"
+        "}\n"
+        "copy(1)\n"
+        "copy(2)\n"
+    )
+
+    assert [_operand(node) for node in _opcodes(source)] == ["17152 + ( channel * 16 )", "17154"] * 2
+    assert emitted("*=0x8000\n" + source) == b"\x8d\x10\x43\x8d\x02\x43\x8d\x20\x43\x8d\x02\x43"
+
+
+def test_body_nodes_reading_application_state_are_generated_each_time() -> None:
+    source = (
+        ".macro pick(flag) {\n    .if flag {\n        .db 1\n    } else {\n        .db 2\n    }\n}\npick(1)\npick(0)\n"
+    )
+
+    assert emitted("*=0x8000\n" + source) == b"\x01\x02"
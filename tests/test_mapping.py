@@ -107,3 +107,16 @@ class MappingTest(unittest.TestCase):
             self.assertIn("$7E-$CF", rendered)
         else:  # pragma: no cover - guard against silent regression
             self.fail("expected UnmappedBankError")
+
+    def test_unmapped_mapping_no_longer_serves_its_banks(self) -> None:
+        self.bus.unmap("1")
+        with self.assertRaises(UnmappedBankError):
+            self.bus.get_address(0x008000)
+
+    def test_bulk_physical_addresses(self) -> None:
+        physicals = self.bus.physical_addresses([0x00_8000, 0x13_8000, 0x7E_0000, 0xFC_8000])
+        self.assertEqual(physicals, [0x00_0000, 0x09_8000, None, None])
+
+    def test_bulk_logical_addresses_go_through_rom(self) -> None:
+        self.assertEqual(self.bus.logical_addresses([0x00_0000, 0x09_8000]), [0x00_8000, 0x13_8000])
+        self.assertEqual(Bus().logical_addresses([0x1234]), [0x1234])
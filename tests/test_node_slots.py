@@ -0,0 +1,47 @@
+"""The hot AST and executable node types are slotted."""
+
+from __future__ import annotations
+
+import pickle
+
+from a816.parse.mzparser import A816Parser
+from a816.program import Program
+
+_SOURCE = "OFFSET = 2\nstart:\n{\n    lda.w table + OFFSET, x\n    .dw 1, start\n}\ntable:\n.db 0\n"
+
+
+def _walk(nodes: list[object]) -> list[object]:
+    found: list[object] = []
+    for node in nodes:
+        found.append(node)
+        for name in ("body", "tokens", "data"):
+            found += _walk(list(getattr(node, name, [])))
+        for name in ("operand", "value"):
+            child = getattr(node, name, None)
+            if child is not None and not isinstance(child, str):
+                found += _walk([child])
+    return found
+
+
+def test_ast_nodes_have_no_instance_dict() -> None:
+    ast = A816Parser.parse_as_ast(_SOURCE)
+
+    nodes = _walk(list(ast.nodes))
+
+    assert {type(node).__name__ for node in nodes} >= {"OpcodeAstNode", "ExpressionAstNode", "Term", "BinOp"}
+    assert [node for node in nodes if hasattr(node, "__dict__")] == []
+
+
+def test_executable_nodes_have_no_instance_dict() -> None:
+    error, nodes = Program().parser.parse(_SOURCE)
+    assert error is None
+
+    assert [type(node).__name__ for node in nodes if hasattr(node, "__dict__")] == []
+
+
+def test_slotted_ast_pickles() -> None:
+    ast = A816Parser.parse_as_ast(_SOURCE)
+
+    restored = pickle.loads(pickle.dumps(ast.nodes))
+
+    assert [node.to_representation() for node in restored] == [node.to_representation() for node in ast.nodes]
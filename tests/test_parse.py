@@ -129,7 +129,7 @@ class ParseTest(unittest.TestCase):
             node_data = node.emit(program.resolver.reloc_address)
             if node_data:
                 emitted_nodes.append(node_data)
-        self.assertEqual(emitted_nodes, [b"\x00\x00", b"\x50\x34", b"\x00\x00", b"\x45\x00"])
+        self.assertEqual(emitted_nodes, [b"\x00\x00", b"\x50\x34\x00\x00\x45\x00"])
 
     def test_expressions(self) -> None:
         input_program = """
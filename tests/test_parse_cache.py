@@ -0,0 +1,125 @@
+"""On-disk parse cache: `parse_as_ast` reuses an AST pickled by an earlier
+run until the source text, an included file, or the parser changes."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from a816.config import load_a816_toml
+from a816.lsp.document import A816Document
+from a816.parse.ast.nodes import IncludeAstNode
+from a816.parse.mzparser import A816Parser
+from a816.parse.parse_cache import ParseCache, disable_parse_cache, enable_parse_cache
+from a816.parse.parser_states.directives import clear_include_cache
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Iterator[ParseCache]:
+    clear_include_cache()
+    yield enable_parse_cache(tmp_path / ".a816-cache")
+    disable_parse_cache()
+    clear_include_cache()
+
+
+def _parse(source: str, tmp_path: Path) -> list[str]:
+    result = A816Parser.parse_as_ast(source, str(tmp_path / "main.s"), include_paths=[tmp_path])
+    assert result.error is None
+    return [node.to_canonical() for node in result.nodes]
+
+
+def test_unchanged_source_is_served_from_cache(
+    cache: ParseCache, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = "A = 1\nlda.w #A\n"
+    first = _parse(source, tmp_path)
+    assert list(cache.directory.glob("*.ast"))
+
+    def _no_parse(*args: object, **kwargs: object) -> None:
+        raise AssertionError("cache hit expected")
+
+    monkeypatch.setattr("a816.parse.mzparser.Parser.parse", _no_parse)
+    assert _parse(source, tmp_path) == first
+
+
+def test_edited_source_overwrites_its_entry(cache: ParseCache, tmp_path: Path) -> None:
+    _parse("A = 1\n", tmp_path)
+    assert _parse("A = 2\n", tmp_path) == ["A = 2"]
+    assert len(list(cache.directory.glob("*.ast"))) == 1
+
+
+def test_edited_include_invalidates_entry(cache: ParseCache, tmp_path: Path) -> None:
+    header = tmp_path / "regs.s"
+    header.write_text("INIDISP = 0x2100\n")
+    _parse(".include 'regs.s'\n", tmp_path)
+
+    header.write_text("INIDISP = 0x2101\n")
+    clear_include_cache()
+    result = A816Parser.parse_as_ast(".include 'regs.s'\n", str(tmp_path / "main.s"), include_paths=[tmp_path])
+
+    include = result.nodes[0]
+    assert isinstance(include, IncludeAstNode)
+    assert include.included_nodes[0].to_canonical() == "INIDISP = 0x2101"
+
+
+def test_shadowing_include_invalidates_entry(cache: ParseCache, tmp_path: Path) -> None:
+    include_dir = tmp_path / "include"
+    include_dir.mkdir()
+    (include_dir / "regs.s").write_text("INIDISP = 0x2100\n")
+    main = str(tmp_path / "main.s")
+    assert A816Parser.parse_as_ast(".include 'regs.s'\n", main, include_paths=[include_dir]).error is None
+
+    # The including file's own directory is searched before the include path.
+    (tmp_path / "regs.s").write_text("INIDISP = 0x2101\n")
+    clear_include_cache()
+    result = A816Parser.parse_as_ast(".include 'regs.s'\n", main, include_paths=[include_dir])
+
+    include = result.nodes[0]
+    assert isinstance(include, IncludeAstNode)
+    assert include.resolved_path == str(tmp_path / "regs.s")
+    assert include.included_nodes[0].to_canonical() == "INIDISP = 0x2101"
+
+
+def test_failed_parse_is_not_cached(cache: ParseCache, tmp_path: Path) -> None:
+    result = A816Parser.parse_as_ast("lda.w #(\n", str(tmp_path / "main.s"))
+    assert result.error is not None
+    assert not cache.directory.exists()
+
+
+def test_editor_buffers_are_not_stored(cache: ParseCache, tmp_path: Path) -> None:
+    uri = (tmp_path / "main.s").as_uri()
+
+    buffer = A816Document(uri, "A = 1\nlda.w #A\n", include_paths=[tmp_path])
+    assert buffer.parse_error is None
+    assert not cache.directory.exists()
+
+    # Files the workspace index reads from disk are still cached.
+    A816Document(uri, "A = 1\nlda.w #A\n", include_paths=[tmp_path], store_parse=True)
+    assert list(cache.directory.glob("*.ast"))
+
+
+def test_corrupt_entry_is_reparsed(cache: ParseCache, tmp_path: Path) -> None:
+    _parse("A = 1\n", tmp_path)
+    for entry in cache.directory.glob("*.ast"):
+        entry.write_bytes(b"not a pickle")
+    assert _parse("A = 1\n", tmp_path) == ["A = 1"]
+
+
+def test_a816_toml_parse_cache_setting(tmp_path: Path) -> None:
+    config_path = tmp_path / "a816.toml"
+    config_path.write_text("parse-cache = true\n")
+    config = load_a816_toml(config_path)
+    assert config is not None
+    assert config.parse_cache == tmp_path / ".a816-cache"
+
+    config_path.write_text('parse-cache = "build/ast"\n')
+    config = load_a816_toml(config_path)
+    assert config is not None
+    assert config.parse_cache == (tmp_path / "build/ast").resolve()
+
+    config_path.write_text("")
+    config = load_a816_toml(config_path)
+    assert config is not None
+    assert config.parse_cache is None
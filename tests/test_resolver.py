@@ -1,5 +1,6 @@
 import unittest
 
+from a816.exceptions import SymbolNotDefined
 from a816.parse.ast.expression import eval_expression_str
 from a816.symbols import Resolver
 
@@ -31,3 +32,34 @@ class ResolverTest(unittest.TestCase):
         r = Resolver()
         value = eval_expression_str("-1", r)
         self.assertEqual(value, -1)
+
+    def test_memoized_lookup_sees_later_shadowing(self) -> None:
+        r = Resolver()
+        r.current_scope.add_symbol("speed", 1)
+        r.append_scope()
+        r.use_next_scope()
+        inner = r.current_scope
+        assert inner.parent is not None
+
+        self.assertEqual(inner.value_for("speed"), 1)
+        inner.parent.add_symbol("speed", 2)
+        self.assertEqual(inner.value_for("speed"), 2)
+        inner.add_symbol("speed", 3)
+        self.assertEqual(inner.value_for("speed"), 3)
+        inner.symbols.pop("speed")
+        self.assertEqual(inner.value_for("speed"), 2)
+
+    def test_memoized_lookup_sees_published_and_external_names(self) -> None:
+        r = Resolver()
+        r.append_named_scope("player")
+        r.use_next_scope()
+        r.current_scope.add_symbol("hp", 7)
+        assert r.current_scope.parent is not None
+        with self.assertRaises(SymbolNotDefined):
+            r.current_scope.parent.value_for("player.hp")
+        r.restore_scope(exports=True)
+        self.assertEqual(r.current_scope.value_for("player.hp"), 7)
+
+        self.assertFalse(r.current_scope.is_external_symbol("enemy.hp"))
+        r.current_scope.add_external_symbol("enemy")
+        self.assertTrue(r.current_scope.is_external_symbol("enemy.hp"))
@@ -0,0 +1,159 @@
+"""Tests for whole-ROM recursive-descent disassembly."""
+
+from pathlib import Path
+
+import pytest
+
+from a816.cpu.rom_analysis import (
+    analyze_rom,
+    analyze_rom_file,
+    default_cache_path,
+    vector_seeds,
+)
+from a816.symbols import high_rom_bus, low_rom_bus
+from a816.xdds import xdds_main
+
+
+def _lorom(code: dict[int, bytes], reset: int = 0x8000, nmi: int = 0x0000, irq: int = 0x0000) -> bytes:
+    """One 32 KiB LoROM bank with `code` placed at bank-$00 addresses."""
+    rom = bytearray(b"\xff" * 0x8000)
+    for address, data in code.items():
+        rom[address - 0x8000 : address - 0x8000 + len(data)] = data
+    rom[0x7FEA:0x7FEC] = nmi.to_bytes(2, "little")
+    rom[0x7FEE:0x7FF0] = irq.to_bytes(2, "little")
+    rom[0x7FFC:0x7FFE] = reset.to_bytes(2, "little")
+    return bytes(rom)
+
+
+def _mnemonics(rom: bytes, seeds: list[tuple[int, bool, bool]]) -> list[tuple[int, str, str]]:
+    analysis = analyze_rom(rom, low_rom_bus, seeds)
+    return [(inst.address, inst.mnemonic, inst.format_operand()) for inst in analysis.instructions()]
+
+
+class TestVectorSeeds:
+    def test_reset_is_emulation_mode(self) -> None:
+        rom = _lorom({}, reset=0x8123, nmi=0x8200)
+        seeds = vector_seeds(rom, low_rom_bus, m_flag=False, x_flag=False)
+        assert seeds == {"reset": (0x8123, True, True), "nmi": (0x8200, False, False)}
+
+    def test_hirom_vectors_map_to_bank_c0(self) -> None:
+        rom = bytearray(b"\xff" * 0x10000)
+        rom[0xFFFC:0xFFFE] = b"\x00\x80"
+        assert vector_seeds(bytes(rom), high_rom_bus)["reset"] == (0xC08000, True, True)
+
+
+class TestAnalyzeRom:
+    def test_rep_propagates_to_successor(self) -> None:
+        # rep #$20 ; lda #$1234 ; sep #$20 ; lda #$12 ; rts
+        rom = _lorom({0x8000: b"\xc2\x20\xa9\x34\x12\xe2\x20\xa9\x12\x60"})
+        lines = _mnemonics(rom, [(0x8000, True, True)])
+        assert lines == [
+            (0x8000, "rep", "#$20"),
+            (0x8002, "lda", "#$1234"),
+            (0x8005, "sep", "#$20"),
+            (0x8007, "lda", "#$12"),
+            (0x8009, "rts", ""),
+        ]
+
+    def test_follows_branches_and_calls(self) -> None:
+        # $8000: jsr $8010 ; bra $8006 ; (data) ; $8006: rts ; $8010: nop ; rts
+        rom = _lorom({0x8000: b"\x20\x10\x80\x80\x01\xff\x60", 0x8010: b"\xea\x60"})
+        addresses = [address for address, _, _ in _mnemonics(rom, [(0x8000, True, True)])]
+        assert addresses == [0x8000, 0x8003, 0x8006, 0x8010, 0x8011]
+
+    def test_branch_into_block_splits_it(self) -> None:
+        # $8000: nop ; nop ; nop ; bne $8001 ; rts
+        rom = _lorom({0x8000: b"\xea\xea\xea\xd0\xfc\x60"})
+        analysis = analyze_rom(rom, low_rom_bus, [(0x8000, True, True)])
+        starts = sorted(start for start, _, _ in analysis.blocks)
+        assert starts == [0x8000, 0x8001, 0x8005]
+        assert [inst.address for inst in analysis.instructions()] == [0x8000, 0x8001, 0x8002, 0x8003, 0x8005]
+
+    def test_shared_code_decoded_once(self) -> None:
+        # Two entries both calling $8020.
+        rom = _lorom({0x8000: b"\x20\x20\x80\x60", 0x8010: b"\x20\x20\x80\x60", 0x8020: b"\xea\x60"})
+        analysis = analyze_rom(rom, low_rom_bus, [(0x8000, True, True), (0x8010, True, True)])
+        shared = [key for key in analysis.blocks if key[0] == 0x8020]
+        assert shared == [(0x8020, True, True)]
+
+    def test_conflicting_flags_are_reported(self) -> None:
+        rom = _lorom({0x8000: b"\xa9\x00\x00\x60"})
+        analysis = analyze_rom(rom, low_rom_bus, [(0x8000, True, True), (0x8000, False, True)])
+        assert 0x8000 in analysis.conflicts()
+
+    def test_stops_at_ram(self) -> None:
+        # jml $7E0000 is not followed into WRAM.
+        rom = _lorom({0x8000: b"\x5c\x00\x00\x7e"})
+        assert [address for address, _, _ in _mnemonics(rom, [(0x8000, True, True)])] == [0x8000]
+
+
+class TestAnalysisCache:
+    def test_second_run_hits_cache(self, tmp_path: Path) -> None:
+        rom_path = tmp_path / "game.sfc"
+        rom_path.write_bytes(_lorom({0x8000: b"\xea\x60"}))
+        cache = default_cache_path(rom_path)
+        assert cache.name == "game.sfc.xdds.json"
+
+        first = analyze_rom_file(rom_path, low_rom_bus, cache_path=cache)
+        second = analyze_rom_file(rom_path, low_rom_bus, cache_path=cache)
+        assert not first.from_cache
+        assert second.from_cache
+        assert [i.address for i in second.instructions()] == [i.address for i in first.instructions()]
+
+    def test_rom_change_invalidates(self, tmp_path: Path) -> None:
+        rom_path = tmp_path / "game.sfc"
+        rom_path.write_bytes(_lorom({0x8000: b"\xea\x60"}))
+        cache = default_cache_path(rom_path)
+        analyze_rom_file(rom_path, low_rom_bus, cache_path=cache)
+
+        rom_path.write_bytes(_lorom({0x8000: b"\xea\xea\x60"}))
+        analysis = analyze_rom_file(rom_path, low_rom_bus, cache_path=cache)
+        assert not analysis.from_cache
+        assert len(analysis.instructions()) == 3
+
+    def test_new_seed_invalidates(self, tmp_path: Path) -> None:
+        rom_path = tmp_path / "game.sfc"
+        rom_path.write_bytes(_lorom({0x8000: b"\x60", 0x8010: b"\xea\x60"}))
+        cache = default_cache_path(rom_path)
+        analyze_rom_file(rom_path, low_rom_bus, cache_path=cache)
+        analysis = analyze_rom_file(rom_path, low_rom_bus, extra_seeds=[(0x8010, True, True)], cache_path=cache)
+        assert not analysis.from_cache
+        assert 0x8010 in {i.address for i in analysis.instructions()}
+
+    def test_unwritable_cache_is_skipped(self, tmp_path: Path) -> None:
+        rom_path = tmp_path / "game.sfc"
+        rom_path.write_bytes(_lorom({0x8000: b"\xea\x60"}))
+        # A file where the cache directory should be makes the write fail.
+        (tmp_path / "blocked").write_bytes(b"")
+        cache = tmp_path / "blocked" / "game.sfc.xdds.json"
+
+        analysis = analyze_rom_file(rom_path, low_rom_bus, cache_path=cache)
+        assert not analysis.from_cache
+        assert len(analysis.instructions()) == 2
+
+
+class TestAnalyzeCli:
+    def test_analyze_prints_reachable_code(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        rom_path = tmp_path / "game.sfc"
+        rom_path.write_bytes(_lorom({0x8000: b"\xc2\x20\xa9\x34\x12\x60"}))
+        monkeypatch.setattr("sys.argv", ["xdds", "--lorom", "-d", "--analyze", str(rom_path)])
+        xdds_main()
+        out = capsys.readouterr().out
+        assert "lda  #$1234" in out
+        assert default_cache_path(rom_path).exists()
+
+    def test_analyze_no_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        rom_path = tmp_path / "game.sfc"
+        rom_path.write_bytes(_lorom({0x8000: b"\x60"}))
+        monkeypatch.setattr("sys.argv", ["xdds", "--lorom", "-d", "--analyze", "--no-cache", str(rom_path)])
+        xdds_main()
+        assert not default_cache_path(rom_path).exists()
+
+    def test_analyze_requires_disasm(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        rom_path = tmp_path / "game.sfc"
+        rom_path.write_bytes(_lorom({}))
+        monkeypatch.setattr("sys.argv", ["xdds", "--analyze", str(rom_path)])
+        with pytest.raises(SystemExit):
+            xdds_main()
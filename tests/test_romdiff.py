@@ -0,0 +1,259 @@
+"""Tests for ROM diffing into IPS / BPS patches."""
+
+import io
+import random
+import zlib
+from pathlib import Path
+
+import pytest
+
+from a816.romdiff import (
+    IPS_EOF_OFFSET,
+    _bps_number,
+    diff_files,
+    diff_runs,
+    patch_format_for,
+    write_bps,
+    write_ips,
+)
+from a816.xdds import apply_ips_patch
+
+
+def _ips(base: bytes, target: bytes) -> bytes:
+    out = io.BytesIO()
+    write_ips(out, base, target)
+    return out.getvalue()
+
+
+def _bps(base: bytes, target: bytes) -> bytes:
+    out = io.BytesIO()
+    write_bps(out, base, target)
+    return out.getvalue()
+
+
+def _apply_ips(base: bytes, patch: bytes, tmp_path: Path) -> bytes:
+    rom = tmp_path / "base.sfc"
+    ips = tmp_path / "patch.ips"
+    out = tmp_path / "out.sfc"
+    rom.write_bytes(base)
+    ips.write_bytes(patch)
+    apply_ips_patch(rom, ips, out)
+    return out.read_bytes()
+
+
+def _ips_records(patch: bytes) -> list[tuple[int, int, bool]]:
+    """Return (offset, size, is_rle) for every record in an IPS patch."""
+    records = []
+    pos = 5
+    while patch[pos : pos + 3] != b"EOF":
+        offset = int.from_bytes(patch[pos : pos + 3], "big")
+        size = int.from_bytes(patch[pos + 3 : pos + 5], "big")
+        pos += 5
+        if size == 0:
+            records.append((offset, int.from_bytes(patch[pos : pos + 2], "big"), True))
+            pos += 3
+        else:
+            records.append((offset, size, False))
+            pos += size
+    return records
+
+
+def _read_number(patch: bytes, pos: int) -> tuple[int, int]:
+    value, shift = 0, 1
+    while True:
+        byte = patch[pos]
+        pos += 1
+        value += (byte & 0x7F) * shift
+        if byte & 0x80:
+            return value, pos
+        shift <<= 7
+        value += shift
+
+
+def _apply_bps(base: bytes, patch: bytes) -> bytes:
+    """Reference BPS applier (checks all three CRCs)."""
+    assert patch[:4] == b"BPS1"
+    assert zlib.crc32(patch[:-4]) == int.from_bytes(patch[-4:], "little")
+    assert zlib.crc32(base) == int.from_bytes(patch[-12:-8], "little")
+    pos = 4
+    source_size, pos = _read_number(patch, pos)
+    target_size, pos = _read_number(patch, pos)
+    metadata_size, pos = _read_number(patch, pos)
+    assert source_size == len(base)
+    pos += metadata_size
+    out = bytearray()
+    source_relative = target_relative = 0
+    while pos < len(patch) - 12:
+        data, pos = _read_number(patch, pos)
+        command, length = data & 3, (data >> 2) + 1
+        if command == 0:
+            out += base[len(out) : len(out) + length]
+        elif command == 1:
+            out += patch[pos : pos + length]
+            pos += length
+        else:
+            raw, pos = _read_number(patch, pos)
+            delta = -(raw >> 1) if raw & 1 else raw >> 1
+            if command == 2:
+                source_relative += delta
+                out += base[source_relative : source_relative + length]
+                source_relative += length
+            else:
+                target_relative += delta
+                for _ in range(length):
+                    out.append(out[target_relative])
+                    target_relative += 1
+    assert len(out) == target_size
+    assert zlib.crc32(out) == int.from_bytes(patch[-8:-4], "little")
+    return bytes(out)
+
+
+class TestDiffRuns:
+    def test_identical(self) -> None:
+        assert diff_runs(b"\x00" * 100, b"\x00" * 100) == []
+
+    def test_single_runs(self) -> None:
+        base = bytes(32)
+        target = bytearray(base)
+        target[3] = 1
+        target[10:13] = b"\x01\x02\x03"
+        assert diff_runs(base, bytes(target)) == [(3, 4), (10, 13)]
+
+    def test_run_across_chunk_boundary_is_merged(self) -> None:
+        base = bytes(64)
+        target = bytearray(base)
+        target[14:18] = b"\xff" * 4
+        assert diff_runs(base, bytes(target), chunk_size=16) == [(14, 18)]
+
+    def test_target_tail_always_differs(self) -> None:
+        assert diff_runs(b"\x00" * 4, b"\x00" * 8) == [(4, 8)]
+
+
+class TestIPS:
+    def test_identical_is_empty_patch(self) -> None:
+        assert _ips(b"abcd", b"abcd") == b"PATCHEOF"
+
+    def test_close_runs_share_one_record(self) -> None:
+        base = bytes(64)
+        target = bytearray(base)
+        target[10] = 1
+        target[13] = 2
+        assert _ips_records(_ips(base, bytes(target))) == [(10, 4, False)]
+
+    def test_distant_runs_get_separate_records(self) -> None:
+        base = bytes(64)
+        target = bytearray(base)
+        target[10] = 1
+        target[30] = 2
+        assert _ips_records(_ips(base, bytes(target))) == [(10, 1, False), (30, 1, False)]
+
+    def test_long_repeat_uses_rle(self) -> None:
+        base = bytes(0x20000)
+        target = b"\xaa" * 0x20000
+        patch = _ips(base, target)
+        assert _ips_records(patch) == [(0, 0xFFFF, True), (0xFFFF, 0xFFFF, True), (0x1FFFE, 2, True)]
+
+    def test_repeat_inside_literal_is_split_out(self) -> None:
+        base = bytes(256)
+        target = bytearray(base)
+        target[0:4] = b"\x01\x02\x03\x04"
+        target[4:100] = b"\x55" * 96
+        target[100:104] = b"\x05\x06\x07\x08"
+        records = _ips_records(_ips(base, bytes(target)))
+        assert records == [(0, 4, False), (4, 96, True), (100, 4, False)]
+
+    def test_short_repeat_stays_literal(self) -> None:
+        base = bytes(64)
+        target = bytearray(base)
+        target[0:12] = b"\x01\x02\x03\x03\x03\x03\x03\x03\x03\x03\x04\x05"
+        assert _ips_records(_ips(base, bytes(target))) == [(0, 12, False)]
+
+    def test_record_never_starts_at_eof_marker(self) -> None:
+        base = bytes(IPS_EOF_OFFSET + 16)
+        target = bytearray(base)
+        target[IPS_EOF_OFFSET] = 0x42
+        patch = _ips(base, bytes(target))
+        assert _ips_records(patch) == [(IPS_EOF_OFFSET - 1, 2, False)]
+
+    def test_offset_past_16mib_raises(self) -> None:
+        base = bytes(0x1000010)
+        target = bytearray(base)
+        target[0x1000004] = 1
+        with pytest.raises(ValueError, match="use a .bps"):
+            _ips(base, bytes(target))
+
+    def test_shorter_target_appends_truncation(self, tmp_path: Path) -> None:
+        patch = _ips(b"\x00" * 32, b"\x00" * 16)
+        assert patch == b"PATCHEOF\x00\x00\x10"
+        assert _apply_ips(b"\x00" * 32, patch, tmp_path) == b"\x00" * 16
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_random_round_trip(self, seed: int, tmp_path: Path) -> None:
+        rng = random.Random(seed)
+        base = rng.randbytes(0x3000)
+        target = bytearray(base)
+        for _ in range(40):
+            start = rng.randrange(len(target))
+            length = rng.randrange(1, 64)
+            fill = bytes([rng.randrange(4)]) * length if rng.random() < 0.5 else rng.randbytes(length)
+            target[start : start + length] = fill
+        target += rng.randbytes(rng.randrange(0, 100))
+        assert _apply_ips(base, _ips(base, bytes(target)), tmp_path) == bytes(target)
+
+
+class TestBPS:
+    def test_number_encoding(self) -> None:
+        assert _bps_number(0) == b"\x80"
+        assert _bps_number(127) == b"\xff"
+        assert _bps_number(128) == b"\x00\x80"
+
+    def test_identical(self) -> None:
+        patch = _bps(b"abcdef", b"abcdef")
+        assert _apply_bps(b"abcdef", patch) == b"abcdef"
+
+    def test_repeat_uses_target_copy(self) -> None:
+        base = bytes(0x10000)
+        target = b"\x11" * 0x10000
+        patch = _bps(base, target)
+        assert len(patch) < 32
+        assert _apply_bps(base, patch) == target
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_random_round_trip(self, seed: int) -> None:
+        rng = random.Random(seed)
+        base = rng.randbytes(0x3000)
+        target = bytearray(base)
+        for _ in range(40):
+            start = rng.randrange(len(target))
+            length = rng.randrange(1, 64)
+            fill = bytes([rng.randrange(4)]) * length if rng.random() < 0.5 else rng.randbytes(length)
+            target[start : start + length] = fill
+        if rng.random() < 0.5:
+            target += rng.randbytes(rng.randrange(1, 100))
+        else:
+            del target[-rng.randrange(1, 100) :]
+        assert _apply_bps(base, _bps(base, bytes(target))) == bytes(target)
+
+
+class TestDiffFiles:
+    def test_format_from_suffix(self) -> None:
+        assert patch_format_for(Path("out.bps")) == "bps"
+        assert patch_format_for(Path("out.ips")) == "ips"
+        assert patch_format_for(Path("out")) == "ips"
+
+    def test_diff_files_ips(self, tmp_path: Path) -> None:
+        base = tmp_path / "base.sfc"
+        target = tmp_path / "target.sfc"
+        base.write_bytes(b"\x00" * 64)
+        target.write_bytes(b"\x00" * 8 + b"\x01" + b"\x00" * 55)
+        size = diff_files(base, target, tmp_path / "out.ips")
+        assert (tmp_path / "out.ips").read_bytes() == b"PATCH\x00\x00\x08\x00\x01\x01EOF"
+        assert size == 14
+
+    def test_diff_files_empty_base(self, tmp_path: Path) -> None:
+        base = tmp_path / "base.sfc"
+        target = tmp_path / "target.sfc"
+        base.write_bytes(b"")
+        target.write_bytes(b"\x01\x02\x03")
+        diff_files(base, target, tmp_path / "out.bps")
+        assert _apply_bps(b"", (tmp_path / "out.bps").read_bytes()) == b"\x01\x02\x03"
@@ -207,3 +207,9 @@ class ScannerTest(TestCase):
         # Scanner now collects errors instead of raising — recovery mode.
         assert scanner.errors, "expected at least one collected ScannerException"
         self.assertIn("unterminated", str(scanner.errors[0]))
+
+    def test_unterminated_block_comment_error(self) -> None:
+        """An unterminated `/*` is reported instead of spinning at end of input."""
+        scanner = Scanner(lex_initial)
+        scanner.scan("test.s", "lda #1\n/* never closed")
+        self.assertEqual([str(e) for e in scanner.errors], ["unterminated block comment"])
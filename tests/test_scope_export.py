@@ -110,3 +110,30 @@ def test_macro_outside_scope_does_not_leak() -> None:
     # Labels stay buried in the anon arg-binding scope when there's no
     # NamedScope wrapping the call site.
     assert "init" not in public
+
+
+def test_root_scope_symbol_index_matches_per_name_check() -> None:
+    program = _resolved(
+        """
+        *=0x008000
+        SPEED = 3
+        main:
+            rts
+        .scope inventory {
+        init:
+            rts
+        }
+        {
+        inner:
+            rts
+        }
+        """
+    )
+    resolver = program.resolver
+    root_symbols = resolver.root_symbol_index()
+    candidates = {name for scope in resolver.scopes for name in (*scope.symbols, *scope.labels)} | {"missing"}
+    assert resolver.named_scope_member_names() == {"init"}
+    assert "inner" in candidates
+    for name in candidates:
+        assert (name in root_symbols) == resolver.is_root_scope_symbol(name), name
+    assert [resolver.scope_ordinals[scope] for scope in resolver.scopes] == list(range(len(resolver.scopes)))
@@ -0,0 +1,72 @@
+"""The parser consuming a streamed token iterator instead of a complete list."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from a816.parse import parser as parser_module
+from a816.parse.fast_scanner import FastScanner
+from a816.parse.mzparser import A816Parser
+from a816.parse.parser import Parser
+from a816.parse.parser_states import parse_initial
+from a816.parse.tokens import File, Token
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE = (ROOT / "tests" / "samples" / "sample.s").read_text(encoding="utf-8")
+
+
+def _representation(tokens: list[Token] | Iterator[Token]) -> list[object]:
+    return [node.to_representation() for node in Parser(tokens, parse_initial).parse()]
+
+
+@pytest.fixture
+def eager_release(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parser_module, "RELEASE_THRESHOLD", 1)
+    monkeypatch.setattr(parser_module, "READ_AHEAD", 1)
+
+
+@pytest.mark.usefixtures("eager_release")
+def test_streamed_parse_matches_list_parse() -> None:
+    expected = _representation(FastScanner().scan("sample.s", SAMPLE))
+    assert _representation(FastScanner().iter_scan("sample.s", SAMPLE)) == expected
+
+
+@pytest.mark.usefixtures("eager_release")
+def test_window_stays_bounded() -> None:
+    source = "".join(f"    .db {i}, {i + 1}, {i + 2}\n" for i in range(500))
+    parser = Parser(FastScanner().iter_scan("data.s", source), parse_initial)
+    peak = 0
+    original_release = parser.release
+
+    def tracking_release() -> None:
+        nonlocal peak
+        original_release()
+        peak = max(peak, len(parser.tokens))
+
+    parser.release = tracking_release  # type: ignore[method-assign]
+    assert len(parser.parse()) == 500
+    assert peak < 16
+
+
+def test_iter_scan_falls_back_mid_stream() -> None:
+    source = "".join(f"lda #{i}\n" for i in range(600)) + ".bogus\nnop\n"
+    scanner = FastScanner()
+    streamed = list(scanner.iter_scan("test.s", source))
+    assert streamed == FastScanner().scan("test.s", source)
+    assert [str(e) for e in scanner.errors] == ["unknown directive `.bogus`"]
+
+
+def test_file_lines_are_split_lazily() -> None:
+    file = File("test.s", source="a\nbc\n")
+    assert file._lines is None
+    assert file.lines == ["a", "bc", ""]
+    assert file.position_at(3).line == 1
+
+
+def test_scanner_errors_survive_aborted_parse() -> None:
+    # Enough parse errors to abort, followed by a scanner error the parser never reached.
+    source = "= 1\nnop\n" * 300 + ".bogus\n"
+    result = A816Parser.parse_as_ast(source, "test.s")
+    assert result.parse_errors is not None
+    assert any("unknown directive" in error.message for error in result.parse_errors)
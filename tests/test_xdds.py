@@ -1,5 +1,6 @@
 """Tests for xdds - SNES hex dump tool with bus mapping support."""
 
+import io
 import tempfile
 from pathlib import Path
 
@@ -210,6 +211,25 @@ class TestHexdump:
         captured = capsys.readouterr()
         assert "$40:0000" in captured.out
 
+    def test_hexdump_batches_match_per_line_format(self) -> None:
+        data = bytes(range(256)) * 80 + b"\x41\x42\x43"
+        out = io.StringIO()
+        hexdump(data, low_rom_bus, 0x7FF0, 16, True, out=out)
+        lines = out.getvalue().split("\n")
+        assert lines[-1] == ""
+        assert len(lines) - 1 == -(-len(data) // 16)
+        for row, line in enumerate(lines[:-1]):
+            chunk = data[row * 16 : row * 16 + 16]
+            logical = physical_to_logical(low_rom_bus, 0x7FF0 + row * 16)
+            hex_part = " ".join(f"{b:02x}" for b in chunk).ljust(47)
+            ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+            assert line == f"${logical >> 16:02x}:{logical & 0xFFFF:04x}  {hex_part}  {ascii_part}"
+
+    def test_hexdump_accepts_memoryview(self) -> None:
+        out = io.StringIO()
+        hexdump(memoryview(b"\x00\x01\x02\x03")[1:3], low_rom_bus, 1, 16, False, out=out)
+        assert out.getvalue().rstrip() == "$00:8001  01 02"
+
 
 class TestApplyIpsPatch:
     """Tests for IPS patch application."""
@@ -864,3 +884,72 @@ class TestDebugInfoIntegration:
         captured = capsys.readouterr()
         assert "bne loop_target" in captured.out
         assert "loop_target:" in captured.out
+
+
+class TestDiffSubcommand:
+    """Tests for `xdds diff`."""
+
+    def test_diff_writes_ips_round_trip(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        base = tmp_path / "base.sfc"
+        target = tmp_path / "target.sfc"
+        base.write_bytes(b"\x00" * 0x100)
+        target.write_bytes(b"\x00" * 0x10 + b"\xea" * 0x40 + b"\x00" * 0xB0 + b"\x60")
+        patch = tmp_path / "out.ips"
+
+        monkeypatch.setattr("sys.argv", ["xdds", "diff", str(base), str(target), "-o", str(patch)])
+        xdds_main()
+
+        patched = tmp_path / "patched.sfc"
+        apply_ips_patch(base, patch, patched)
+        assert patched.read_bytes() == target.read_bytes()
+
+    def test_diff_bps_from_suffix(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        base = tmp_path / "base.sfc"
+        target = tmp_path / "target.sfc"
+        base.write_bytes(b"\x00" * 16)
+        target.write_bytes(b"\x01" * 16)
+        patch = tmp_path / "out.bps"
+
+        monkeypatch.setattr("sys.argv", ["xdds", "diff", str(base), str(target), "-o", str(patch)])
+        xdds_main()
+        assert patch.read_bytes()[:4] == b"BPS1"
+
+    def test_diff_missing_input_exits(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        target = tmp_path / "target.sfc"
+        target.write_bytes(b"\x00")
+        monkeypatch.setattr(
+            "sys.argv", ["xdds", "diff", str(tmp_path / "missing.sfc"), str(target), "-o", str(tmp_path / "o.ips")]
+        )
+        with pytest.raises(SystemExit):
+            xdds_main()
+
+
+class TestMappedSlice:
+    """`--start` / `--length` windows over the memory-mapped ROM."""
+
+    def test_start_past_end_dumps_nothing(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        rom = tmp_path / "rom.sfc"
+        rom.write_bytes(b"\x00" * 16)
+        monkeypatch.setattr("sys.argv", ["xdds", "-s", "0x100", str(rom)])
+        xdds_main()
+        assert capsys.readouterr().out == ""
+
+    def test_length_clamped_to_file(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        rom = tmp_path / "rom.sfc"
+        rom.write_bytes(bytes(range(20)))
+        monkeypatch.setattr("sys.argv", ["xdds", "-s", "0x10", "-l", "0x100", str(rom)])
+        xdds_main()
+        assert capsys.readouterr().out.split("\n")[0].startswith("$00:8010  10 11 12 13  ")
+
+    def test_empty_rom(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        rom = tmp_path / "rom.sfc"
+        rom.write_bytes(b"")
+        monkeypatch.setattr("sys.argv", ["xdds", "-d", str(rom)])
+        xdds_main()
+        assert capsys.readouterr().out == ""